@@ -0,0 +1,63 @@
+"""Latency of repeated get_order_status calls: one connection per call vs the pooled client.
+
+Run with: python benchmarks/bench_connection_pool.py [calls]
+
+The stand-in server speaks plain HTTP on localhost, so the numbers only show the TCP
+connect saved per call; against the real API the TLS handshake is saved as well.
+"""
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from _stub_server import StubServer  # noqa: E402
+from tapsilat_py.client import TapsilatAPI  # noqa: E402
+
+
+def _unpooled_get_order_status(base_url, reference_id):
+    # What _make_request did before the client owned a session.
+    response = requests.request(
+        "GET", f"{base_url}/order/{reference_id}/status", timeout=10
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _measure(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.mean(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[int(len(samples) * 0.99) - 1],
+    }
+
+
+def main(calls=2000):
+    body = json.dumps({"status": 1, "status_enum": "CREATED"}).encode()
+    routes = {"/api/v1/order/ref-1/status": ("application/json", body)}
+    with StubServer(routes) as server:
+        unpooled = _measure(
+            lambda: _unpooled_get_order_status(server.base_url, "ref-1"), calls
+        )
+        with TapsilatAPI("bench", base_url=server.base_url) as client:
+            pooled = _measure(lambda: client.get_order_status("ref-1"), calls)
+
+    print(f"get_order_status x {calls}")
+    print(f"{'':<12}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, stats in (("unpooled", unpooled), ("pooled", pooled)):
+        print(f"{name:<12}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p99']:>10.3f}")
+    print(f"mean speedup: {unpooled['mean'] / pooled['mean']:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,61 @@
+"""Memory per DTO instance: plain dataclasses vs the slotted models.
+
+Run with: python benchmarks/bench_dto_memory.py [instances]
+
+"plain" rebuilds each model as an ordinary dataclass, as models.py defined them
+before they were slotted. Each instance is created with a few fields set, the
+way basket items usually arrive, and measured with tracemalloc.
+"""
+import sys
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.models import (  # noqa: E402
+    BasketItemDTO,
+    BasketItemPayerDTO,
+    BillingAddressDTO,
+    BuyerDTO,
+    OrderItemPayment,
+)
+
+CASES = (
+    (BasketItemDTO, {"id": "item-1", "name": "Widget", "price": 10.0, "quantity": 1}),
+    (OrderItemPayment, {"amount": 10.0, "status": 1}),
+    (BasketItemPayerDTO, {"name": "Ada", "type": "PERSONAL"}),
+    (BuyerDTO, {"name": "John", "surname": "Doe", "email": "john@example.com"}),
+    (BillingAddressDTO, {"city": "Istanbul", "country": "TR"}),
+)
+
+
+def _plain(cls):
+    return make_dataclass(
+        cls.__name__,
+        [(f.name, f.type, field(default=f.default)) for f in fields(cls)],
+    )
+
+
+def _bytes_per_instance(cls, kwargs, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**kwargs) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding them is not part of the instances.
+    list_size = sys.getsizeof(instances)
+    return (after - before - list_size) / count
+
+
+def main(count=100000):
+    print(f"{count} instances each")
+    print(f"{'':<22}{'plain B':>10}{'slotted B':>12}{'saved':>8}")
+    for cls, kwargs in CASES:
+        plain = _bytes_per_instance(_plain(cls), kwargs, count)
+        slotted = _bytes_per_instance(cls, kwargs, count)
+        print(f"{cls.__name__:<22}{plain:>10.0f}{slotted:>12.0f}{1 - slotted / plain:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
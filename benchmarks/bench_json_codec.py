@@ -0,0 +1,82 @@
+"""JSON codecs on realistic order payloads: the stdlib codec vs orjson.
+
+Run with: python benchmarks/bench_json_codec.py [repeats]
+
+"create" encodes an order-create body with 50 basket items; "order" decodes
+an order detail with 500 basket items; "list page" decodes an /order/list
+page of 50 such orders with 20 items each. "requests" is what the client
+did before codecs: json.dumps with requests' defaults and response.json().
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.json_codec import StdlibCodec, get_codec, orjson  # noqa: E402
+
+
+def _basket_item(i):
+    return {
+        "id": f"item-{i}",
+        "name": "Widget Ürün",
+        "category1": "Hardware",
+        "item_type": "PHYSICAL",
+        "price": 100.0,
+        "quantity": 1,
+        "paid_amount": 100.0,
+        "refundable_amount": 100.0,
+        "status": 1,
+        "payer": {"name": "Ada", "surname": "Lovelace", "type": "PERSONAL"},
+        "item_payments": [
+            {"id": f"pay-{i}-1", "amount": 60.0, "status": 1, "card_brand": "VISA"},
+            {"id": f"pay-{i}-2", "amount": 40.0, "status": 1, "card_brand": "VISA"},
+        ],
+    }
+
+
+def _order(items):
+    return {
+        "reference_id": "03d03353-9b5b-4289-b231-ffbe50f8a79d",
+        "conversation_id": "conv-1",
+        "status": 8,
+        "amount": 100.0 * items,
+        "currency": "TRY",
+        "locale": "tr",
+        "buyer": {"name": "John", "surname": "Doe", "email": "john@example.com"},
+        "billing_address": {"city": "Istanbul", "country": "TR", "zip_code": "34000"},
+        "basket_items": [_basket_item(i) for i in range(items)],
+    }
+
+
+def main(repeats=5):
+    create = _order(50)
+    order = json.dumps(_order(500)).encode()
+    page = json.dumps(
+        {"page": 1, "per_page": 50, "total": 5000, "rows": [_order(20)] * 50}
+    ).encode()
+
+    codecs = [("stdlib", StdlibCodec())]
+    if orjson is not None:
+        codecs.append(("orjson", get_codec("orjson")))
+    else:
+        print("orjson is not installed; pip install tapsilat-py[fast-json] to compare it")
+
+    cases = [
+        ("create", "dumps", create, lambda obj: json.dumps(obj, allow_nan=False).encode(), 500),
+        ("order", "loads", order, json.loads, 200),
+        ("list page", "loads", page, json.loads, 50),
+    ]
+    names = ["requests"] + [name for name, _ in codecs]
+    print(f"{'':<12}" + "".join(f"{name + ' us':>14}" for name in names))
+    for name, op, data, baseline, number in cases:
+        timings = [min(timeit.repeat(lambda: baseline(data), number=number, repeat=repeats))]
+        for _, codec in codecs:
+            fn = getattr(codec, op)
+            timings.append(min(timeit.repeat(lambda: fn(data), number=number, repeat=repeats)))
+        print(f"{name:<12}" + "".join(f"{t / number * 1e6:>14.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
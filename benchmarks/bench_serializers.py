@@ -0,0 +1,88 @@
+"""to_dict() cost: the reflective conversion vs the generated per-class serializers.
+
+Run with: python benchmarks/bench_serializers.py [repeats]
+
+"flat" is an order with a buyer and a handful of scalar fields; "nested" adds
+500 basket items, each with a payer and two item payments.
+"""
+import sys
+import timeit
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.models import (  # noqa: E402
+    BasketItemDTO,
+    BasketItemPayerDTO,
+    BillingAddressDTO,
+    BuyerDTO,
+    OrderCreateDTO,
+    OrderItemPayment,
+)
+
+
+def _reflective_asdict(data):
+    # What models._asdict_factory did before serializers were generated.
+    if not is_dataclass(data):
+        return data
+
+    def convert_value(obj):
+        if isinstance(obj, list):
+            return [convert_value(v) for v in obj]
+        if is_dataclass(obj):
+            return _reflective_asdict(obj)
+        return obj
+
+    result = {}
+    for field in fields(data):
+        value = getattr(data, field.name)
+        if value is not None:
+            result[field.name] = convert_value(value)
+    return result
+
+
+def _order(items):
+    return OrderCreateDTO(
+        amount=100.0 * max(items, 1),
+        currency="TRY",
+        locale="tr",
+        buyer=BuyerDTO(name="John", surname="Doe", email="john@example.com", city="Istanbul"),
+        billing_address=BillingAddressDTO(city="Istanbul", country="TR", zip_code="34000"),
+        conversation_id="conv-1",
+        enabled_installments=[1, 3, 6],
+        basket_items=[
+            BasketItemDTO(
+                id=f"item-{i}",
+                name="Widget",
+                category1="Hardware",
+                price=100.0,
+                quantity=1,
+                item_type="PHYSICAL",
+                payer=BasketItemPayerDTO(name="Ada", surname="Lovelace", type="PERSONAL"),
+                item_payments=[
+                    OrderItemPayment(amount=60.0, status=1),
+                    OrderItemPayment(amount=40.0, status=1),
+                ],
+            )
+            for i in range(items)
+        ]
+        or None,
+    )
+
+
+def main(repeats=5):
+    cases = (("flat", _order(0), 20000), ("nested", _order(500), 50))
+    print(f"{'':<10}{'reflective us':>16}{'generated us':>16}{'speedup':>10}")
+    for name, order, number in cases:
+        assert order.to_dict() == _reflective_asdict(order)
+        reflective = min(timeit.repeat(lambda: _reflective_asdict(order), number=number, repeat=repeats))
+        generated = min(timeit.repeat(order.to_dict, number=number, repeat=repeats))
+        print(
+            f"{name:<10}{reflective / number * 1e6:>16.1f}"
+            f"{generated / number * 1e6:>16.1f}{reflective / generated:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,70 @@
+"""Streaming an /order/list page vs decoding it whole.
+
+Run with: python benchmarks/bench_streaming.py [orders per page]
+
+For one page of orders with 20 basket items each, served from a local stub,
+reports the time until the first order is available, the time to read the
+whole page and, on a separate run, the peak Python memory allocated while
+reading it, for get_order_list and iter_order_page.
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from _stub_server import StubServer  # noqa: E402
+from bench_json_codec import _order  # noqa: E402
+from tapsilat_py import TapsilatAPI  # noqa: E402
+
+
+def _whole(client, per_page):
+    page = client.get_order_list(per_page=per_page)
+    rows = iter(page.rows)
+    first = time.perf_counter()
+    next(rows)
+    for _ in rows:
+        pass
+    return first
+
+
+def _streamed(client, per_page):
+    rows = client.iter_order_page(per_page=per_page)
+    next(rows)
+    first = time.perf_counter()
+    for _ in rows:
+        pass
+    return first
+
+
+def main(orders=2000):
+    rows = [dict(_order(20), reference_id=f"ref-{i}") for i in range(orders)]
+    body = json.dumps({"page": 1, "per_page": orders, "total": orders, "rows": rows}).encode()
+    del rows
+    print(f"one page of {orders} orders, {len(body) / 1e6:.1f} MB")
+
+    with StubServer({"/api/v1/order/list": ("application/json", body)}) as server:
+        client = TapsilatAPI(base_url=server.base_url, timeout=60)
+        _streamed(client, orders)  # warm up the connection
+        print(f"{'':<18}{'first order ms':>16}{'whole page ms':>16}{'peak MB':>10}")
+        for name, read in (("get_order_list", _whole), ("iter_order_page", _streamed)):
+            gc.collect()
+            start = time.perf_counter()
+            first = read(client, orders)
+            end = time.perf_counter()
+            # Measured on a second run: tracing slows allocation-heavy code down.
+            tracemalloc.start()
+            read(client, orders)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{name:<18}{(first - start) * 1e3:>16.1f}{(end - start) * 1e3:>16.1f}"
+                f"{peak / 1e6:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,76 @@
+"""Bulk validation vs calling the scalar validators row by row.
+
+Run with: python benchmarks/bench_validators.py [rows]
+
+The rows mimic a customer import: mostly formatted, valid numbers and
+installment lists, with one row in ten invalid. The scalar loop catches
+APIException for the invalid rows, as an import job has to.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.exceptions import APIException  # noqa: E402
+from tapsilat_py.validators import (  # noqa: E402
+    bulk_validate_gsm_numbers,
+    bulk_validate_installments,
+    validate_gsm_number,
+    validate_installments,
+)
+
+PHONES = ("+90 555 123-45-67", "(0555) 123 45 67", "00905551234567", "5551234567")
+BAD_PHONES = ("555-CALL-NOW", "+90 55")
+INSTALLMENTS = ("1,2,3,6", "1, 3, 6, 9, 12", "", "2,4")
+BAD_INSTALLMENTS = ("1,15", "1,x")
+
+
+def _rows(good, bad, count):
+    rng = random.Random(0)
+    return [rng.choice(bad) if rng.random() < 0.1 else rng.choice(good) for _ in range(count)]
+
+
+def _scalar(validate, rows):
+    values, errors = [], []
+    for row in rows:
+        try:
+            values.append(validate(row))
+            errors.append(None)
+        except APIException as e:
+            values.append(None)
+            errors.append(e.error)
+    return values, errors
+
+
+def _best(fn, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(count=1_000_000):
+    cases = (
+        ("gsm", validate_gsm_number, bulk_validate_gsm_numbers, _rows(PHONES, BAD_PHONES, count)),
+        (
+            "installments",
+            validate_installments,
+            bulk_validate_installments,
+            _rows(INSTALLMENTS, BAD_INSTALLMENTS, count),
+        ),
+    )
+    print(f"{count} rows")
+    print(f"{'':<14}{'scalar s':>12}{'bulk s':>12}{'speedup':>10}")
+    for name, scalar, bulk, rows in cases:
+        scalar_time, (values, errors) = _best(lambda: _scalar(scalar, rows))
+        bulk_time, result = _best(lambda: bulk(rows))
+        assert result.values == values and result.errors == errors
+        print(f"{name:<14}{scalar_time:>12.3f}{bulk_time:>12.3f}{scalar_time / bulk_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,74 @@
+"""Acknowledgement latency of WebhookServer while its handlers are slow.
+
+Run with: python benchmarks/bench_webhook_server.py [events]
+
+Sends signed events over 8 keep-alive connections to a server whose single
+handler sleeps 50 ms per event, with 4 workers and a backlog of 256. It
+reports acknowledgements per second, ack latency percentiles, and how many
+events were shed with 503 once the backlog was full. Handling the accepted
+events takes far longer; none of that shows in the ack latency.
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.webhook_server import WebhookServer  # noqa: E402
+from tapsilat_py.webhooks import WebhookVerifier  # noqa: E402
+
+CONNECTIONS = 8
+
+
+async def _client(port, requests, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for raw in requests:
+        start = time.perf_counter()
+        writer.write(raw)
+        status = int((await reader.readline()).split()[1])
+        while await reader.readline() != b"\r\n":
+            pass
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.close()
+
+
+async def main(events=5000):
+    verifier = WebhookVerifier("whsec_benchmark")
+    server = WebhookServer(verifier, port=0, workers=4, backlog=256)
+
+    @server.on("order.completed")
+    async def slow(event):
+        await asyncio.sleep(0.05)
+
+    requests = []
+    for i in range(events):
+        body = json.dumps(
+            {"event": "order.completed", "reference_id": f"ref-{i}", "data": {"status": 8}}
+        ).encode()
+        requests.append(
+            f"POST /webhooks HTTP/1.1\r\nHost: bench\r\nX-Signature: {verifier.sign(body)}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+
+    latencies, statuses = [], {}
+    await server.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(server.port, requests[i::CONNECTIONS], latencies, statuses)
+        for i in range(CONNECTIONS)
+    ))
+    elapsed = time.perf_counter() - start
+    await server.stop(timeout=0)
+
+    latencies.sort()
+    p50, p99 = (latencies[int(len(latencies) * q)] * 1e3 for q in (0.5, 0.99))
+    print(f"{events} events in {elapsed:.2f}s: {events / elapsed:,.0f} acks/s")
+    print(f"ack latency p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {latencies[-1] * 1e3:.2f} ms")
+    print(f"responses {dict(sorted(statuses.items()))}, handled {server.stats()['handled']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
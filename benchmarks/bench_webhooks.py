@@ -0,0 +1,56 @@
+"""Webhook signature checks per second: verify_webhook vs a WebhookVerifier.
+
+Run with: python benchmarks/bench_webhooks.py [repeats]
+
+"str ==" is verify_webhook as it was, encoding the secret and the body on
+every call and comparing with ==. "verify_webhook" is the current static
+method, which reuses a verifier per secret. "verifier" is a WebhookVerifier
+given the raw body bytes, and "rotation" the same with a newer secret added
+while the signature is still under the older one.
+"""
+import hashlib
+import hmac
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tapsilat_py.client import TapsilatAPI  # noqa: E402
+from tapsilat_py.webhooks import WebhookVerifier  # noqa: E402
+
+SECRET = "whsec_3f9b7c1e5a2d4f6081b9c3e7d5a1f2b4"
+
+
+def _legacy(payload, signature, secret):
+    expected_signature = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return f"sha256={expected_signature}" == signature
+
+
+def main(repeats=5):
+    number = 20000
+    verifier = WebhookVerifier(SECRET)
+    rotating = WebhookVerifier("whsec_new", SECRET)
+    print(f"{'body':<10}" + "".join(
+        f"{name:>16}" for name in ("str ==", "verify_webhook", "verifier", "rotation")
+    ) + "   (checks/s)")
+    for size in (512, 4096, 32768):
+        body = (b'{"event":"order.completed","data":"' + b"x" * size)[:size - 2] + b'"}'
+        text = body.decode()
+        signature = verifier.sign(body)
+        cases = [
+            lambda: _legacy(text, signature, SECRET),
+            lambda: TapsilatAPI.verify_webhook(body, signature, SECRET),
+            lambda: verifier.verify(body, signature),
+            lambda: rotating.verify(memoryview(body), signature),
+        ]
+        rates = []
+        for case in cases:
+            assert case()
+            best = min(timeit.repeat(case, number=number, repeat=repeats))
+            rates.append(number / best)
+        print(f"{size:<10}" + "".join(f"{rate:>16,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -19,6 +19,9 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "fast-json": ["orjson>=3.6"],
+    },
     python_requires=">=3.6",
     project_urls={
         "Source Code": "https://github.com/tapsilat/tapsilat-py",
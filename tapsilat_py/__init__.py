@@ -1,7 +1,9 @@
 __version__ = "2026.4.24.2"
 
+from .async_client import AsyncTapsilatAPI
 from .client import TapsilatAPI
-from .exceptions import APIException
+from .exceptions import APIException, CircuitOpenError, DeadlineExceeded
+from .instrumentation import MetricsCollector
 from .models import (
     OrderCreateDTO,
     OrderPaymentOptionsUpdateDTO,
@@ -13,10 +15,14 @@ from .models import (
     SubscriptionRedirectRequest,
     SubscriptionUser,
 )
+from .retry import RetryPolicy
 
 __all__ = [
     "TapsilatAPI",
+    "AsyncTapsilatAPI",
     "APIException",
+    "CircuitOpenError",
+    "DeadlineExceeded",
     "OrderCreateDTO",
     "OrderPaymentOptionsUpdateDTO",
     "SplitOrderItemPaymentDTO",
@@ -26,4 +32,6 @@ __all__ = [
     "SubscriptionGetRequest",
     "SubscriptionRedirectRequest",
     "SubscriptionUser",
+    "RetryPolicy",
+    "MetricsCollector",
 ]
@@ -0,0 +1,425 @@
+"""Minimal HTTP/1.1 client on asyncio streams, used by AsyncTapsilatAPI.
+
+Only what the Tapsilat API needs is implemented: keep-alive connection pooling
+per host, Content-Length and chunked bodies, and gzip/deflate decoding.
+"""
+import asyncio
+import ssl
+import time
+import zlib
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+_CHUNK_SIZE = 64 * 1024
+_SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# Takes a chunk of a streamed body; may return an awaitable to apply backpressure.
+_BodyWriter = Callable[[bytes], Optional[Awaitable[None]]]
+
+
+class ProtocolError(ConnectionError):
+    """The server sent something that is not a valid HTTP/1.1 response"""
+
+
+class ConnectTimeoutError(TimeoutError):
+    """No connection could be established within the connect timeout"""
+
+
+class PoolTimeoutError(TimeoutError):
+    """No connection slot for the host became free within the acquire timeout"""
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncResponse:
+    def __init__(
+        self,
+        status_code: int,
+        reason: str,
+        headers: Dict[str, str],
+        content: bytes = b"",
+        version: str = "HTTP/1.1",
+    ):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.version = version
+
+
+class _HostPool:
+    def __init__(self, maxsize: int):
+        self.semaphore = asyncio.Semaphore(maxsize)
+        self.idle: Deque[_Connection] = deque()
+
+
+class AsyncConnectionPool:
+    def __init__(
+        self,
+        pool_maxsize: int = 100,
+        keep_alive_timeout: Optional[float] = 60.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        """
+        pool_maxsize: maximum number of open connections per host; further
+            requests wait for a connection to be released.
+        keep_alive_timeout: seconds an idle connection is kept for reuse.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive_timeout = keep_alive_timeout
+        self._ssl_context = ssl_context
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            try:
+                import certifi
+
+                self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+            except ImportError:
+                self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _host_pool(self, key: Tuple[str, str, int]) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(self.pool_maxsize)
+        return pool
+
+    def _pop_idle(self, pool: _HostPool) -> Optional[_Connection]:
+        now = time.monotonic()
+        while pool.idle:
+            conn = pool.idle.pop()
+            expired = (
+                self.keep_alive_timeout is not None
+                and now - conn.last_used > self.keep_alive_timeout
+            )
+            if expired or conn.reader.at_eof():
+                conn.close()
+                continue
+            return conn
+        return None
+
+    async def _connect(
+        self, scheme: str, host: str, port: int, timeout: Optional[float] = None
+    ) -> _Connection:
+        if scheme == "https":
+            opening = asyncio.open_connection(
+                host, port, ssl=self._get_ssl_context(), server_hostname=host
+            )
+        else:
+            opening = asyncio.open_connection(host, port)
+        try:
+            reader, writer = await asyncio.wait_for(opening, timeout)
+        except asyncio.TimeoutError:
+            raise ConnectTimeoutError(
+                f"Connecting to {host}:{port} timed out after {timeout} seconds"
+            ) from None
+        return _Connection(reader, writer)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        stream_to: Optional[Callable[[AsyncResponse], Optional[_BodyWriter]]] = None,
+        chunk_size: int = _CHUNK_SIZE,
+        connect_timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """Send a request and read its response.
+
+        acquire_timeout limits waiting for a free connection slot for the
+        host; connect_timeout limits opening a new connection; timeout limits
+        the exchange as a whole.
+
+        stream_to, when given, is called with the response once its headers
+        are read. If it returns a function, the decoded body is passed to it
+        chunk by chunk, reading up to chunk_size bytes at a time, instead of
+        being collected into response.content; timeout then limits each step
+        rather than the whole exchange. If the function returns an awaitable,
+        it is awaited before the next read.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        query = parts.query
+        if params:
+            encoded = urlencode(params, doseq=True)
+            query = f"{query}&{encoded}" if query else encoded
+        if query:
+            target = f"{target}?{query}"
+        host_header = host if parts.port is None else f"{host}:{parts.port}"
+
+        head = [f"{method} {target} HTTP/1.1", f"Host: {host_header}"]
+        sent = {"host"}
+        for name, value in (headers or {}).items():
+            head.append(f"{name}: {value}")
+            sent.add(name.lower())
+        if "accept-encoding" not in sent:
+            head.append("Accept-Encoding: gzip, deflate")
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            head.append(f"Content-Length: {len(body or b'')}")
+        raw_request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        pool = self._host_pool((scheme, host, port))
+        if acquire_timeout is None:
+            await pool.semaphore.acquire()
+        else:
+            try:
+                await asyncio.wait_for(pool.semaphore.acquire(), max(acquire_timeout, 0))
+            except asyncio.TimeoutError:
+                raise PoolTimeoutError(
+                    f"No connection to {host_header} became free "
+                    f"within {acquire_timeout:.3g} seconds"
+                ) from None
+        try:
+            if stream_to is None:
+                return await asyncio.wait_for(
+                    self._exchange(
+                        pool, scheme, host, port, method, raw_request,
+                        connect_timeout=connect_timeout,
+                    ),
+                    timeout,
+                )
+            return await self._exchange(
+                pool, scheme, host, port, method, raw_request, stream_to, timeout, chunk_size,
+                connect_timeout,
+            )
+        finally:
+            pool.semaphore.release()
+
+    async def _exchange(
+        self,
+        pool: _HostPool,
+        scheme: str,
+        host: str,
+        port: int,
+        method: str,
+        raw_request: bytes,
+        stream_to: Optional[Callable[[AsyncResponse], Optional[_BodyWriter]]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = _CHUNK_SIZE,
+        connect_timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        opening = self._open_exchange(
+            pool, scheme, host, port, method, raw_request, connect_timeout
+        )
+        if stream_to is not None:
+            response, conn = await asyncio.wait_for(opening, timeout)
+        else:
+            response, conn = await opening
+        headers = response.headers
+        try:
+            writer = stream_to(response) if stream_to is not None else None
+            body = _iter_body(conn.reader, method, response.status_code, headers, chunk_size)
+            if writer is None:
+                read = _read_body(body, headers)
+                if stream_to is not None:
+                    read = asyncio.wait_for(read, timeout)
+                response.content = await read
+            else:
+                decoder = _streaming_decoder(headers)
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(body.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+                    written = writer(_inflate(decoder.decompress, chunk) if decoder else chunk)
+                    if written is not None:
+                        await written
+                if decoder:
+                    written = writer(_inflate(decoder.flush))
+                    if written is not None:
+                        await written
+        except BaseException:
+            conn.close()
+            raise
+
+        reusable = (
+            response.version == "HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+            and _is_framed(method, response.status_code, headers)
+        )
+        if reusable:
+            conn.last_used = time.monotonic()
+            pool.idle.append(conn)
+        else:
+            conn.close()
+        return response
+
+    async def _open_exchange(
+        self,
+        pool: _HostPool,
+        scheme: str,
+        host: str,
+        port: int,
+        method: str,
+        raw_request: bytes,
+        connect_timeout: Optional[float] = None,
+    ) -> Tuple[AsyncResponse, _Connection]:
+        """Send the request and read the response up to the end of its headers"""
+        conn = self._pop_idle(pool)
+        reused = conn is not None
+        if conn is None:
+            conn = await self._connect(scheme, host, port, connect_timeout)
+        try:
+            sent = False
+            try:
+                conn.writer.write(raw_request)
+                await conn.writer.drain()
+                sent = True
+                status_line = await conn.reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("Connection closed before response")
+            except ConnectionError:
+                # A stale idle connection fails like this, but so does a server
+                # that read the request and then dropped the connection. Only
+                # send again when the request cannot have been processed twice:
+                # writing it failed, or the method is safe to repeat. Anything
+                # else is left to the retry policy.
+                if not reused or (sent and method not in _SAFE_METHODS):
+                    raise
+                conn.close()
+                conn = await self._connect(scheme, host, port, connect_timeout)
+                conn.writer.write(raw_request)
+                await conn.writer.drain()
+                status_line = await conn.reader.readline()
+
+            version, status_code, reason = _parse_status_line(status_line)
+            while 100 <= status_code < 200:
+                await _read_headers(conn.reader)
+                version, status_code, reason = _parse_status_line(
+                    await conn.reader.readline()
+                )
+            response_headers = await _read_headers(conn.reader)
+        except BaseException:
+            conn.close()
+            raise
+        return AsyncResponse(status_code, reason, response_headers, version=version), conn
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            while pool.idle:
+                pool.idle.pop().close()
+        self._pools.clear()
+
+
+def _parse_status_line(line: bytes) -> Tuple[str, int, str]:
+    try:
+        version, status, *reason = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        return version, int(status), reason[0] if reason else ""
+    except ValueError:
+        raise ProtocolError(f"Malformed status line: {line!r}") from None
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise ProtocolError(f"Malformed header line: {line!r}")
+        name = name.strip().lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+
+def _has_body(method: str, status_code: int) -> bool:
+    return method != "HEAD" and status_code not in (204, 304) and status_code >= 200
+
+
+def _is_framed(method: str, status_code: int, headers: Dict[str, str]) -> bool:
+    return (
+        not _has_body(method, status_code)
+        or "chunked" in headers.get("transfer-encoding", "").lower()
+        or "content-length" in headers
+    )
+
+
+async def _iter_body(
+    reader: asyncio.StreamReader,
+    method: str,
+    status_code: int,
+    headers: Dict[str, str],
+    chunk_size: int = _CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    if not _has_body(method, status_code):
+        return
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise ProtocolError(f"Malformed chunk size: {size_line!r}") from None
+            if size == 0:
+                # Skip trailers up to the terminating blank line.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+    elif "content-length" in headers:
+        try:
+            remaining = int(headers["content-length"])
+        except ValueError:
+            remaining = -1
+        if remaining < 0:
+            raise ProtocolError(f"Malformed Content-Length: {headers['content-length']!r}")
+        while remaining:
+            chunk = await reader.read(min(remaining, chunk_size))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        while True:
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def _read_body(body: AsyncIterator[bytes], headers: Dict[str, str]) -> bytes:
+    chunks: List[bytes] = []
+    async for chunk in body:
+        chunks.append(chunk)
+    return _decode(b"".join(chunks), headers)
+
+
+def _streaming_decoder(headers: Dict[str, str]):
+    if headers.get("content-encoding", "").lower() in ("gzip", "deflate"):
+        return zlib.decompressobj(47)
+    return None
+
+
+def _decode(content: bytes, headers: Dict[str, str]) -> bytes:
+    encoding = headers.get("content-encoding", "").lower()
+    if content and encoding in ("gzip", "deflate"):
+        # wbits=47 accepts both gzip and zlib framing.
+        return _inflate(zlib.decompress, content, 47)
+    return content
+
+
+def _inflate(decompress: Callable[..., bytes], *args: Any) -> bytes:
+    try:
+        return decompress(*args)
+    except zlib.error as e:
+        raise ProtocolError(f"Corrupt compressed body: {e}") from None
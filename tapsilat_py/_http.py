@@ -0,0 +1,110 @@
+"""Transport-independent helpers shared by the sync and async clients."""
+import json
+import re
+from functools import lru_cache
+from typing import Optional, Pattern, Tuple
+
+from .exceptions import APIException
+
+
+def filename_from_content_disposition(value: Optional[str]) -> str:
+    filename = "download"
+    if value and "filename=" in value:
+        filename = value.split("filename=")[-1].strip('"')
+    return filename
+
+
+def api_exception_from_response(
+    status_code: int, content: bytes, reason: Optional[str]
+) -> APIException:
+    """Build the APIException for an error response from its status and body"""
+    if not content:
+        return APIException(status_code, -1, reason or "HTTP error with no content")
+
+    text = content.decode("utf-8", errors="replace")
+    try:
+        error_data = json.loads(content)
+    except ValueError:
+        return APIException(status_code, -1, text)
+    if not isinstance(error_data, dict):
+        return APIException(status_code, -1, text)
+    return APIException(
+        status_code, error_data.get("code", -1), error_data.get("error", text)
+    )
+
+
+# Endpoints with path parameters, most specific first. Static endpoints such as
+# /order/list are matched before these so they are not taken for an id.
+ENDPOINT_TEMPLATES = (
+    "/order/conversation/{conversation_id}",
+    "/order/{reference_id}/payment-details",
+    "/order/{reference_id}/status",
+    "/order/{reference_id}/transactions",
+    "/order/{id}/export/pdf",
+    "/order/{id}/export/excel",
+    "/order/{reference_id}",
+    "/orders/{id}/callback",
+    "/orders/{id}/vpos-query",
+    "/organization/metas/{name}",
+    "/organization/suborganizations/{id}/submerchant",
+    "/organization/suborganizations/{id}",
+    "/submerchants/{id}/suborganization",
+    "/submerchants/{id}",
+)
+
+STATIC_ENDPOINTS = frozenset(
+    (
+        "/order/accounting",
+        "/order/basket-item",
+        "/order/callback",
+        "/order/cancel",
+        "/order/create",
+        "/order/list",
+        "/order/oip",
+        "/order/payment-details",
+        "/order/payment-options",
+        "/order/payments",
+        "/order/postauth",
+        "/order/refund",
+        "/order/refund-all",
+        "/order/refund-request",
+        "/order/releated",
+        "/order/split",
+        "/order/submerchants",
+        "/order/term",
+        "/order/terminate",
+    )
+)
+
+
+def _compile_template(template: str) -> Tuple[Pattern, str]:
+    pattern = re.sub(r"\\\{[a-z_]+\\\}", "[^/]+", re.escape(template))
+    return re.compile(pattern + "$"), template
+
+
+_TEMPLATE_PATTERNS = tuple(_compile_template(t) for t in ENDPOINT_TEMPLATES)
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(endpoint: str) -> str:
+    """Map a concrete endpoint such as /order/abc/status to /order/{reference_id}/status"""
+    endpoint = "/" + endpoint.lstrip("/")
+    if endpoint in STATIC_ENDPOINTS:
+        return endpoint
+    for pattern, template in _TEMPLATE_PATTERNS:
+        if pattern.match(endpoint):
+            return template
+    return endpoint
+
+
+def endpoint_group(method: str, endpoint: str) -> str:
+    """Coarse group used to budget and isolate traffic: order_read, order_write,
+    system, organization, or default for everything else"""
+    endpoint = "/" + endpoint.lstrip("/")
+    if endpoint.startswith("/system/"):
+        return "system"
+    if endpoint.startswith("/organization/"):
+        return "organization"
+    if endpoint.startswith(("/order/", "/orders/")):
+        return "order_read" if method == "GET" else "order_write"
+    return "default"
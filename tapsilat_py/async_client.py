@@ -0,0 +1,1019 @@
+import asyncio
+import os
+import time
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ._async_http import AsyncConnectionPool, AsyncResponse, PoolTimeoutError
+from ._http import api_exception_from_response, filename_from_content_disposition
+from .client import TapsilatAPI, _order_create_payload, _order_list_params
+from .cache import TTLCache
+from .circuit import CircuitBreaker
+from .coalescing import RequestCoalescer, request_key
+from .downloads import (
+    EXPORT_FORMATS,
+    Destination,
+    ExportNames,
+    StreamingDownload,
+    body_size,
+    export_jobs,
+    manifest_entry,
+)
+from .exceptions import APIException, DeadlineExceeded
+from .idempotency import DONE, IdempotencyKeys
+from .instrumentation import Hooks, RequestEvent
+from .json_codec import get_codec
+from .models import (
+    OrderAccountingRequest,
+    OrderCreateDTO,
+    OrderPaymentTermCreateDTO,
+    OrderPostAuthRequest,
+    OrderTermRefundRequest,
+    RefundOrderDTO,
+    CancelOrderDTO,
+    RefundAllOrderDTO,
+    OrderPaymentDetailDTO,
+    TerminateRequest,
+    OrderRelatedReferenceDTO,
+    OrderPaymentTermDeleteDTO,
+    OrderPaymentTermUpdateDTO,
+    OrgCreateBusinessRequest,
+    GetUserLimitRequest,
+    SetLimitUserRequest,
+    GetVposRequest,
+    OrgCreateUserReq,
+    OrgUserVerifyReq,
+    OrgUserMobileVerifyReq,
+    OrderManualCallbackDTO,
+    SubscriptionCancelRequest,
+    SubscriptionCreateRequest,
+    SubscriptionGetRequest,
+    SubscriptionRedirectRequest,
+    AddBasketItemRequest,
+    RemoveBasketItemRequest,
+    UpdateBasketItemRequest,
+    CallbackURLDTO,
+    OrderPaymentOptionsUpdateDTO,
+    SplitOrderItemPaymentDTO,
+    GetOrderPaymentsRequest,
+    OrderOIPDTO,
+    OrgUserTokenCreateReq,
+    SubmerchantCreateDTO,
+    SubmerchantUpdateDTO,
+    BulkOrderResult,
+    DownloadResult,
+    ExportManifestEntry,
+    FileResponse,
+)
+from .pagination import aiter_records
+from .ratelimit import RateLimiter
+from .responses import (
+    OrderPage,
+    OrderResponse,
+    PaymentDetailsResponse,
+    SubmerchantPage,
+    SubmerchantResponse,
+    SubscriptionPage,
+    SubscriptionResponse,
+    TransactionResponse,
+    decode,
+    decode_list,
+)
+from .retry import RetryPolicy
+from .streaming import aiter_rows
+from .timeouts import (
+    TimeoutValue,
+    Timeouts,
+    acquire_within,
+    bound,
+    current_deadline,
+    remaining,
+    stop_retrying,
+)
+
+
+class AsyncTapsilatAPI:
+    """asyncio counterpart of TapsilatAPI with the same methods as coroutines"""
+
+    def __init__(
+        self,
+        api_key: str = "",
+        timeout: TimeoutValue = 10,
+        base_url: str = "https://panel.tapsilat.dev/api/v1",
+        pool_maxsize: int = 100,
+        keep_alive_timeout: Optional[float] = 60.0,
+        max_concurrency: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        system_cache: Optional[TTLCache] = None,
+        hooks: Iterable[Any] = (),
+        coalescer: Optional[RequestCoalescer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoint_timeouts: Optional[Dict[str, TimeoutValue]] = None,
+        idempotency: Optional[IdempotencyKeys] = None,
+        json_codec: Any = "stdlib",
+    ):
+        """
+        timeout: seconds to wait for the connection and for the response, or
+            a (connect, read) tuple to set them separately. None waits forever.
+        pool_maxsize: maximum number of connections kept open to the API host.
+        keep_alive_timeout: seconds a pooled connection may sit idle before it
+            is dropped instead of reused. None keeps connections indefinitely.
+        max_concurrency: cap on requests in flight at once across all calls on
+            this client. Excess calls wait their turn. None means no cap beyond
+            pool_maxsize.
+        retry_policy: when and how failed requests are retried. Defaults to
+            RetryPolicy(), which retries idempotent GETs only.
+        system_cache: opt-in cache for the get_system_* reference data.
+        hooks: objects with before_request/after_response/on_error methods
+            called around every attempt; see TapsilatAPI.
+        coalescer: opt-in RequestCoalescer; identical GETs issued while one
+            is in flight share its response instead of sending their own.
+        rate_limiter: opt-in RateLimiter; every attempt waits for a token from
+            its endpoint group's bucket before it is sent.
+        circuit_breaker: opt-in CircuitBreaker; while the circuit for an
+            endpoint group is open its calls raise CircuitOpenError at once.
+        endpoint_timeouts: timeouts for particular endpoints, keyed by glob
+            patterns over endpoint templates, e.g. {"/order/*/export/*": 120,
+            "/system/*": (1, 2)}. The first matching pattern wins.
+        idempotency: opt-in IdempotencyKeys; writes such as create_order and
+            refund_order are sent with an idempotency key, and a write whose
+            result is journaled returns that result instead of being resent.
+        json_codec: how request and response bodies are encoded: "stdlib",
+            "orjson", "auto" (orjson when installed) or a codec object with
+            dumps() and loads(); see tapsilat_py.json_codec.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self._timeouts = Timeouts(timeout, endpoint_timeouts)
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.system_cache = system_cache
+        self.hooks = Hooks(hooks)
+        self.coalescer = coalescer
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.idempotency = idempotency
+        self.json_codec = get_codec(json_codec)
+        self._pool = AsyncConnectionPool(
+            pool_maxsize=pool_maxsize, keep_alive_timeout=keep_alive_timeout
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncTapsilatAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close pooled connections. The client reconnects on next use."""
+        await self._pool.close()
+
+    def _get_headers(self):
+        headers = {"Accept": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        # Created lazily so it binds to the loop the client is used on.
+        if self.max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        body: Optional[bytes],
+        download: Optional[StreamingDownload] = None,
+        timeout: Tuple[Optional[float], Optional[float]] = (None, None),
+    ) -> AsyncResponse:
+        options: Dict[str, Any] = {
+            "connect_timeout": timeout[0],
+            "timeout": timeout[1],
+            # Waiting for a pooled connection counts against the deadline too.
+            "acquire_timeout": remaining(),
+        }
+        if download is not None:
+            options["stream_to"] = lambda response: self._open_download(response, download)
+            options["chunk_size"] = download.chunk_size
+        semaphore = self._get_semaphore()
+        if semaphore is not None:
+            await acquire_within(semaphore)
+        try:
+            return await self._pool.request(
+                method, url, params=params, headers=headers, body=body, **options
+            )
+        except PoolTimeoutError:
+            raise DeadlineExceeded(current_deadline().seconds) from None
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    @staticmethod
+    def _open_download(
+        response: AsyncResponse, download: StreamingDownload
+    ) -> Optional[Callable[[bytes], None]]:
+        if response.status_code >= 400:
+            return None
+        download.open(
+            filename_from_content_disposition(response.headers.get("content-disposition")),
+            body_size(
+                response.headers.get("content-length"),
+                response.headers.get("content-encoding"),
+            ),
+        )
+        return partial(AsyncTapsilatAPI._write_download, download)
+
+    @staticmethod
+    def _write_download(download: StreamingDownload, chunk: bytes) -> Any:
+        try:
+            return download.write(chunk)
+        except ValueError as e:
+            # A list page that is not JSON.
+            raise APIException(0, -1, str(e)) from e
+
+    @staticmethod
+    def _finish_download(download: StreamingDownload) -> Any:
+        try:
+            return download.finish()
+        except ValueError as e:
+            # A list page cut short.
+            download.abort()
+            raise APIException(0, -1, str(e)) from e
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_payload: Optional[Dict[str, Any]] = None,
+        raw_response: bool = False,
+        download: Optional[StreamingDownload] = None,
+    ) -> Any:
+        if self.coalescer is not None and method == "GET" and download is None:
+            return await self.coalescer.run_async(
+                request_key(endpoint, params, raw_response, json_payload),
+                lambda: self._request(method, endpoint, params, json_payload, raw_response),
+            )
+        idempotency = self.idempotency
+        if idempotency is not None and idempotency.applies(method, endpoint):
+            entry = idempotency.start(method, endpoint, json_payload)
+            if entry.state == DONE:
+                return entry.result
+            try:
+                result = await self._request(
+                    method, endpoint, params, json_payload, raw_response,
+                    extra_headers={idempotency.header: entry.key},
+                )
+            except APIException as e:
+                idempotency.failed(entry, e)
+                raise
+            idempotency.succeeded(entry, result)
+            return result
+        return await self._request(method, endpoint, params, json_payload, raw_response, download)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        json_payload: Optional[Dict[str, Any]],
+        raw_response: bool,
+        download: Optional[StreamingDownload] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        body = None
+        if json_payload is not None:
+            body = self.json_codec.dumps(json_payload)
+            headers["Content-Type"] = "application/json"
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+
+        started = time.monotonic()
+        attempt = 0
+
+        hooks = self.hooks
+        breaker = self.circuit_breaker
+        timeouts = self._timeouts.for_endpoint(endpoint)
+        while True:
+            attempt += 1
+            permit = None
+            if breaker is not None:
+                # Before the rate limiter: an open circuit fails fast without
+                # waiting for, or spending, a token.
+                permit = breaker.acquire(method, endpoint)
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async(method, endpoint)
+                connect_timeout, read_timeout = bound(timeouts)
+            except BaseException:
+                if permit is not None:
+                    breaker.release(permit)
+                raise
+            event = None
+            if hooks:
+                event = RequestEvent(method, endpoint, attempt, headers)
+                hooks.before_request(event)
+            sent = time.monotonic()
+            try:
+                response = await self._send(
+                    method, url, params, headers, body, download, (connect_timeout, read_timeout)
+                )
+            except (OSError, EOFError, asyncio.TimeoutError) as e:
+                if permit is not None:
+                    breaker.record(permit, True)
+                if event is not None:
+                    hooks.on_error(event.failed(e, len(body or b"")))
+                if download is not None and download.started:
+                    # Not retried once bytes have been written: the destination
+                    # is no longer in its original state.
+                    delay = None
+                else:
+                    delay = self.retry_policy.next_delay(
+                        method, endpoint, attempt, time.monotonic() - started, exception=e
+                    )
+                message = str(e)
+                if isinstance(e, asyncio.TimeoutError):
+                    message = message or f"Request timed out after {read_timeout} seconds"
+                failure = stop_retrying(delay, APIException(0, -1, message), timed_out=True)
+                if failure is not None:
+                    if download is not None:
+                        download.abort()
+                    raise failure from e
+            except BaseException:
+                if permit is not None:
+                    breaker.release(permit)
+                if download is not None:
+                    download.abort()
+                raise
+            else:
+                if permit is not None:
+                    breaker.record(permit, response.status_code >= 500, time.monotonic() - sent)
+                if event is not None:
+                    if download is not None and response.status_code < 400:
+                        response_size = download.written
+                    else:
+                        response_size = len(response.content)
+                    hooks.after_response(
+                        event.responded(response.status_code, len(body or b""), response_size)
+                    )
+                if response.status_code < 400:
+                    if download is not None:
+                        return self._finish_download(download)
+                    return self._parse_response(response, raw_response)
+                delay = self.retry_policy.next_delay(
+                    method,
+                    endpoint,
+                    attempt,
+                    time.monotonic() - started,
+                    status_code=response.status_code,
+                    retry_after=response.headers.get("retry-after"),
+                )
+                failure = stop_retrying(
+                    delay,
+                    api_exception_from_response(
+                        response.status_code, response.content, response.reason
+                    ),
+                )
+                if failure is not None:
+                    raise failure
+            await asyncio.sleep(delay)
+
+    def _parse_response(self, response: AsyncResponse, raw_response: bool) -> Any:
+        if raw_response:
+            filename = filename_from_content_disposition(
+                response.headers.get("content-disposition")
+            )
+            return FileResponse(response.content, filename)
+
+        if not response.content:
+            return {}
+        try:
+            return self.json_codec.loads(response.content)
+        except ValueError as e:
+            # A 2xx body that is not JSON, e.g. a proxy's HTML page.
+            raise APIException(0, -1, str(e)) from e
+
+    async def _get_reference_data(self, endpoint: str) -> dict:
+        if self.system_cache is None:
+            return await self._make_request("GET", endpoint)
+        return await self.system_cache.get_or_load_async(
+            endpoint, lambda: self._make_request("GET", endpoint)
+        )
+
+    async def create_order(self, order: OrderCreateDTO) -> OrderResponse:
+        endpoint = "/order/create"
+        payload = _order_create_payload(order)
+        response_data = await self._make_request("POST", endpoint, json_payload=payload)
+        response = OrderResponse(response_data)
+
+        return response
+
+    async def create_orders_bulk(
+        self, orders: Iterable[OrderCreateDTO], concurrency: int = 8
+    ) -> List[BulkOrderResult]:
+        """Create many orders, a few at a time; see TapsilatAPI.create_orders_bulk"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def create(index, order):
+            async with semaphore:
+                try:
+                    return BulkOrderResult(index, response=await self.create_order(order))
+                except APIException as e:
+                    return BulkOrderResult(index, error=e)
+
+        return list(await asyncio.gather(*(create(i, o) for i, o in enumerate(orders))))
+
+    async def order_accounting(self, request: OrderAccountingRequest) -> dict:
+        endpoint = "/order/accounting"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def order_postauth(self, request: OrderPostAuthRequest) -> dict:
+        endpoint = "/order/postauth"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_system_order_statuses(self) -> dict:
+        endpoint = "/system/order-statuses"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_basket_item_types(self) -> dict:
+        endpoint = "/system/basket-item-types"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_error_codes(self) -> dict:
+        endpoint = "/system/error-codes"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_payment_term_statuses(self) -> dict:
+        endpoint = "/system/payment-term-statuses"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_product_types(self) -> dict:
+        endpoint = "/system/product-types"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_shortcut_types(self) -> dict:
+        endpoint = "/system/shortcut-types"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_transaction_payment_types(self) -> dict:
+        endpoint = "/system/transaction-payment-types"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_transaction_purposes(self) -> dict:
+        endpoint = "/system/transaction-purposes"
+        return await self._get_reference_data(endpoint)
+
+    async def get_system_transaction_statuses(self) -> dict:
+        endpoint = "/system/transaction-statuses"
+        return await self._get_reference_data(endpoint)
+
+    async def get_order(self, reference_id: str) -> OrderResponse:
+        endpoint = f"/order/{reference_id}"
+        response = await self._make_request("GET", endpoint)
+        return OrderResponse(response)
+
+    async def get_order_by_conversation_id(self, conversation_id: str) -> OrderResponse:
+        endpoint = f"/order/conversation/{conversation_id}"
+        response = await self._make_request("GET", endpoint)
+        return OrderResponse(response)
+
+    async def get_order_list(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        start_date: str = "",
+        end_date: str = "",
+        organization_id: str = "",
+        related_reference_id: str = "",
+        buyer_id: str = "",
+        status: Optional[int] = None,
+    ) -> OrderPage:
+        endpoint = "/order/list"
+        params = _order_list_params(
+            page, per_page, start_date, end_date, organization_id,
+            related_reference_id, buyer_id, status,
+        )
+        response = await self._make_request("GET", endpoint, params=params)
+        return decode(response, OrderPage)
+
+    async def iter_orders(
+        self,
+        start_date: str = "",
+        end_date: str = "",
+        organization_id: str = "",
+        related_reference_id: str = "",
+        buyer_id: str = "",
+        status: Optional[int] = None,
+        per_page: int = 50,
+        prefetch: int = 0,
+        concurrency: int = 1,
+    ) -> AsyncIterator[OrderResponse]:
+        """Iterate over orders matching the filters, fetching pages on demand.
+
+        prefetch: number of following pages requested in the background while
+        the current page is consumed.
+        concurrency: for bulk exports, the number of pages fetched at once
+        after the first page reports the total. Orders are still yielded in
+        page order, and the first error stops the export.
+        """
+
+        def fetch_page(page: int):
+            return self.get_order_list(
+                page=page,
+                per_page=per_page,
+                start_date=start_date,
+                end_date=end_date,
+                organization_id=organization_id,
+                related_reference_id=related_reference_id,
+                buyer_id=buyer_id,
+                status=status,
+            )
+
+        async for record in aiter_records(
+            fetch_page, per_page, prefetch=prefetch, concurrency=concurrency
+        ):
+            yield record
+
+    async def iter_order_page(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        start_date: str = "",
+        end_date: str = "",
+        organization_id: str = "",
+        related_reference_id: str = "",
+        buyer_id: str = "",
+        status: Optional[int] = None,
+        backlog: int = 32,
+    ) -> AsyncIterator[OrderResponse]:
+        """Orders of one get_order_list page, each yielded as soon as it is read;
+        see TapsilatAPI.iter_order_page"""
+        endpoint = "/order/list"
+        params = _order_list_params(
+            page, per_page, start_date, end_date, organization_id,
+            related_reference_id, buyer_id, status,
+        )
+        rows = aiter_rows(
+            lambda stream: self._make_request("GET", endpoint, params=params, download=stream),
+            backlog,
+        )
+        try:
+            async for row in rows:
+                yield decode(row, OrderResponse)
+        finally:
+            await rows.aclose()
+
+    async def get_order_submerchants(self, page: int = 1, per_page: int = 10) -> SubmerchantPage:
+        endpoint = "/order/submerchants"
+        params = {"page": page, "per_page": per_page}
+        response = await self._make_request("GET", endpoint, params=params)
+        return decode(response, SubmerchantPage)
+
+    async def iter_order_submerchants(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> AsyncIterator[SubmerchantResponse]:
+        """Iterate over order submerchants, fetching pages on demand"""
+        async for record in aiter_records(
+            lambda page: self.get_order_submerchants(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        ):
+            yield record
+
+    async def get_checkout_url(self, reference_id: str) -> str:
+        response = await self.get_order(reference_id)
+        return response.checkout_url
+
+    async def cancel_order(self, request: CancelOrderDTO) -> dict:
+        endpoint = "/order/cancel"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def refund_order(self, refund_data: RefundOrderDTO) -> dict:
+        endpoint = "/order/refund"
+        payload = refund_data.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def refund_all_order(self, request: RefundAllOrderDTO) -> dict:
+        endpoint = "/order/refund-all"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_order_payment_details(
+        self, request: OrderPaymentDetailDTO
+    ) -> PaymentDetailsResponse:
+        endpoint = "/order/payment-details"
+        payload = request.to_dict()
+        response = await self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, PaymentDetailsResponse)
+
+    async def get_order_payment_details_by_id(self, reference_id: str) -> PaymentDetailsResponse:
+        endpoint = f"/order/{reference_id}/payment-details"
+        response = await self._make_request("GET", endpoint)
+        return decode(response, PaymentDetailsResponse)
+
+    async def get_order_status(self, reference_id: str) -> dict:
+        endpoint = f"/order/{reference_id}/status"
+        return await self._make_request("GET", endpoint)
+
+    async def get_order_transactions(self, reference_id: str) -> List[TransactionResponse]:
+        endpoint = f"/order/{reference_id}/transactions"
+        response = await self._make_request("GET", endpoint)
+        return decode_list(response, TransactionResponse)
+
+    async def create_order_term(self, term: OrderPaymentTermCreateDTO) -> dict:
+        endpoint = "/order/term"
+        payload = term.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def delete_order_term(self, request: OrderPaymentTermDeleteDTO) -> dict:
+        endpoint = "/order/term"
+        payload = request.to_dict()
+        return await self._make_request("DELETE", endpoint, json_payload=payload)
+
+    async def update_order_term(self, request: OrderPaymentTermUpdateDTO) -> dict:
+        endpoint = "/order/term"
+        payload = request.to_dict()
+        return await self._make_request("PATCH", endpoint, json_payload=payload)
+
+    async def get_order_term(self, term_reference_id: str) -> dict:
+        endpoint = "/order/term"
+        params = {"term_reference_id": term_reference_id}
+        return await self._make_request("GET", endpoint, params=params)
+
+    async def refund_order_term(self, term: OrderTermRefundRequest) -> dict:
+        endpoint = "/order/term/refund"
+        payload = term.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def terminate_order(self, request: TerminateRequest) -> dict:
+        endpoint = "/order/terminate"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def manual_callback(self, request: OrderManualCallbackDTO) -> dict:
+        endpoint = "/order/callback"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def related_update(self, request: OrderRelatedReferenceDTO) -> dict:
+        endpoint = "/order/releated"
+        payload = request.to_dict()
+        return await self._make_request("PATCH", endpoint, json_payload=payload)
+
+    async def update_payment_options(self, request: OrderPaymentOptionsUpdateDTO) -> dict:
+        endpoint = "/order/payment-options"
+        payload = request.to_dict()
+        return await self._make_request("PATCH", endpoint, json_payload=payload)
+
+    async def split_order_item_payment(self, request: SplitOrderItemPaymentDTO) -> dict:
+        endpoint = "/order/split"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def order_callback(self, id: str) -> dict:
+        endpoint = f"/orders/{id}/callback"
+        return await self._make_request("GET", endpoint)
+
+    async def order_vpos_query(self, id: str) -> dict:
+        endpoint = f"/orders/{id}/vpos-query"
+        return await self._make_request("GET", endpoint)
+
+    async def add_basket_item(self, request: AddBasketItemRequest) -> dict:
+        endpoint = "/order/basket-item"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def remove_basket_item(self, request: RemoveBasketItemRequest) -> dict:
+        endpoint = "/order/basket-item"
+        payload = request.to_dict()
+        return await self._make_request("DELETE", endpoint, json_payload=payload)
+
+    async def update_basket_item(self, request: UpdateBasketItemRequest) -> dict:
+        endpoint = "/order/basket-item"
+        payload = request.to_dict()
+        return await self._make_request("PATCH", endpoint, json_payload=payload)
+
+    async def get_orders(
+        self, page: str = "1", per_page: str = "10", buyer_id: str = ""
+    ) -> dict:
+        """DEPRECATED: Use get_order_list instead. Get orders with pagination and optional buyer filter"""
+        return await self.get_order_list(page=int(page), per_page=int(per_page), buyer_id=buyer_id)
+
+    async def get_order_payments(self, request: GetOrderPaymentsRequest) -> dict:
+        endpoint = "/order/payments"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_order_pdf(self, id: str) -> FileResponse:
+        endpoint = f"/order/{id}/export/pdf"
+        return await self._make_request("GET", endpoint, raw_response=True)
+
+    async def get_order_excel(self, id: str) -> FileResponse:
+        endpoint = f"/order/{id}/export/excel"
+        return await self._make_request("GET", endpoint, raw_response=True)
+
+    async def download_order_pdf(
+        self,
+        id: str,
+        destination: Destination = None,
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        checksum: Optional[str] = None,
+    ) -> DownloadResult:
+        """Stream the order's PDF export to destination; see TapsilatAPI.download_order_pdf"""
+        endpoint = f"/order/{id}/export/pdf"
+        download = StreamingDownload(destination, chunk_size, progress, checksum)
+        return await self._make_request("GET", endpoint, download=download)
+
+    async def download_order_excel(
+        self,
+        id: str,
+        destination: Destination = None,
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        checksum: Optional[str] = None,
+    ) -> DownloadResult:
+        """Stream the order's Excel export to destination; see TapsilatAPI.download_order_pdf"""
+        endpoint = f"/order/{id}/export/excel"
+        download = StreamingDownload(destination, chunk_size, progress, checksum)
+        return await self._make_request("GET", endpoint, download=download)
+
+    async def download_order_exports(
+        self,
+        order_ids: Iterable[str],
+        directory: str,
+        formats: Sequence[str] = EXPORT_FORMATS,
+        concurrency: int = 4,
+        checksum: Optional[str] = None,
+    ) -> List[ExportManifestEntry]:
+        """Download the exports of many orders; see TapsilatAPI.download_order_exports"""
+        jobs = export_jobs(order_ids, formats)
+        os.makedirs(directory, exist_ok=True)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        names = ExportNames()
+
+        async def download(order_id, export_format):
+            endpoint = f"/order/{order_id}/export/{export_format}"
+            stream = StreamingDownload(
+                directory,
+                checksum=checksum,
+                name=lambda filename: names.claim(order_id, export_format, filename),
+            )
+            async with semaphore:
+                try:
+                    result = await self._make_request("GET", endpoint, download=stream)
+                except (APIException, OSError) as e:
+                    return manifest_entry(order_id, export_format, error=e)
+            return manifest_entry(order_id, export_format, result)
+
+        return list(await asyncio.gather(*(download(*job) for job in jobs)))
+
+    async def create_order_refund_request(self, request: RefundOrderDTO) -> dict:
+        endpoint = "/order/refund-request"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def add_order_oip(self, request: OrderOIPDTO) -> dict:
+        endpoint = "/order/oip"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_organization_settings(self) -> dict:
+        """Get organization settings"""
+        endpoint = "/organization/settings"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_callback(self) -> dict:
+        """Get organization webhook callback URLs"""
+        endpoint = "/organization/callback"
+        return await self._make_request("GET", endpoint)
+
+    async def update_organization_callback(self, request: CallbackURLDTO) -> dict:
+        """Update organization webhook callback URLs"""
+        endpoint = "/organization/callback"
+        payload = request.to_dict()
+        return await self._make_request("PATCH", endpoint, json_payload=payload)
+
+    async def create_organization_business(self, request: OrgCreateBusinessRequest) -> dict:
+        """Create Business Entity"""
+        endpoint = "/organization/business/create"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_organization_currencies(self) -> dict:
+        """List Supported Currencies"""
+        endpoint = "/organization/currencies"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_limit_user(self, request: GetUserLimitRequest) -> dict:
+        """Get User Limits Configuration"""
+        endpoint = "/organization/limit/user"
+        payload = request.to_dict()
+        return await self._make_request("GET", endpoint, json_payload=payload)
+
+    async def set_organization_limit_user(self, request: SetLimitUserRequest) -> dict:
+        """Set Limit To User"""
+        endpoint = "/organization/limit/user"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_organization_limits(self) -> dict:
+        """Get Organization Transaction Limits"""
+        endpoint = "/organization/limits"
+        return await self._make_request("GET", endpoint)
+
+    async def list_organization_vpos(self, request: GetVposRequest) -> dict:
+        """List Virtual POS Terminals"""
+        endpoint = "/organization/list-vpos"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def get_organization_meta(self, name: str) -> dict:
+        """Get Organization Metadata"""
+        endpoint = f"/organization/metas/{name}"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_scopes(self) -> dict:
+        """Get Organization Permissions"""
+        endpoint = "/organization/scopes"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_suborganizations(
+        self, page: int = 1, per_page: int = 10
+    ) -> dict:
+        """List Sub-Organizations"""
+        endpoint = "/organization/suborganizations"
+        params = {"page": page, "per_page": per_page}
+        return await self._make_request("GET", endpoint, params=params)
+
+    async def iter_organization_suborganizations(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> AsyncIterator[dict]:
+        """Iterate over sub-organizations, fetching pages on demand"""
+        async for record in aiter_records(
+            lambda page: self.get_organization_suborganizations(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        ):
+            yield record
+
+    async def get_organization_suborganization_details(self, id: str) -> dict:
+        """Get Sub-Organization Details"""
+        endpoint = f"/organization/suborganizations/{id}"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_suborganization_submerchants(self, id: str) -> dict:
+        """Get Sub-Organization Submerchants"""
+        endpoint = f"/organization/suborganizations/{id}/submerchant"
+        return await self._make_request("GET", endpoint)
+
+    async def get_organization_currency_presets(self) -> dict:
+        """Get Organization Currency Presets"""
+        endpoint = "/organization/currency-presets"
+        return await self._make_request("GET", endpoint)
+
+    async def create_organization_user(self, request: OrgCreateUserReq) -> dict:
+        """Create Organization User"""
+        endpoint = "/organization/user/create"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def verify_organization_user(self, request: OrgUserVerifyReq) -> dict:
+        """Verify User"""
+        endpoint = "/organization/user/verify"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def verify_organization_user_mobile(self, request: OrgUserMobileVerifyReq) -> dict:
+        """Verify User Mobile"""
+        endpoint = "/organization/user/verify-mobile"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def create_organization_user_token(self, request: OrgUserTokenCreateReq) -> dict:
+        """Create Organization User Token"""
+        endpoint = "/organization/user/token"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    # Submerchant methods
+    async def create_submerchant(self, request: SubmerchantCreateDTO) -> SubmerchantResponse:
+        """Create Submerchant"""
+        endpoint = "/submerchants"
+        payload = request.to_dict()
+        response = await self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubmerchantResponse)
+
+    async def get_submerchant(self, id: str) -> SubmerchantResponse:
+        """Get Submerchant by ID"""
+        endpoint = f"/submerchants/{id}"
+        response = await self._make_request("GET", endpoint)
+        return decode(response, SubmerchantResponse)
+
+    async def get_suborganization_by_submerchant(self, id: str) -> dict:
+        """Get Suborganization by Submerchant ID"""
+        endpoint = f"/submerchants/{id}/suborganization"
+        return await self._make_request("GET", endpoint)
+
+    async def update_submerchant(
+        self, id: str, request: SubmerchantUpdateDTO
+    ) -> SubmerchantResponse:
+        """Update Submerchant"""
+        endpoint = f"/submerchants/{id}"
+        payload = request.to_dict()
+        response = await self._make_request("PATCH", endpoint, json_payload=payload)
+        return decode(response, SubmerchantResponse)
+
+    async def delete_submerchant(self, id: str) -> dict:
+        """Delete Submerchant"""
+        endpoint = f"/submerchants/{id}"
+        return await self._make_request("DELETE", endpoint)
+
+    async def list_submerchants(self, page: int = 1, per_page: int = 10) -> SubmerchantPage:
+        """List Submerchants"""
+        endpoint = "/submerchants"
+        params = {"page": page, "per_page": per_page}
+        response = await self._make_request("GET", endpoint, params=params)
+        return decode(response, SubmerchantPage)
+
+    async def iter_submerchants(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> AsyncIterator[SubmerchantResponse]:
+        """Iterate over submerchants, fetching pages on demand"""
+        async for record in aiter_records(
+            lambda page: self.list_submerchants(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        ):
+            yield record
+
+    # Subscription methods
+    async def get_subscription(self, request: SubscriptionGetRequest) -> SubscriptionResponse:
+        """Get subscription details by reference_id or external_reference_id"""
+        endpoint = "/subscription"
+        payload = request.to_dict()
+        response = await self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubscriptionResponse)
+
+    async def cancel_subscription(self, request: SubscriptionCancelRequest) -> dict:
+        """Cancel a subscription by reference_id or external_reference_id"""
+        endpoint = "/subscription/cancel"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    async def create_subscription(self, request: SubscriptionCreateRequest) -> SubscriptionResponse:
+        """Create a new subscription"""
+        endpoint = "/subscription/create"
+        payload = request.to_dict()
+        response = await self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubscriptionResponse)
+
+    async def list_subscriptions(self, page: int = 1, per_page: int = 10) -> SubscriptionPage:
+        """List all subscriptions with pagination"""
+        endpoint = "/subscription/list"
+        params = {"page": page, "per_page": per_page}
+        response = await self._make_request("GET", endpoint, params=params)
+        return decode(response, SubscriptionPage)
+
+    async def iter_subscriptions(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> AsyncIterator[SubscriptionResponse]:
+        """Iterate over subscriptions, fetching pages on demand"""
+        async for record in aiter_records(
+            lambda page: self.list_subscriptions(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        ):
+            yield record
+
+    async def redirect_subscription(self, request: SubscriptionRedirectRequest) -> dict:
+        """Get redirect URL for a subscription"""
+        endpoint = "/subscription/redirect"
+        payload = request.to_dict()
+        return await self._make_request("POST", endpoint, json_payload=payload)
+
+    verify_webhook = staticmethod(TapsilatAPI.verify_webhook)
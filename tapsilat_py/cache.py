@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """In-process cache for near-static responses.
+
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        ttl: seconds a loaded value is served as fresh.
+        stale_ttl: seconds past ttl during which the old value is still served
+            while one background refresh fetches a new one. 0 disables
+            stale-while-revalidate.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._flights: Dict[Hashable, Future] = {}
+        self._async_flights: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "load_errors": self.load_errors,
+                "size": len(self._entries),
+            }
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one cached key, or every key when none is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = self._clock()
+        fresh_until = now + self.ttl
+        self._entries[key] = _Entry(value, fresh_until, fresh_until + self.stale_ttl)
+
+    def _lookup(self, key: Hashable):
+        """Return (entry, needs_refresh) and count the outcome; caller holds the lock"""
+        entry = self._entries.get(key)
+        now = self._clock()
+        if entry is not None and now < entry.fresh_until:
+            self.hits += 1
+            return entry, False
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            return entry, True
+        self.misses += 1
+        return None, True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader at most once per miss.
+
+        Concurrent misses for the same key wait for the one load in flight and
+        share its result or exception.
+        """
+        with self._lock:
+            entry, needs_refresh = self._lookup(key)
+            if entry is not None and not needs_refresh:
+                return entry.value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+
+        if entry is not None:
+            # Stale hit: serve the old value, refresh in the background once.
+            if leader:
+                threading.Thread(
+                    target=self._load, args=(key, loader, flight), daemon=True
+                ).start()
+            return entry.value
+
+        if leader:
+            self._load(key, loader, flight)
+        return flight.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], flight: Future) -> None:
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self.loads += 1
+                self.load_errors += 1
+                del self._flights[key]
+            flight.set_exception(e)
+            return
+        with self._lock:
+            self.loads += 1
+            self._store(key, value)
+            del self._flights[key]
+        flight.set_result(value)
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Coroutine version of get_or_load for use on an event loop"""
+        with self._lock:
+            entry, needs_refresh = self._lookup(key)
+            if entry is not None and not needs_refresh:
+                return entry.value
+            flight = self._async_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = asyncio.get_running_loop().create_future()
+                self._async_flights[key] = flight
+
+        if leader:
+            # The load runs as its own task so cancelling the caller that started
+            # it does not leave the other waiters hanging.
+            task = asyncio.ensure_future(self._load_async(key, loader, flight))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if entry is not None:
+            return entry.value
+        # Shield so a cancelled waiter does not cancel the shared load.
+        return await asyncio.shield(flight)
+
+    async def _load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], flight: asyncio.Future
+    ) -> None:
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            with self._lock:
+                del self._async_flights[key]
+            flight.cancel()
+            raise
+        except Exception as e:
+            with self._lock:
+                self.loads += 1
+                self.load_errors += 1
+                del self._async_flights[key]
+            flight.set_exception(e)
+            # Retrieve it here so a stale refresh nobody awaits does not log
+            # "exception was never retrieved"; waiters still receive it.
+            flight.exception()
+            return
+        with self._lock:
+            self.loads += 1
+            self._store(key, value)
+            del self._async_flights[key]
+        flight.set_result(value)
@@ -0,0 +1,200 @@
+"""Circuit breaker per endpoint group.
+
+While the upstream is degraded, calls in the affected group fail fast with
+CircuitOpenError instead of each one waiting out the timeout. A circuit is
+
+    closed      calls go through; outcomes are recorded in a rolling window
+    open        calls fail fast; entered when the window's failure rate
+                reaches the threshold
+    half_open   after reset_timeout a few probe calls go through; if they all
+                succeed the circuit closes, if one fails it opens again
+
+Failures are connection errors, timeouts, 5xx responses and, when
+slow_call_seconds is set, responses slower than that. 4xx responses are the
+caller's problem, not the upstream's, and count as successes.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ._http import endpoint_group
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# listener(group, old_state, new_state)
+Listener = Callable[[str, str, str], None]
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "opened_at", "probes", "successes", "generation")
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.successes = 0
+        # Bumped on every transition so outcomes of calls admitted in an
+        # earlier state are ignored.
+        self.generation = 0
+
+
+class Permit:
+    """Admission of one call; hand it back to record() or release()"""
+
+    __slots__ = ("group", "generation", "probe", "done")
+
+    def __init__(self, group: str, generation: int, probe: bool):
+        self.group = group
+        self.generation = generation
+        self.probe = probe
+        self.done = False
+
+
+class CircuitBreaker:
+    """Circuit breaker per endpoint group, shareable between clients and threads.
+
+        breaker = CircuitBreaker(failure_rate=0.5, slow_call_seconds=3, listeners=[log])
+        client = TapsilatAPI(api_key, circuit_breaker=breaker)
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        minimum_calls: int = 10,
+        window: int = 20,
+        slow_call_seconds: Optional[float] = None,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        listeners: Iterable[Listener] = (),
+        group: Callable[[str, str], str] = endpoint_group,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        failure_rate: share of failed calls in the window that opens the circuit.
+        minimum_calls: calls the window must hold before the rate is considered.
+        window: number of most recent calls the failure rate is computed over.
+        slow_call_seconds: calls taking at least this long count as failures.
+        reset_timeout: seconds the circuit stays open before probing.
+        half_open_probes: concurrent probes allowed, and successes needed to close.
+        listeners: called as listener(group, old_state, new_state) on every
+            transition, outside the breaker's lock.
+        group: maps (method, endpoint) to a group name.
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if minimum_calls < 1 or window < minimum_calls or half_open_probes < 1:
+            raise ValueError("need 1 <= minimum_calls <= window and half_open_probes >= 1")
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.listeners: List[Listener] = list(listeners)
+        self.group = group
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, group: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(group)
+            return circuit.state if circuit is not None else CLOSED
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """State, calls in the window and their failure rate for each group seen so far"""
+        with self._lock:
+            return {
+                group: {
+                    "state": c.state,
+                    "calls": len(c.outcomes),
+                    "failure_rate": sum(c.outcomes) / len(c.outcomes) if c.outcomes else 0.0,
+                }
+                for group, c in sorted(self._circuits.items())
+            }
+
+    def acquire(self, method: str, endpoint: str) -> Permit:
+        """Admit a call or raise CircuitOpenError"""
+        group = self.group(method, endpoint)
+        transitions: List[Tuple[str, str, str]] = []
+        try:
+            with self._lock:
+                circuit = self._circuits.get(group)
+                if circuit is None:
+                    circuit = self._circuits[group] = _Circuit(self.window)
+                if circuit.state == OPEN:
+                    remaining = circuit.opened_at + self.reset_timeout - self._clock()
+                    if remaining > 0:
+                        raise CircuitOpenError(group, remaining)
+                    self._transition(group, circuit, HALF_OPEN, transitions)
+                if circuit.state == HALF_OPEN:
+                    if circuit.probes >= self.half_open_probes:
+                        # Probes are in flight; their outcome decides.
+                        raise CircuitOpenError(group, 0.0)
+                    circuit.probes += 1
+                    return Permit(group, circuit.generation, True)
+                return Permit(group, circuit.generation, False)
+        finally:
+            self._notify(transitions)
+
+    def record(self, permit: Permit, failed: bool, elapsed: float = 0.0) -> None:
+        """Record the outcome of an admitted call"""
+        if permit.done:
+            return
+        permit.done = True
+        if self.slow_call_seconds is not None and elapsed >= self.slow_call_seconds:
+            failed = True
+        transitions: List[Tuple[str, str, str]] = []
+        with self._lock:
+            circuit = self._circuits[permit.group]
+            if permit.generation != circuit.generation:
+                pass
+            elif permit.probe:
+                circuit.probes -= 1
+                if failed:
+                    self._transition(permit.group, circuit, OPEN, transitions)
+                else:
+                    circuit.successes += 1
+                    if circuit.successes >= self.half_open_probes:
+                        self._transition(permit.group, circuit, CLOSED, transitions)
+            else:
+                circuit.outcomes.append(failed)
+                if (
+                    len(circuit.outcomes) >= self.minimum_calls
+                    and sum(circuit.outcomes) >= self.failure_rate * len(circuit.outcomes)
+                ):
+                    self._transition(permit.group, circuit, OPEN, transitions)
+        self._notify(transitions)
+
+    def release(self, permit: Permit) -> None:
+        """Give back a permit whose call ended without an outcome, e.g. when cancelled"""
+        if permit.done:
+            return
+        permit.done = True
+        with self._lock:
+            circuit = self._circuits[permit.group]
+            if permit.probe and permit.generation == circuit.generation:
+                circuit.probes -= 1
+
+    def _transition(
+        self, group: str, circuit: _Circuit, state: str, transitions: List[Tuple[str, str, str]]
+    ) -> None:
+        transitions.append((group, circuit.state, state))
+        circuit.state = state
+        circuit.generation += 1
+        circuit.probes = 0
+        circuit.successes = 0
+        if state == OPEN:
+            circuit.opened_at = self._clock()
+        elif state == CLOSED:
+            circuit.outcomes.clear()
+
+    def _notify(self, transitions: List[Tuple[str, str, str]]) -> None:
+        for group, old, new in transitions:
+            for listener in self.listeners:
+                listener(group, old, new)
@@ -1,16 +1,37 @@
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
-import hmac
-import hashlib
-import requests
+import os
+import threading
+import time
 
-from .exceptions import APIException
+import requests
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+from ._http import api_exception_from_response, filename_from_content_disposition
+from .cache import TTLCache
+from .circuit import CircuitBreaker
+from .coalescing import RequestCoalescer, request_key
+from .downloads import (
+    EXPORT_FORMATS,
+    Destination,
+    ExportNames,
+    StreamingDownload,
+    body_size,
+    export_jobs,
+    manifest_entry,
+)
+from .exceptions import APIException, DeadlineExceeded
+from .idempotency import DONE, IdempotencyKeys
+from .instrumentation import Hooks, RequestEvent
+from .json_codec import get_codec
 from .models import (
     OrderAccountingRequest,
     OrderCreateDTO,
     OrderPaymentTermCreateDTO,
     OrderPostAuthRequest,
-    OrderResponse,
     OrderTermRefundRequest,
     RefundOrderDTO,
     CancelOrderDTO,
@@ -43,21 +64,226 @@ from .models import (
     OrgUserTokenCreateReq,
     SubmerchantCreateDTO,
     SubmerchantUpdateDTO,
+    BulkOrderResult,
+    DownloadResult,
+    ExportManifestEntry,
     FileResponse,
 )
+from .pagination import iter_records
+from .ratelimit import RateLimiter
+from .responses import (
+    OrderPage,
+    OrderResponse,
+    PaymentDetailsResponse,
+    SubmerchantPage,
+    SubmerchantResponse,
+    SubscriptionPage,
+    SubscriptionResponse,
+    TransactionResponse,
+    decode,
+    decode_list,
+)
+from .retry import RetryPolicy
+from .streaming import iter_rows
+from .timeouts import TimeoutValue, Timeouts, bound, current_deadline, stop_retrying
 from .validators import validate_gsm_number, validate_installments
+from .webhooks import Payload, _verifier_for
+
+
+def _order_create_payload(order: OrderCreateDTO) -> dict:
+    """Validate an OrderCreateDTO in place and return its request payload"""
+    # Validate GSM number if provided
+    if order.buyer and order.buyer.gsm_number:
+        order.buyer.gsm_number = validate_gsm_number(order.buyer.gsm_number)
+
+    # Validate installments if provided as string (convert from legacy format)
+    if hasattr(order, "enabled_installments") and order.enabled_installments:
+        order.enabled_installments = str(order.enabled_installments)  # type: ignore
+        order.enabled_installments = (
+            order.enabled_installments.replace("[", "")
+            .replace("]", "")
+            .replace(" ", "")
+        )  # type: ignore
+        order.enabled_installments = validate_installments(
+            order.enabled_installments
+        )  # type: ignore
+
+    return order.to_dict()
+
+
+def _order_list_params(
+    page: int,
+    per_page: int,
+    start_date: str,
+    end_date: str,
+    organization_id: str,
+    related_reference_id: str,
+    buyer_id: str,
+    status: Optional[int],
+) -> Dict[str, Any]:
+    """Query parameters of /order/list, leaving out unset filters"""
+    raw_params = {
+        "page": page,
+        "per_page": per_page,
+        "start_date": start_date,
+        "end_date": end_date,
+        "organization_id": organization_id,
+        "related_reference_id": related_reference_id,
+        "buyer_id": buyer_id,
+        "status": status,
+    }
+    return {k: v for k, v in raw_params.items() if v not in ("", None)}
+
+
+def _response_size(response: requests.Response, streamed: bool) -> Optional[int]:
+    if not streamed:
+        return len(response.content)
+    # Reading a streamed body here would defeat streaming; trust the header.
+    return body_size(response.headers.get("Content-Length"), None)
+
+
+class _DeadlinePool:
+    """Bounds the wait for a free connection in a blocking pool by the deadline.
+
+    Running out of time raises urllib3's EmptyPoolError, which _request turns
+    into DeadlineExceeded. It has to stay an EmptyPoolError until then: for
+    any other error urlopen puts a connection back into the pool that it never
+    took out, and the pool overflows.
+    """
+
+    def _get_conn(self, timeout=None):
+        current = current_deadline()
+        if not self.block or timeout is not None or current is None:
+            return super()._get_conn(timeout)
+        return super()._get_conn(max(current.remaining(), 0))
+
+
+class _DeadlineHTTPConnectionPool(_DeadlinePool, HTTPConnectionPool):
+    pass
+
+
+class _DeadlineHTTPSConnectionPool(_DeadlinePool, HTTPSConnectionPool):
+    pass
+
+
+class _PoolAdapter(requests.adapters.HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _DeadlineHTTPConnectionPool,
+            "https": _DeadlineHTTPSConnectionPool,
+        }
 
 
 class TapsilatAPI:
     def __init__(
         self,
         api_key: str = "",
-        timeout: int = 10,
+        timeout: TimeoutValue = 10,
         base_url: str = "https://panel.tapsilat.dev/api/v1",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive_timeout: Optional[float] = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        system_cache: Optional[TTLCache] = None,
+        hooks: Iterable[Any] = (),
+        coalescer: Optional[RequestCoalescer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoint_timeouts: Optional[Dict[str, TimeoutValue]] = None,
+        idempotency: Optional[IdempotencyKeys] = None,
+        json_codec: Any = "stdlib",
     ):
+        """
+        timeout: seconds to wait for the connection and for the response, or
+            a (connect, read) tuple to set them separately. None waits forever.
+        pool_connections: number of host pools kept by the connection pool.
+        pool_maxsize: maximum number of connections kept open per host.
+        pool_block: wait for a free connection instead of opening an extra,
+            unpooled one when pool_maxsize connections are busy.
+        keep_alive_timeout: seconds a pooled connection may sit idle before it
+            is dropped instead of reused. None keeps connections indefinitely.
+        retry_policy: when and how failed requests are retried. Defaults to
+            RetryPolicy(), which retries idempotent GETs only.
+        system_cache: opt-in cache for the get_system_* reference data.
+        hooks: objects with before_request/after_response/on_error methods
+            called around every attempt, e.g. a MetricsCollector. More can be
+            registered later with client.hooks.add().
+        coalescer: opt-in RequestCoalescer; identical GETs issued while one
+            is in flight share its response instead of sending their own.
+        rate_limiter: opt-in RateLimiter; every attempt waits for a token from
+            its endpoint group's bucket before it is sent.
+        circuit_breaker: opt-in CircuitBreaker; while the circuit for an
+            endpoint group is open its calls raise CircuitOpenError at once.
+        endpoint_timeouts: timeouts for particular endpoints, keyed by glob
+            patterns over endpoint templates, e.g. {"/order/*/export/*": 120,
+            "/system/*": (1, 2)}. The first matching pattern wins.
+        idempotency: opt-in IdempotencyKeys; writes such as create_order and
+            refund_order are sent with an idempotency key, and a write whose
+            result is journaled returns that result instead of being resent.
+        json_codec: how request and response bodies are encoded: "stdlib",
+            "orjson", "auto" (orjson when installed) or a codec object with
+            dumps() and loads(); see tapsilat_py.json_codec.
+        """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self._timeouts = Timeouts(timeout, endpoint_timeouts)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive_timeout = keep_alive_timeout
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.system_cache = system_cache
+        self.hooks = Hooks(hooks)
+        self.coalescer = coalescer
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.idempotency = idempotency
+        self.json_codec = get_codec(json_codec)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._last_used = 0.0
+
+    def __enter__(self) -> "TapsilatAPI":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections. The client reconnects on next use."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = _PoolAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            now = time.monotonic()
+            if self._session is None:
+                self._session = self._create_session()
+            elif (
+                self.keep_alive_timeout is not None
+                and now - self._last_used > self.keep_alive_timeout
+            ):
+                # Idle connections have most likely been closed by the server,
+                # drop them rather than fail on the first reuse.
+                self._session.close()
+            self._last_used = now
+            return self._session
 
     def _get_headers(self):
         headers = {"Accept": "application/json"}
@@ -72,76 +298,229 @@ class TapsilatAPI:
         params: Optional[Dict[str, Any]] = None,
         json_payload: Optional[Dict[str, Any]] = None,
         raw_response: bool = False,
+        download: Optional[StreamingDownload] = None,
+    ) -> Any:
+        if self.coalescer is not None and method == "GET" and download is None:
+            return self.coalescer.run(
+                request_key(endpoint, params, raw_response, json_payload),
+                lambda: self._request(method, endpoint, params, json_payload, raw_response),
+            )
+        idempotency = self.idempotency
+        if idempotency is not None and idempotency.applies(method, endpoint):
+            entry = idempotency.start(method, endpoint, json_payload)
+            if entry.state == DONE:
+                return entry.result
+            try:
+                result = self._request(
+                    method, endpoint, params, json_payload, raw_response,
+                    extra_headers={idempotency.header: entry.key},
+                )
+            except APIException as e:
+                idempotency.failed(entry, e)
+                raise
+            idempotency.succeeded(entry, result)
+            return result
+        return self._request(method, endpoint, params, json_payload, raw_response, download)
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        json_payload: Optional[Dict[str, Any]],
+        raw_response: bool,
+        download: Optional[StreamingDownload] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
     ) -> Any:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         headers = self._get_headers()
-
-        try:
-            response = requests.request(
-                method,
-                url,
-                params=params,
-                json=json_payload,
-                headers=headers,
-                timeout=self.timeout,
+        if extra_headers:
+            headers.update(extra_headers)
+        body = None
+        if json_payload is not None:
+            # Encoded once; every attempt sends the same bytes.
+            body = self.json_codec.dumps(json_payload)
+            headers["Content-Type"] = "application/json"
+        started = time.monotonic()
+        attempt = 0
+
+        hooks = self.hooks
+        breaker = self.circuit_breaker
+        timeouts = self._timeouts.for_endpoint(endpoint)
+        while True:
+            attempt += 1
+            permit = None
+            if breaker is not None:
+                # Before the rate limiter: an open circuit fails fast without
+                # waiting for, or spending, a token.
+                permit = breaker.acquire(method, endpoint)
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(method, endpoint)
+                connect_timeout, read_timeout = bound(timeouts)
+            except BaseException:
+                if permit is not None:
+                    breaker.release(permit)
+                raise
+            event = None
+            if hooks:
+                event = RequestEvent(method, endpoint, attempt, headers)
+                hooks.before_request(event)
+            sent = time.monotonic()
+            try:
+                response = self._get_session().request(
+                    method,
+                    url,
+                    params=params,
+                    data=body,
+                    headers=headers,
+                    timeout=(connect_timeout, read_timeout),
+                    stream=download is not None,
+                )
+                if permit is not None:
+                    breaker.record(permit, response.status_code >= 500, time.monotonic() - sent)
+                if event is not None:
+                    hooks.after_response(
+                        event.responded(
+                            response.status_code,
+                            len(response.request.body or b""),
+                            _response_size(response, download is not None),
+                        )
+                    )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                if e.response is None:
+                    raise APIException(0, -1, "Unknown API error") from e
+                delay = self.retry_policy.next_delay(
+                    method,
+                    endpoint,
+                    attempt,
+                    time.monotonic() - started,
+                    status_code=e.response.status_code,
+                    retry_after=e.response.headers.get("Retry-After"),
+                )
+                failure = stop_retrying(
+                    delay,
+                    api_exception_from_response(
+                        e.response.status_code, e.response.content, e.response.reason
+                    ),
+                )
+                if failure is not None:
+                    raise failure from e
+            except requests.exceptions.RequestException as e:
+                if permit is not None:
+                    breaker.record(permit, True)
+                if event is not None:
+                    hooks.on_error(event.failed(e, len(body or b"")))
+                delay = self.retry_policy.next_delay(
+                    method, endpoint, attempt, time.monotonic() - started, exception=e
+                )
+                failure = stop_retrying(delay, APIException(0, -1, str(e)), timed_out=True)
+                if failure is not None:
+                    raise failure from e
+            except EmptyPoolError:
+                # Only raised by _DeadlinePool; nothing was sent.
+                if permit is not None:
+                    breaker.release(permit)
+                raise DeadlineExceeded(current_deadline().seconds) from None
+            except BaseException:
+                if permit is not None:
+                    breaker.release(permit)
+                raise
+            else:
+                if download is not None:
+                    return self._stream_response(response, download)
+                return self._parse_response(response, raw_response)
+            time.sleep(delay)
+
+    def _stream_response(
+        self, response: requests.Response, download: StreamingDownload
+    ) -> DownloadResult:
+        # Not retried once bytes have been written: the destination is no
+        # longer in its original state.
+        with response:
+            download.open(
+                filename_from_content_disposition(response.headers.get("Content-Disposition")),
+                body_size(
+                    response.headers.get("Content-Length"),
+                    response.headers.get("Content-Encoding"),
+                ),
             )
-            response.raise_for_status()
-
-            if raw_response:
-                filename = "download"
-                cd = response.headers.get("Content-Disposition")
-                if cd and "filename=" in cd:
-                    filename = cd.split("filename=")[-1].strip('"')
-                return FileResponse(response.content, filename)
+            try:
+                for chunk in response.iter_content(download.chunk_size):
+                    download.write(chunk)
+                # ValueError: a list page that is not JSON or was cut short.
+                return download.finish()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                download.abort()
+                raise APIException(0, -1, str(e)) from e
+            except BaseException:
+                download.abort()
+                raise
+
+    def _parse_response(self, response: requests.Response, raw_response: bool) -> Any:
+        if raw_response:
+            filename = filename_from_content_disposition(
+                response.headers.get("Content-Disposition")
+            )
+            return FileResponse(response.content, filename)
 
-            if response.content:
-                return response.json()
+        if not response.content:
             return {}
-        except requests.exceptions.HTTPError as e:
-            resp_status_code = e.response.status_code if e.response is not None else 0
-            api_code_from_json = -1
-            error_msg = "Unknown API error"
-
-            if e.response is not None:
-                try:
-                    if e.response.content:
-                        error_data = e.response.json()
-                        api_code_from_json = error_data.get("code", -1)
-                        error_msg = error_data.get("error", e.response.text)
-                    else:
-                        error_msg = e.response.reason or "HTTP error with no content"
-                except requests.exceptions.JSONDecodeError:
-                    error_msg = e.response.text
-
-            raise APIException(resp_status_code, api_code_from_json, error_msg) from e
-        except requests.exceptions.RequestException as e:
+        try:
+            return self.json_codec.loads(response.content)
+        except ValueError as e:
+            # A 2xx body that is not JSON, e.g. a proxy's HTML page.
             raise APIException(0, -1, str(e)) from e
 
+    def _get_reference_data(self, endpoint: str) -> dict:
+        if self.system_cache is None:
+            return self._make_request("GET", endpoint)
+        return self.system_cache.get_or_load(
+            endpoint, lambda: self._make_request("GET", endpoint)
+        )
+
     def create_order(self, order: OrderCreateDTO) -> OrderResponse:
         endpoint = "/order/create"
-
-        # Validate GSM number if provided
-        if order.buyer and order.buyer.gsm_number:
-            order.buyer.gsm_number = validate_gsm_number(order.buyer.gsm_number)
-
-        # Validate installments if provided as string (convert from legacy format)
-        if hasattr(order, "enabled_installments") and order.enabled_installments:
-            order.enabled_installments = str(order.enabled_installments)  # type: ignore
-            order.enabled_installments = (
-                order.enabled_installments.replace("[", "")
-                .replace("]", "")
-                .replace(" ", "")
-            )  # type: ignore
-            order.enabled_installments = validate_installments(
-                order.enabled_installments
-            )  # type: ignore
-
-        payload = order.to_dict()
+        payload = _order_create_payload(order)
         response_data = self._make_request("POST", endpoint, json_payload=payload)
         response = OrderResponse(response_data)
 
         return response
 
+    def create_orders_bulk(
+        self, orders: Iterable[OrderCreateDTO], concurrency: int = 8
+    ) -> List[BulkOrderResult]:
+        """Create many orders, a few at a time.
+
+        Each order is validated and sent as create_order does. Failures do not
+        stop the batch; the result has one entry per order, in input order,
+        holding either its OrderResponse or its APIException.
+        concurrency: orders in flight at once; keep it within pool_maxsize so
+        every request gets a pooled connection.
+        """
+        orders = list(orders)
+
+        def create(index, order):
+            try:
+                return BulkOrderResult(index, response=self.create_order(order))
+            except APIException as e:
+                return BulkOrderResult(index, error=e)
+
+        if not orders:
+            return []
+        # Each order runs in a copy of this context so a deadline set around
+        # the call applies to every request.
+        context = copy_context()
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(orders))), thread_name_prefix="tapsilat-bulk"
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda job: context.copy().run(create, *job), enumerate(orders)
+                )
+            )
+
     def order_accounting(self, request: OrderAccountingRequest) -> dict:
         endpoint = "/order/accounting"
         payload = request.to_dict()
@@ -154,39 +533,39 @@ class TapsilatAPI:
 
     def get_system_order_statuses(self) -> dict:
         endpoint = "/system/order-statuses"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_basket_item_types(self) -> dict:
         endpoint = "/system/basket-item-types"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_error_codes(self) -> dict:
         endpoint = "/system/error-codes"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_payment_term_statuses(self) -> dict:
         endpoint = "/system/payment-term-statuses"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_product_types(self) -> dict:
         endpoint = "/system/product-types"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_shortcut_types(self) -> dict:
         endpoint = "/system/shortcut-types"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_transaction_payment_types(self) -> dict:
         endpoint = "/system/transaction-payment-types"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_transaction_purposes(self) -> dict:
         endpoint = "/system/transaction-purposes"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_system_transaction_statuses(self) -> dict:
         endpoint = "/system/transaction-statuses"
-        return self._make_request("GET", endpoint)
+        return self._get_reference_data(endpoint)
 
     def get_order(self, reference_id: str) -> OrderResponse:
         endpoint = f"/order/{reference_id}"
@@ -208,25 +587,103 @@ class TapsilatAPI:
         related_reference_id: str = "",
         buyer_id: str = "",
         status: Optional[int] = None,
-    ) -> dict:
+    ) -> OrderPage:
         endpoint = "/order/list"
-        raw_params = {
-            "page": page,
-            "per_page": per_page,
-            "start_date": start_date,
-            "end_date": end_date,
-            "organization_id": organization_id,
-            "related_reference_id": related_reference_id,
-            "buyer_id": buyer_id,
-            "status": status,
-        }
-        params = {k: v for k, v in raw_params.items() if v not in ("", None)}
-        return self._make_request("GET", endpoint, params=params)
+        params = _order_list_params(
+            page, per_page, start_date, end_date, organization_id,
+            related_reference_id, buyer_id, status,
+        )
+        response = self._make_request("GET", endpoint, params=params)
+        return decode(response, OrderPage)
+
+    def iter_orders(
+        self,
+        start_date: str = "",
+        end_date: str = "",
+        organization_id: str = "",
+        related_reference_id: str = "",
+        buyer_id: str = "",
+        status: Optional[int] = None,
+        per_page: int = 50,
+        prefetch: int = 0,
+        concurrency: int = 1,
+    ) -> Iterator[OrderResponse]:
+        """Iterate over orders matching the filters, fetching pages on demand.
+
+        prefetch: number of following pages requested in the background while
+        the current page is consumed.
+        concurrency: for bulk exports, the number of pages fetched at once
+        after the first page reports the total. Orders are still yielded in
+        page order, and the first error stops the export.
+        """
+
+        def fetch_page(page: int):
+            return self.get_order_list(
+                page=page,
+                per_page=per_page,
+                start_date=start_date,
+                end_date=end_date,
+                organization_id=organization_id,
+                related_reference_id=related_reference_id,
+                buyer_id=buyer_id,
+                status=status,
+            )
+
+        return iter_records(
+            fetch_page, per_page, prefetch=prefetch, concurrency=concurrency
+        )
+
+    def iter_order_page(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        start_date: str = "",
+        end_date: str = "",
+        organization_id: str = "",
+        related_reference_id: str = "",
+        buyer_id: str = "",
+        status: Optional[int] = None,
+        backlog: int = 32,
+    ) -> Iterator[OrderResponse]:
+        """Orders of one get_order_list page, each yielded as soon as it is read.
+
+        The page is parsed while it downloads, so memory stays at about one
+        order however large per_page is, and the first order arrives before
+        the rest of the page. The request runs on a worker thread.
+        backlog: number of parsed orders held for a slow consumer before
+        reading from the connection pauses.
+        Stopping the iteration early closes the connection.
+        """
+        endpoint = "/order/list"
+        params = _order_list_params(
+            page, per_page, start_date, end_date, organization_id,
+            related_reference_id, buyer_id, status,
+        )
+        rows = iter_rows(
+            lambda stream: self._make_request("GET", endpoint, params=params, download=stream),
+            backlog,
+        )
+        try:
+            for row in rows:
+                yield decode(row, OrderResponse)
+        finally:
+            rows.close()
 
-    def get_order_submerchants(self, page: int = 1, per_page: int = 10) -> dict:
+    def get_order_submerchants(self, page: int = 1, per_page: int = 10) -> SubmerchantPage:
         endpoint = "/order/submerchants"
         params = {"page": page, "per_page": per_page}
-        return self._make_request("GET", endpoint, params=params)
+        response = self._make_request("GET", endpoint, params=params)
+        return decode(response, SubmerchantPage)
+
+    def iter_order_submerchants(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> Iterator[SubmerchantResponse]:
+        """Iterate over order submerchants, fetching pages on demand"""
+        return iter_records(
+            lambda page: self.get_order_submerchants(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        )
 
     def get_checkout_url(self, reference_id: str) -> str:
         response = self.get_order(reference_id)
@@ -247,22 +704,25 @@ class TapsilatAPI:
         payload = request.to_dict()
         return self._make_request("POST", endpoint, json_payload=payload)
 
-    def get_order_payment_details(self, request: OrderPaymentDetailDTO) -> dict:
+    def get_order_payment_details(self, request: OrderPaymentDetailDTO) -> PaymentDetailsResponse:
         endpoint = "/order/payment-details"
         payload = request.to_dict()
-        return self._make_request("POST", endpoint, json_payload=payload)
+        response = self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, PaymentDetailsResponse)
 
-    def get_order_payment_details_by_id(self, reference_id: str) -> dict:
+    def get_order_payment_details_by_id(self, reference_id: str) -> PaymentDetailsResponse:
         endpoint = f"/order/{reference_id}/payment-details"
-        return self._make_request("GET", endpoint)
+        response = self._make_request("GET", endpoint)
+        return decode(response, PaymentDetailsResponse)
 
     def get_order_status(self, reference_id: str) -> dict:
         endpoint = f"/order/{reference_id}/status"
         return self._make_request("GET", endpoint)
 
-    def get_order_transactions(self, reference_id: str) -> dict:
+    def get_order_transactions(self, reference_id: str) -> List[TransactionResponse]:
         endpoint = f"/order/{reference_id}/transactions"
-        return self._make_request("GET", endpoint)
+        response = self._make_request("GET", endpoint)
+        return decode_list(response, TransactionResponse)
 
     def create_order_term(self, term: OrderPaymentTermCreateDTO) -> dict:
         endpoint = "/order/term"
@@ -356,6 +816,83 @@ class TapsilatAPI:
         endpoint = f"/order/{id}/export/excel"
         return self._make_request("GET", endpoint, raw_response=True)
 
+    def download_order_pdf(
+        self,
+        id: str,
+        destination: Destination = None,
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        checksum: Optional[str] = None,
+    ) -> DownloadResult:
+        """Stream the order's PDF export to destination without buffering it in memory.
+
+        destination: file path, directory (the server's filename is used), or a
+        writable binary file object; defaults to the working directory.
+        progress: called as progress(bytes_written, total_bytes) per chunk.
+        checksum: hashlib algorithm name; its hex digest is returned in the result.
+        """
+        endpoint = f"/order/{id}/export/pdf"
+        download = StreamingDownload(destination, chunk_size, progress, checksum)
+        return self._make_request("GET", endpoint, download=download)
+
+    def download_order_excel(
+        self,
+        id: str,
+        destination: Destination = None,
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        checksum: Optional[str] = None,
+    ) -> DownloadResult:
+        """Stream the order's Excel export to destination; see download_order_pdf"""
+        endpoint = f"/order/{id}/export/excel"
+        download = StreamingDownload(destination, chunk_size, progress, checksum)
+        return self._make_request("GET", endpoint, download=download)
+
+    def download_order_exports(
+        self,
+        order_ids: Iterable[str],
+        directory: str,
+        formats: Sequence[str] = EXPORT_FORMATS,
+        concurrency: int = 4,
+        checksum: Optional[str] = None,
+    ) -> List[ExportManifestEntry]:
+        """Download the exports of many orders into directory, a few at a time.
+
+        Each file is streamed to disk under the server's filename, made unique
+        within the batch as described in downloads.ExportNames. Failures do
+        not stop the batch; the returned manifest has one entry per order and
+        format, in input order, holding either the file's path or the error.
+        concurrency: downloads in flight at once; keep it within pool_maxsize
+        so every download gets a pooled connection.
+        """
+        jobs = export_jobs(order_ids, formats)
+        os.makedirs(directory, exist_ok=True)
+        names = ExportNames()
+
+        def download(job):
+            order_id, export_format = job
+            endpoint = f"/order/{order_id}/export/{export_format}"
+            stream = StreamingDownload(
+                directory,
+                checksum=checksum,
+                name=lambda filename: names.claim(order_id, export_format, filename),
+            )
+            try:
+                result = self._make_request("GET", endpoint, download=stream)
+            except (APIException, OSError) as e:
+                return manifest_entry(order_id, export_format, error=e)
+            return manifest_entry(order_id, export_format, result)
+
+        if not jobs:
+            return []
+        # Each job runs in a copy of this context so a deadline set around the
+        # call applies to every download.
+        context = copy_context()
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(jobs))), thread_name_prefix="tapsilat-export"
+        ) as executor:
+            return list(executor.map(lambda job: context.copy().run(download, job), jobs))
+
     def create_order_refund_request(self, request: RefundOrderDTO) -> dict:
         endpoint = "/order/refund-request"
         payload = request.to_dict()
@@ -434,6 +971,16 @@ class TapsilatAPI:
         params = {"page": page, "per_page": per_page}
         return self._make_request("GET", endpoint, params=params)
 
+    def iter_organization_suborganizations(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> Iterator[dict]:
+        """Iterate over sub-organizations, fetching pages on demand"""
+        return iter_records(
+            lambda page: self.get_organization_suborganizations(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        )
+
     def get_organization_suborganization_details(self, id: str) -> dict:
         """Get Sub-Organization Details"""
         endpoint = f"/organization/suborganizations/{id}"
@@ -474,45 +1021,60 @@ class TapsilatAPI:
         return self._make_request("POST", endpoint, json_payload=payload)
 
     # Submerchant methods
-    def create_submerchant(self, request: SubmerchantCreateDTO) -> dict:
+    def create_submerchant(self, request: SubmerchantCreateDTO) -> SubmerchantResponse:
         """Create Submerchant"""
         endpoint = "/submerchants"
         payload = request.to_dict()
-        return self._make_request("POST", endpoint, json_payload=payload)
+        response = self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubmerchantResponse)
 
-    def get_submerchant(self, id: str) -> dict:
+    def get_submerchant(self, id: str) -> SubmerchantResponse:
         """Get Submerchant by ID"""
         endpoint = f"/submerchants/{id}"
-        return self._make_request("GET", endpoint)
+        response = self._make_request("GET", endpoint)
+        return decode(response, SubmerchantResponse)
 
     def get_suborganization_by_submerchant(self, id: str) -> dict:
         """Get Suborganization by Submerchant ID"""
         endpoint = f"/submerchants/{id}/suborganization"
         return self._make_request("GET", endpoint)
 
-    def update_submerchant(self, id: str, request: SubmerchantUpdateDTO) -> dict:
+    def update_submerchant(self, id: str, request: SubmerchantUpdateDTO) -> SubmerchantResponse:
         """Update Submerchant"""
         endpoint = f"/submerchants/{id}"
         payload = request.to_dict()
-        return self._make_request("PATCH", endpoint, json_payload=payload)
+        response = self._make_request("PATCH", endpoint, json_payload=payload)
+        return decode(response, SubmerchantResponse)
 
     def delete_submerchant(self, id: str) -> dict:
         """Delete Submerchant"""
         endpoint = f"/submerchants/{id}"
         return self._make_request("DELETE", endpoint)
 
-    def list_submerchants(self, page: int = 1, per_page: int = 10) -> dict:
+    def list_submerchants(self, page: int = 1, per_page: int = 10) -> SubmerchantPage:
         """List Submerchants"""
         endpoint = "/submerchants"
         params = {"page": page, "per_page": per_page}
-        return self._make_request("GET", endpoint, params=params)
+        response = self._make_request("GET", endpoint, params=params)
+        return decode(response, SubmerchantPage)
+
+    def iter_submerchants(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> Iterator[SubmerchantResponse]:
+        """Iterate over submerchants, fetching pages on demand"""
+        return iter_records(
+            lambda page: self.list_submerchants(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        )
 
     # Subscription methods
-    def get_subscription(self, request: SubscriptionGetRequest) -> dict:
+    def get_subscription(self, request: SubscriptionGetRequest) -> SubscriptionResponse:
         """Get subscription details by reference_id or external_reference_id"""
         endpoint = "/subscription"
         payload = request.to_dict()
-        return self._make_request("POST", endpoint, json_payload=payload)
+        response = self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubscriptionResponse)
 
     def cancel_subscription(self, request: SubscriptionCancelRequest) -> dict:
         """Cancel a subscription by reference_id or external_reference_id"""
@@ -520,17 +1082,29 @@ class TapsilatAPI:
         payload = request.to_dict()
         return self._make_request("POST", endpoint, json_payload=payload)
 
-    def create_subscription(self, request: SubscriptionCreateRequest) -> dict:
+    def create_subscription(self, request: SubscriptionCreateRequest) -> SubscriptionResponse:
         """Create a new subscription"""
         endpoint = "/subscription/create"
         payload = request.to_dict()
-        return self._make_request("POST", endpoint, json_payload=payload)
+        response = self._make_request("POST", endpoint, json_payload=payload)
+        return decode(response, SubscriptionResponse)
 
-    def list_subscriptions(self, page: int = 1, per_page: int = 10) -> dict:
+    def list_subscriptions(self, page: int = 1, per_page: int = 10) -> SubscriptionPage:
         """List all subscriptions with pagination"""
         endpoint = "/subscription/list"
         params = {"page": page, "per_page": per_page}
-        return self._make_request("GET", endpoint, params=params)
+        response = self._make_request("GET", endpoint, params=params)
+        return decode(response, SubscriptionPage)
+
+    def iter_subscriptions(
+        self, per_page: int = 50, prefetch: int = 0
+    ) -> Iterator[SubscriptionResponse]:
+        """Iterate over subscriptions, fetching pages on demand"""
+        return iter_records(
+            lambda page: self.list_subscriptions(page=page, per_page=per_page),
+            per_page,
+            prefetch=prefetch,
+        )
 
     def redirect_subscription(self, request: SubscriptionRedirectRequest) -> dict:
         """Get redirect URL for a subscription"""
@@ -539,9 +1113,6 @@ class TapsilatAPI:
         return self._make_request("POST", endpoint, json_payload=payload)
 
     @staticmethod
-    def verify_webhook(payload: str, signature: str, secret: str) -> bool:
+    def verify_webhook(payload: Payload, signature: str, secret: str) -> bool:
         """Verify webhook signature"""
-        expected_signature = hmac.new(
-            secret.encode(), payload.encode(), hashlib.sha256
-        ).hexdigest()
-        return f"sha256={expected_signature}" == signature
+        return _verifier_for(secret).verify(payload, signature)
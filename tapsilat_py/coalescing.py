@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from .exceptions import DeadlineExceeded
+from .timeouts import current_deadline
+
+
+def request_key(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    raw_response: bool,
+    json_payload: Optional[Dict[str, Any]] = None,
+) -> Hashable:
+    frozen = tuple(sorted((k, repr(v)) for k, v in params.items())) if params else ()
+    # Some GETs carry their arguments in a body; requests differing only
+    # there must not share a result.
+    body = (
+        json.dumps(json_payload, sort_keys=True, default=repr)
+        if json_payload is not None
+        else None
+    )
+    return endpoint, frozen, raw_response, body
+
+
+class RequestCoalescer:
+    """Single-flight for identical concurrent GETs.
+
+    While a request is in flight, identical requests wait for it instead of
+    sending their own, and all of them receive its result or its exception.
+    A waiter with a deadline stops waiting when it passes; the shared request
+    goes on under the deadline of the caller that started it. Nothing is kept
+    once it completes. Callers share the result object, so it
+    must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self._async_flights: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.deduplicated = 0
+
+    def stats(self) -> Dict[str, int]:
+        """requests: HTTP calls made; deduplicated: calls that shared one instead"""
+        with self._lock:
+            return {"requests": self.requests, "deduplicated": self.deduplicated}
+
+    def run(self, key: Hashable, send: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.requests += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            deadline = current_deadline()
+            if deadline is None:
+                return flight.result()
+            try:
+                return flight.result(timeout=max(deadline.remaining(), 0))
+            except FutureTimeoutError:
+                if flight.done():
+                    raise  # the shared request itself timed out
+                raise DeadlineExceeded(deadline.seconds) from None
+        try:
+            result = send()
+        except BaseException as e:
+            with self._lock:
+                del self._flights[key]
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            del self._flights[key]
+        flight.set_result(result)
+        return result
+
+    async def run_async(self, key: Hashable, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Coroutine version of run for use on an event loop"""
+        with self._lock:
+            flight = self._async_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = asyncio.get_running_loop().create_future()
+                self._async_flights[key] = flight
+                self.requests += 1
+            else:
+                self.deduplicated += 1
+
+        if leader:
+            # The request runs as its own task so cancelling the caller that
+            # started it does not fail the others waiting on it.
+            task = asyncio.ensure_future(send())
+            self._tasks.add(task)
+            task.add_done_callback(lambda t: self._settle(key, flight, t))
+        # Shield so a cancelled waiter does not cancel the shared request.
+        deadline = current_deadline()
+        if deadline is None:
+            return await asyncio.shield(flight)
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight), max(deadline.remaining(), 0))
+        except asyncio.TimeoutError:
+            if flight.done():
+                raise  # the shared request itself timed out
+            raise DeadlineExceeded(deadline.seconds) from None
+
+    def _settle(self, key: Hashable, flight: asyncio.Future, task: "asyncio.Task[Any]") -> None:
+        self._tasks.discard(task)
+        with self._lock:
+            del self._async_flights[key]
+        if task.cancelled():
+            flight.cancel()
+        elif task.exception() is not None:
+            flight.set_exception(task.exception())
+            # Retrieve it here so a request nobody is left waiting on does not
+            # log "exception was never retrieved"; waiters still receive it.
+            flight.exception()
+        else:
+            flight.set_result(task.result())
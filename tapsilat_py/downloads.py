@@ -0,0 +1,178 @@
+"""Writing response bodies to disk chunk by chunk, shared by both clients."""
+import hashlib
+import os
+import threading
+from typing import IO, Callable, Iterable, List, Optional, Set, Tuple, Union
+
+from .exceptions import APIException
+from .models import DownloadResult, ExportManifestEntry
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = ("pdf", "excel")
+_EXPORT_EXTENSIONS = {"pdf": ".pdf", "excel": ".xlsx"}
+
+Destination = Union[str, "os.PathLike[str]", IO[bytes], None]
+
+
+def resolve_path(destination: Union[str, "os.PathLike[str]", None], filename: str) -> str:
+    """Path to write to: destination itself, or filename inside it when it is a directory"""
+    # The name comes from the server; never let it point outside the target directory.
+    filename = os.path.basename(filename) or "download"
+    if destination is None:
+        return os.path.join(os.getcwd(), filename)
+    destination = os.fspath(destination)
+    if os.path.isdir(destination):
+        return os.path.join(destination, filename)
+    return destination
+
+
+def body_size(content_length: Optional[str], content_encoding: Optional[str]) -> Optional[int]:
+    """Size of the decoded body when the headers tell it, for progress reporting"""
+    if not content_length or content_encoding not in (None, "", "identity"):
+        return None
+    try:
+        return int(content_length)
+    except ValueError:
+        return None
+
+
+class StreamingDownload:
+    """One response body on its way to a path or a binary file object.
+
+    Bodies written to a path go to "<path>.part" first and are renamed once
+    complete, so an interrupted download never leaves a truncated file behind.
+    """
+
+    def __init__(
+        self,
+        destination: Destination = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        checksum: Optional[str] = None,
+        name: Optional[Callable[[str], str]] = None,
+    ):
+        """
+        destination: file path, directory, or writable binary file object. A
+            directory, or None for the working directory, gets the filename
+            from the Content-Disposition header.
+        chunk_size: bytes read from the connection at a time.
+        progress: called as progress(bytes_written, total_bytes) after every
+            chunk; total_bytes is None when the server does not send it.
+        checksum: hashlib algorithm name, e.g. "sha256", to digest the body with.
+        name: maps the server's filename to the one to write to a directory under.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.destination = destination
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.checksum = checksum
+        self.name = name
+        self._hash = hashlib.new(checksum) if checksum else None
+        self._file: Optional[IO[bytes]] = None
+        self._owns_file = False
+        self._path: Optional[str] = None
+        self.filename = "download"
+        self.total: Optional[int] = None
+        self.written = 0
+        self.started = False
+
+    def open(self, filename: str, total: Optional[int] = None) -> None:
+        self.started = True
+        if self.name is not None:
+            filename = self.name(filename)
+        self.filename = filename
+        self.total = total
+        if hasattr(self.destination, "write"):
+            self._file = self.destination
+            return
+        self._path = resolve_path(self.destination, filename)
+        self._file = open(self._path + ".part", "wb")
+        self._owns_file = True
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._file.write(chunk)
+        if self._hash is not None:
+            self._hash.update(chunk)
+        self.written += len(chunk)
+        if self.progress is not None:
+            self.progress(self.written, self.total)
+
+    def finish(self) -> DownloadResult:
+        if self._owns_file:
+            self._file.close()
+            os.replace(self._path + ".part", self._path)
+        return DownloadResult(
+            filename=self.filename,
+            size=self.written,
+            path=self._path,
+            checksum=self._hash.hexdigest() if self._hash is not None else None,
+        )
+
+    def abort(self) -> None:
+        if self._owns_file:
+            self._file.close()
+            try:
+                os.remove(self._path + ".part")
+            except OSError:
+                pass
+
+
+class ExportNames:
+    """File names for one batch of exports written to the same directory.
+
+    The server's filename is kept when it names the order and otherwise gets
+    the order id in front; without one, the file is "<order id>.pdf" or
+    "<order id>.xlsx". A name already taken in the batch gets a numbered
+    suffix, so no two downloads share a file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._taken: Set[str] = set()
+
+    def claim(self, order_id: str, export_format: str, filename: str) -> str:
+        order_name = os.path.basename(order_id.replace(os.sep, "_")) or "order"
+        filename = os.path.basename(filename)
+        # "download" is what filename_from_content_disposition falls back to.
+        if not filename or filename == "download":
+            filename = order_name + _EXPORT_EXTENSIONS[export_format]
+        elif order_id not in filename:
+            filename = f"{order_name}-{filename}"
+        stem, extension = os.path.splitext(filename)
+        with self._lock:
+            number = 1
+            while filename in self._taken:
+                number += 1
+                filename = f"{stem} ({number}){extension}"
+            self._taken.add(filename)
+        return filename
+
+
+def export_jobs(order_ids: Iterable[str], formats: Iterable[str]) -> List[Tuple[str, str]]:
+    """(order_id, format) pairs to download, in manifest order"""
+    formats = tuple(formats)
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {unknown}; expected {EXPORT_FORMATS}")
+    return [(order_id, export_format) for order_id in order_ids for export_format in formats]
+
+
+def manifest_entry(
+    order_id: str,
+    export_format: str,
+    result: Optional[DownloadResult] = None,
+    error: Optional[Exception] = None,
+) -> ExportManifestEntry:
+    if error is None:
+        return ExportManifestEntry(
+            order_id, export_format, path=result.path, size=result.size, checksum=result.checksum
+        )
+    if isinstance(error, APIException):
+        return ExportManifestEntry(
+            order_id, export_format, error=error.error, status_code=error.status_code
+        )
+    return ExportManifestEntry(order_id, export_format, error=str(error) or type(error).__name__)
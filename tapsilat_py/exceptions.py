@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class APIException(Exception):
     def __init__(self, status_code: int, code: int, error: str):
         super().__init__(
@@ -6,3 +9,26 @@ class APIException(Exception):
         self.status_code = status_code
         self.code = code
         self.error = error
+
+
+class CircuitOpenError(APIException):
+    """Raised without sending the request while the circuit for its endpoint group is open"""
+
+    def __init__(self, group: str, retry_after: float):
+        super().__init__(
+            0, -1, f"Circuit open for {group} endpoints; retry in {retry_after:.1f} seconds"
+        )
+        self.group = group
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(APIException):
+    """Raised when a call cannot be completed before the deadline in force.
+
+    last_error is the failure of the last attempt, if one was made.
+    """
+
+    def __init__(self, seconds: float, last_error: Optional[APIException] = None):
+        super().__init__(0, -1, f"Deadline of {seconds:g} seconds exceeded")
+        self.seconds = seconds
+        self.last_error = last_error
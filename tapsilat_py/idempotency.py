@@ -0,0 +1,259 @@
+"""Idempotency keys for write endpoints, remembered in a local journal.
+
+Each logical write gets a key, sent in the Idempotency-Key header, so the API
+can recognise a repeated request. The journal records the key before the
+request is sent and the result once it succeeds, so that after a timeout,
+an error or a crash, repeating the same write:
+
+- reuses the key of an attempt whose outcome is unknown, and
+- returns the recorded result of one that succeeded, without sending it again.
+
+A logical write is identified by the key given with idempotency_key(), or
+else by its method, endpoint and payload. A write with a key repeats an
+earlier one with that key made within ttl seconds:
+
+    with idempotency_key(f"refund-{ticket_id}"):
+        client.refund_order(refund)
+
+Without a key, two identical writes may well be intended, e.g. two equal
+partial refunds, so a payload match only counts while the outcome of the
+earlier write is unknown and for no longer than retry_window: the retry or
+crash recovery reuses its key, but a write that already succeeded is sent
+again. match_payload=True treats every identical write within ttl as a
+repeat, as with keys.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Collection, Dict, Iterator, Optional, Union
+
+from .exceptions import APIException
+
+PENDING = "pending"
+DONE = "done"
+
+HEADER = "Idempotency-Key"
+
+# create_order, refund_order, refund_all_order and order_postauth
+WRITE_ENDPOINTS = frozenset(
+    ("/order/create", "/order/refund", "/order/refund-all", "/order/postauth")
+)
+
+# Error statuses after which the write is known not to have been applied, so
+# the key is dropped; on any other failure it is kept for the next attempt.
+_REJECTED = frozenset(range(400, 500)) - {408, 409, 425, 429}
+
+
+def was_rejected(error: APIException) -> bool:
+    """Whether the API refused the write outright, rather than its outcome being unknown"""
+    return error.status_code in _REJECTED
+
+
+_explicit_key: "ContextVar[Optional[str]]" = ContextVar("tapsilat_idempotency_key", default=None)
+
+
+@contextmanager
+def idempotency_key(key: str) -> Iterator[None]:
+    """Use key for the write made in the block instead of deriving one from its payload"""
+    token = _explicit_key.set(key)
+    try:
+        yield
+    finally:
+        _explicit_key.reset(token)
+
+
+class JournalEntry:
+    __slots__ = ("fingerprint", "key", "state", "result", "created")
+
+    def __init__(
+        self,
+        fingerprint: str,
+        key: str,
+        state: str = PENDING,
+        result: Any = None,
+        created: Optional[float] = None,
+    ):
+        self.fingerprint = fingerprint
+        self.key = key
+        self.state = state
+        self.result = result
+        self.created = time.time() if created is None else created
+
+    def __repr__(self) -> str:
+        return f"JournalEntry({self.fingerprint!r}, {self.key!r}, {self.state!r})"
+
+
+class MemoryJournal:
+    """Journal for one process, keeping the maxsize most recently used writes"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, JournalEntry]" = OrderedDict()
+
+    def claim(self, entry: JournalEntry) -> JournalEntry:
+        """Store entry unless its fingerprint is already journaled; return the stored one"""
+        with self._lock:
+            existing = self._entries.get(entry.fingerprint)
+            if existing is not None:
+                self._entries.move_to_end(entry.fingerprint)
+                return existing
+            self._entries[entry.fingerprint] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return entry
+
+    def put(self, entry: JournalEntry) -> None:
+        with self._lock:
+            self._entries[entry.fingerprint] = entry
+            self._entries.move_to_end(entry.fingerprint)
+
+    def delete(self, fingerprint: str) -> None:
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+
+    def purge(self, before: float) -> int:
+        """Drop entries created before the given time; return how many"""
+        with self._lock:
+            stale = [f for f, e in self._entries.items() if e.created < before]
+            for fingerprint in stale:
+                del self._entries[fingerprint]
+            return len(stale)
+
+
+class SQLiteJournal:
+    """Journal in a SQLite file; it survives restarts and can be shared by processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "fingerprint TEXT PRIMARY KEY, key TEXT NOT NULL, state TEXT NOT NULL, "
+            "result TEXT, created REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def _row(fingerprint: str, row: tuple) -> JournalEntry:
+        key, state, result, created = row
+        return JournalEntry(
+            fingerprint, key, state, json.loads(result) if result is not None else None, created
+        )
+
+    def claim(self, entry: JournalEntry) -> JournalEntry:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO idempotency VALUES (?, ?, ?, NULL, ?)",
+                (entry.fingerprint, entry.key, entry.state, entry.created),
+            )
+            row = self._db.execute(
+                "SELECT key, state, result, created FROM idempotency WHERE fingerprint = ?",
+                (entry.fingerprint,),
+            ).fetchone()
+        return self._row(entry.fingerprint, row)
+
+    def put(self, entry: JournalEntry) -> None:
+        result = json.dumps(entry.result) if entry.result is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?, ?, ?)",
+                (entry.fingerprint, entry.key, entry.state, result, entry.created),
+            )
+
+    def delete(self, fingerprint: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM idempotency WHERE fingerprint = ?", (fingerprint,))
+
+    def purge(self, before: float) -> int:
+        with self._lock:
+            return self._db.execute("DELETE FROM idempotency WHERE created < ?", (before,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+Journal = Union[MemoryJournal, SQLiteJournal]
+
+
+def fingerprint(method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> str:
+    """Stable identity of a write: its method, endpoint and payload, or the explicit key"""
+    explicit = _explicit_key.get()
+    if explicit is not None:
+        return "key:" + explicit
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{method} /{endpoint.lstrip('/')}\n{body}".encode()).hexdigest()
+    return "sha256:" + digest
+
+
+class IdempotencyKeys:
+    """Generates idempotency keys for write endpoints and journals their outcome.
+
+        keys = IdempotencyKeys(SQLiteJournal("/var/lib/shop/tapsilat.db"))
+        client = TapsilatAPI(api_key, idempotency=keys)
+    """
+
+    def __init__(
+        self,
+        journal: Optional[Journal] = None,
+        endpoints: Collection[str] = WRITE_ENDPOINTS,
+        ttl: float = 24 * 3600,
+        header: str = HEADER,
+        retry_window: float = 15 * 60,
+        match_payload: bool = False,
+    ):
+        """
+        journal: where keys and results are kept; defaults to a MemoryJournal.
+        endpoints: the POST endpoints that get keys.
+        ttl: seconds after which a journaled write is forgotten and one with
+            the same key is treated as new.
+        header: request header carrying the key.
+        retry_window: seconds during which a write without a key reuses the
+            key of an identical one whose outcome is unknown.
+        match_payload: treat identical writes without a key as repeats for
+            ttl seconds, returning the recorded result of one that succeeded.
+        """
+        self.journal = journal if journal is not None else MemoryJournal()
+        self.endpoints = frozenset("/" + e.lstrip("/") for e in endpoints)
+        self.ttl = ttl
+        self.header = header
+        self.retry_window = retry_window
+        self.match_payload = match_payload
+
+    def applies(self, method: str, endpoint: str) -> bool:
+        return method == "POST" and "/" + endpoint.lstrip("/") in self.endpoints
+
+    def start(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> JournalEntry:
+        """The journal entry for this write; a DONE entry holds the result to reuse"""
+        explicit = _explicit_key.get()
+        entry = JournalEntry(
+            fingerprint(method, endpoint, payload),
+            explicit if explicit is not None else str(uuid.uuid4()),
+        )
+        existing = self.journal.claim(entry)
+        age = time.time() - existing.created
+        if explicit is not None or self.match_payload:
+            repeat = age <= self.ttl
+        else:
+            repeat = existing.state == PENDING and age <= self.retry_window
+        if not repeat:
+            self.journal.put(entry)
+            return entry
+        return existing
+
+    def succeeded(self, entry: JournalEntry, result: Any) -> None:
+        entry.state = DONE
+        entry.result = result
+        self.journal.put(entry)
+
+    def failed(self, entry: JournalEntry, error: APIException) -> None:
+        if was_rejected(error):
+            # The API refused the write, so a repeat is a new attempt.
+            self.journal.delete(entry.fingerprint)
@@ -0,0 +1,239 @@
+"""Request hooks and a metrics collector built on them.
+
+A hook is any object with one or more of these methods, each receiving the
+RequestEvent of one attempt:
+
+    before_request(event)   before the request is sent; may add event.headers
+    after_response(event)   once a response arrives, whatever its status
+    on_error(event)         when no response arrives (connection error, timeout)
+
+Hooks run inline on the calling thread or event loop, so keep them fast.
+"""
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ._http import endpoint_template
+
+_HOOK_NAMES = ("before_request", "after_response", "on_error")
+
+
+class RequestEvent:
+    """One attempt of one API call, as seen by the hooks"""
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "attempt",
+        "headers",
+        "started",
+        "elapsed",
+        "status_code",
+        "request_size",
+        "response_size",
+        "error",
+    )
+
+    def __init__(self, method: str, endpoint: str, attempt: int, headers: Dict[str, str]):
+        self.method = method
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.headers = headers
+        self.started = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.request_size: Optional[int] = None
+        self.response_size: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def template(self) -> str:
+        """The endpoint with its ids replaced, e.g. /order/{reference_id}/status"""
+        return endpoint_template(self.endpoint)
+
+    def responded(
+        self, status_code: int, request_size: Optional[int], response_size: Optional[int]
+    ) -> "RequestEvent":
+        self.elapsed = time.perf_counter() - self.started
+        self.status_code = status_code
+        self.request_size = request_size
+        self.response_size = response_size
+        return self
+
+    def failed(self, error: BaseException, request_size: Optional[int] = None) -> "RequestEvent":
+        self.elapsed = time.perf_counter() - self.started
+        self.error = error
+        self.request_size = request_size
+        return self
+
+
+class Hooks:
+    """The hooks registered on a client. False when there are none."""
+
+    def __init__(self, hooks: Iterable[Any] = ()):
+        self._before: List[Callable[[RequestEvent], None]] = []
+        self._after: List[Callable[[RequestEvent], None]] = []
+        self._error: List[Callable[[RequestEvent], None]] = []
+        for hook in hooks:
+            self.add(hook)
+
+    def _lists(self) -> Tuple[List[Callable[[RequestEvent], None]], ...]:
+        return self._before, self._after, self._error
+
+    def add(self, hook: Any) -> None:
+        found = False
+        for name, callbacks in zip(_HOOK_NAMES, self._lists()):
+            callback = getattr(hook, name, None)
+            if callback is not None:
+                callbacks.append(callback)
+                found = True
+        if not found:
+            raise TypeError(f"{hook!r} has none of {', '.join(_HOOK_NAMES)}")
+
+    def remove(self, hook: Any) -> None:
+        for name, callbacks in zip(_HOOK_NAMES, self._lists()):
+            callback = getattr(hook, name, None)
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def __bool__(self) -> bool:
+        return bool(self._before or self._after or self._error)
+
+    def before_request(self, event: RequestEvent) -> None:
+        for callback in self._before:
+            callback(event)
+
+    def after_response(self, event: RequestEvent) -> None:
+        for callback in self._after:
+            callback(event)
+
+    def on_error(self, event: RequestEvent) -> None:
+        for callback in self._error:
+            callback(event)
+
+
+# Upper bounds of the latency buckets, in milliseconds.
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are bucket upper bounds"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets_ms, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.total_ms,
+            "max": self.max_ms,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class _EndpointStats:
+    def __init__(self, buckets_ms: Tuple[float, ...]):
+        self.latency = LatencyHistogram(buckets_ms)
+        self.requests = 0
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+        self.status_codes: Dict[int, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency_ms": self.latency.snapshot(),
+        }
+
+
+class MetricsCollector:
+    """Hook that aggregates per-endpoint metrics.
+
+    Endpoints are keyed by method and template ("GET /order/{reference_id}/status")
+    so ids do not fan out into separate series. Every attempt counts as a
+    request; attempts after the first also count as retries.
+
+        metrics = MetricsCollector()
+        client = TapsilatAPI(api_key, hooks=[metrics])
+        ...
+        metrics.snapshot()
+    """
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    def _get(self, event: RequestEvent) -> _EndpointStats:
+        key = f"{event.method} {event.template}"
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _EndpointStats(self.buckets_ms)
+        return stats
+
+    def before_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._get(event)
+            stats.requests += 1
+            if event.attempt > 1:
+                stats.retries += 1
+
+    def after_response(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._get(event)
+            stats.latency.record(event.elapsed * 1000)
+            stats.status_codes[event.status_code] = stats.status_codes.get(event.status_code, 0) + 1
+            stats.request_bytes += event.request_size or 0
+            stats.response_bytes += event.response_size or 0
+
+    def on_error(self, event: RequestEvent) -> None:
+        name = type(event.error).__name__
+        with self._lock:
+            stats = self._get(event)
+            stats.latency.record(event.elapsed * 1000)
+            stats.errors[name] = stats.errors.get(name, 0) + 1
+            stats.request_bytes += event.request_size or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current metrics as plain dicts, keyed by "METHOD /endpoint/{template}" """
+        with self._lock:
+            return {key: stats.snapshot() for key, stats in sorted(self._stats.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,68 @@
+"""JSON encoding of request bodies and decoding of responses.
+
+The client encodes with the standard library by default. orjson is
+several times faster at decoding large list pages; install it with
+`pip install tapsilat-py[fast-json]` and pass json_codec="auto" (orjson
+when installed, else the standard library) or json_codec="orjson".
+
+A codec is any object with dumps(obj) -> bytes and loads(bytes) -> object.
+One difference to know about: the stdlib codec refuses NaN and infinities,
+which are not valid JSON, while orjson writes them as null.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+
+class StdlibCodec:
+    name = "stdlib"
+
+    def __init__(self):
+        # json.dumps() builds a new encoder per call when given options.
+        self._encoder = json.JSONEncoder(allow_nan=False, separators=(",", ":"))
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError(
+                "The orjson codec needs orjson; install it with pip install tapsilat-py[fast-json]"
+            )
+
+    def dumps(self, obj: Any) -> bytes:
+        # Like the stdlib codec, write int and other non-str dict keys as strings.
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+_CODECS = {"stdlib": StdlibCodec, "orjson": OrjsonCodec}
+
+
+def get_codec(codec: Any = "stdlib") -> Any:
+    """The codec for a name ("stdlib", "orjson" or "auto"), or codec itself if it is one"""
+    if codec is None:
+        codec = "stdlib"
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        return OrjsonCodec() if orjson is not None else StdlibCodec()
+    try:
+        return _CODECS[codec]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON codec {codec!r}; expected one of {sorted(_CODECS) + ['auto']}"
+        ) from None
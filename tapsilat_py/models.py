@@ -1,27 +1,113 @@
-from dataclasses import asdict, dataclass, fields, is_dataclass
-from typing import Any, List, Optional
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Union, get_type_hints
 
+from .exceptions import APIException
+from .responses import OrderResponse  # noqa: F401  (re-exported; it used to live here)
 
-def _asdict_factory(data):
-    """Convert dataclass to dict, removing None values and handling nested dataclasses"""
-    if not is_dataclass(data):
-        return data
+# Values of these exact types are copied into to_dict() output as they are.
+_PLAIN_TYPES = frozenset((str, int, float, bool))
 
-    def convert_value(obj):
-        if isinstance(obj, list):
-            return [convert_value(v) for v in obj]
-        if is_dataclass(obj):
-            return _asdict_factory(obj)
-        return obj
-
-    result = {}
-    for field in fields(data):
-        value = getattr(data, field.name)
-        if value is not None:
-            result[field.name] = convert_value(value)
-    return result
+# Generated to_dict functions, one per dataclass, built on first use.
+_SERIALIZERS: Dict[type, Callable[[Any], dict]] = {}
 
 
+def _asdict_factory(data):
+    """Convert dataclass to dict, removing None values and handling nested dataclasses"""
+    cls = data if isinstance(data, type) else type(data)
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        if not is_dataclass(cls):
+            return data
+        serializer = _compile_serializer(cls)
+    return serializer(data)
+
+
+def _slotted(cls):
+    """Rebuild a dataclass with __slots__ so instances carry no __dict__.
+
+    Only fields the bases do not already slot are added, so a slotted
+    dataclass can subclass another one. Apply it above @dataclass.
+    """
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(getattr(base, "__slots__", ()))
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Defaults live on the class and would clash with the slot descriptors;
+        # the generated __init__ keeps its own copy.
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _convert_value(obj):
+    if isinstance(obj, list):
+        return [_convert_value(v) for v in obj]
+    if is_dataclass(obj):
+        return _asdict_factory(obj)
+    return obj
+
+
+def _unwrap_hint(hint):
+    """Return (item_type, is_list) for X, Optional[X], List[X] and Optional[List[X]]"""
+    if getattr(hint, "__origin__", None) is Union:
+        args = [a for a in hint.__args__ if a is not type(None)]
+        if len(args) != 1:
+            return None, False
+        hint = args[0]
+    if getattr(hint, "__origin__", None) in (list, List):
+        args = getattr(hint, "__args__", None) or (None,)
+        return args[0], True
+    return hint, False
+
+
+def _compile_serializer(cls) -> Callable[[Any], dict]:
+    """Generate a to_dict function for cls that reads its fields directly.
+
+    Fields declared as a dataclass or a list of one call that class's own
+    generated function; anything else, or a value of an unexpected type,
+    goes through the same conversion _asdict_factory always applied.
+    """
+    try:
+        hints = get_type_hints(cls)
+    except Exception:
+        hints = {}
+    namespace = {"_PLAIN": _PLAIN_TYPES, "_convert": _convert_value}
+    lines = ["def to_dict(obj):", "    d = {}"]
+    nested = []
+    for i, field in enumerate(fields(cls)):
+        item_type, is_list = _unwrap_hint(hints.get(field.name))
+        if isinstance(item_type, type) and is_dataclass(item_type):
+            namespace["_t%d" % i] = item_type
+            nested.append((i, item_type))
+            item = "_s{0}({1}) if type({1}) is _t{0} else _convert({1})".format(i, "{0}")
+        else:
+            item = "{0} if type({0}) in _PLAIN else _convert({0})"
+        if is_list:
+            value = "[%s for x in v] if type(v) is list else _convert(v)" % item.format("x")
+        else:
+            value = item.format("v")
+        lines += [
+            "    v = obj.%s" % field.name,
+            "    if v is not None:",
+            "        d[%r] = %s" % (field.name, value),
+        ]
+    lines.append("    return d")
+    exec(compile("\n".join(lines), "<%s.to_dict>" % cls.__qualname__, "exec"), namespace)
+    serializer = namespace["to_dict"]
+    _SERIALIZERS[cls] = serializer
+    # Bound after registering cls so a model nesting itself resolves to this function.
+    for i, item_type in nested:
+        namespace["_s%d" % i] = _SERIALIZERS.get(item_type) or _compile_serializer(item_type)
+    return serializer
+
+
+@_slotted
 @dataclass
 class BuyerDTO:
     name: str
@@ -43,7 +129,11 @@ class BuyerDTO:
     education: Optional[str] = None
     occupation: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class BasketItemPayerDTO:
     address: Optional[str] = None
@@ -58,7 +148,11 @@ class BasketItemPayerDTO:
     email: Optional[str] = None
     phone: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class OrderItemPayment:
     amount: Optional[float] = None
@@ -73,7 +167,11 @@ class OrderItemPayment:
     status: Optional[int] = None
     type: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class BasketItemDTO:
     category1: Optional[str] = None
@@ -100,7 +198,11 @@ class BasketItemDTO:
     sub_merchant_key: Optional[str] = None
     sub_merchant_price: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
 
+
+@_slotted
 @dataclass
 class BillingAddressDTO:
     address: Optional[str] = None
@@ -120,7 +222,11 @@ class BillingAddressDTO:
     street2: Optional[str] = None
     street3: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
 
+
+@_slotted
 @dataclass
 class CheckoutDesignDTO:
     input_background_color: Optional[str] = None
@@ -134,19 +240,31 @@ class CheckoutDesignDTO:
     pay_button_color: Optional[str] = None
     redirect_url: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class MetadataDTO:
     key: str
     value: str
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class OrderCardDTO:
     card_id: str
     card_sequence: int
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class PaymentTermDTO:
     amount: Optional[float] = None
@@ -158,7 +276,11 @@ class PaymentTermDTO:
     term_reference_id: Optional[str] = None
     term_sequence: Optional[int] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class OrderPFSubMerchantDTO:
     mcc: Optional[str] = None
@@ -176,7 +298,11 @@ class OrderPFSubMerchantDTO:
     switch_id: Optional[str] = None
     terminal_no: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class ShippingAddressDTO:
     address: Optional[str] = None
@@ -187,7 +313,11 @@ class ShippingAddressDTO:
     tracking_code: Optional[str] = None
     zip_code: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class SubOrganizationDTO:
     acquirer: Optional[str] = None
@@ -207,14 +337,22 @@ class SubOrganizationDTO:
     tax_number: Optional[str] = None
     tax_office: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
 
+
+@_slotted
 @dataclass
 class SubmerchantDTO:
     amount: Optional[float] = None
     merchant_reference_id: Optional[str] = None
     order_basket_item_id: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class OrderConsent:
     title: Optional[str] = None
@@ -224,6 +362,7 @@ class OrderConsent:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderCreateDTO:
     amount: float
@@ -260,6 +399,7 @@ class OrderCreateDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderAccountingRequest:
     order_reference_id: str
@@ -268,6 +408,7 @@ class OrderAccountingRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPostAuthRequest:
     amount: float
@@ -277,6 +418,7 @@ class OrderPostAuthRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderManualCallbackDTO:
     reference_id: str
@@ -286,6 +428,7 @@ class OrderManualCallbackDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class RefundOrderDTO:
     amount: float
@@ -297,6 +440,7 @@ class RefundOrderDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class CancelOrderDTO:
     reference_id: str
@@ -305,6 +449,7 @@ class CancelOrderDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class RefundAllOrderDTO:
     reference_id: str
@@ -313,6 +458,7 @@ class RefundAllOrderDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPaymentDetailDTO:
     reference_id: str
@@ -322,6 +468,7 @@ class OrderPaymentDetailDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class TerminateRequest:
     reference_id: str
@@ -330,6 +477,7 @@ class TerminateRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderRelatedReferenceDTO:
     reference_id: str
@@ -339,6 +487,7 @@ class OrderRelatedReferenceDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPaymentTermCreateDTO:
     order_id: str
@@ -355,6 +504,7 @@ class OrderPaymentTermCreateDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderTermRefundRequest:
     term_id: str
@@ -363,9 +513,10 @@ class OrderTermRefundRequest:
     term_payment_id: Optional[str] = None
 
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubscriptionBilling:
     address: Optional[str] = None
@@ -375,7 +526,11 @@ class SubscriptionBilling:
     vat_number: Optional[str] = None
     zip_code: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class SubscriptionUser:
     address: Optional[str] = None
@@ -389,25 +544,31 @@ class SubscriptionUser:
     phone: Optional[str] = None
     zip_code: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
 
+@_slotted
 @dataclass
 class SubscriptionGetRequest:
     external_reference_id: Optional[str] = None
     reference_id: Optional[str] = None
 
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubscriptionCancelRequest:
     external_reference_id: Optional[str] = None
     reference_id: Optional[str] = None
 
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubscriptionCreateRequest:
     amount: Optional[float] = None
@@ -427,14 +588,16 @@ class SubscriptionCreateRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubscriptionRedirectRequest:
     subscription_id: Optional[str] = None
 
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class AddBasketItemRequest:
     order_reference_id: str
@@ -444,6 +607,7 @@ class AddBasketItemRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class RemoveBasketItemRequest:
     order_reference_id: str
@@ -453,6 +617,7 @@ class RemoveBasketItemRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class UpdateBasketItemRequest:
     order_reference_id: str
@@ -462,6 +627,7 @@ class UpdateBasketItemRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class CallbackURLDTO:
     callback_url: Optional[str] = None
@@ -473,6 +639,7 @@ class CallbackURLDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubscriptionOrder:
     amount: Optional[str] = None
@@ -482,24 +649,11 @@ class SubscriptionOrder:
     reference_id: Optional[str] = None
     status: Optional[str] = None
 
-
-class OrderResponse(dict):
-    def __init__(self, *args: Any, **kwargs: Any):
-        super().__init__(*args, **kwargs)
-
-    @property
-    def reference_id(self) -> str:
-        return self.get("reference_id")
-
-    @property
-    def checkout_url(self) -> str:
-        return self.get("checkout_url")
-
-    @property
-    def order_id(self) -> str:
-        return self.get("order_id")
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPaymentTermDeleteDTO:
     order_id: str
@@ -509,6 +663,7 @@ class OrderPaymentTermDeleteDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPaymentTermUpdateDTO:
     amount: float
@@ -531,6 +686,7 @@ class OrgCreateBusinessRequest_BusinessType:
     UNKNOWN = 4
 
 
+@_slotted
 @dataclass
 class OrgCreateBusinessRequest:
     address: str
@@ -549,6 +705,7 @@ class OrgCreateBusinessRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class GetUserLimitRequest:
     user_id: str
@@ -557,6 +714,7 @@ class GetUserLimitRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SetLimitUserRequest:
     limit_id: str
@@ -566,6 +724,7 @@ class SetLimitUserRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class GetVposRequest:
     currency_id: str
@@ -574,6 +733,7 @@ class GetVposRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrgCreateUserReq:
     conversation_id: str
@@ -589,6 +749,7 @@ class OrgCreateUserReq:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrgUserVerifyReq:
     user_id: str
@@ -597,6 +758,7 @@ class OrgUserVerifyReq:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrgUserMobileVerifyReq:
     user_id: str
@@ -605,6 +767,7 @@ class OrgUserMobileVerifyReq:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderPaymentOptionsUpdateDTO:
     payment_options: List[str]
@@ -614,6 +777,7 @@ class OrderPaymentOptionsUpdateDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SplitOrderItemPaymentDTO:
     amount: float
@@ -623,6 +787,7 @@ class SplitOrderItemPaymentDTO:
     def to_dict(self) -> dict:
         return _asdict_factory(self)
 
+@_slotted
 @dataclass
 class GetOrderPaymentsRequest:
     order_id: Optional[str] = None
@@ -633,6 +798,7 @@ class GetOrderPaymentsRequest:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrderOIPDTO:
     order_id: str
@@ -646,6 +812,7 @@ class OrderOIPDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class OrgUserTokenCreateReq:
     email: str
@@ -656,6 +823,7 @@ class OrgUserTokenCreateReq:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubmerchantCreateDTO:
     locale: Optional[str] = None
@@ -683,11 +851,69 @@ class SubmerchantCreateDTO:
         return _asdict_factory(self)
 
 
+@_slotted
 @dataclass
 class SubmerchantUpdateDTO(SubmerchantCreateDTO):
     pass
 
 
+@_slotted
+@dataclass
+class DownloadResult:
+    filename: str
+    size: int
+    path: Optional[str] = None
+    checksum: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
+
+@_slotted
+@dataclass
+class ExportManifestEntry:
+    order_id: str
+    format: str
+    path: Optional[str] = None
+    size: Optional[int] = None
+    checksum: Optional[str] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return _asdict_factory(self)
+
+
+@_slotted
+@dataclass
+class BulkOrderResult:
+    """Outcome of one order of a bulk create: its response or its error"""
+
+    index: int
+    response: Optional[OrderResponse] = None
+    error: Optional[APIException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        data: Dict[str, Any] = {"index": self.index}
+        if self.response is not None:
+            data["response"] = dict(self.response)
+        if self.error is not None:
+            data["error"] = {
+                "status_code": self.error.status_code,
+                "code": self.error.code,
+                "error": self.error.error,
+            }
+        return data
+
+
 class FileResponse:
     def __init__(self, content: bytes, filename: str = "download"):
         self.content = content
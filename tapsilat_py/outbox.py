@@ -0,0 +1,376 @@
+"""Durable queue for writes that must go through even while the API is down.
+
+    queue = WriteQueue("/var/lib/terminal/tapsilat-queue.db", client)
+    queue.start()
+    queue.refund_order(RefundOrderDTO(amount=50, reference_id="ref-1"))
+    ...
+    queue.stop()
+
+A write is stored in SQLite before the enqueue call returns. A background
+flusher sends due writes a few at a time, backing off after transient
+failures (connection errors, timeouts, 5xx, 429). Writes for the same order
+are sent one at a time in the order they were queued.
+
+Delivery is at least once: a write whose outcome was lost, e.g. because the
+process died mid-request, is sent again after a restart. Every write carries
+the idempotency key it was given when it was queued, so the API can discard
+the duplicate. A write the API rejects (4xx) is moved to the failed list
+instead of being retried, and the later writes of its order go ahead. A
+write that runs out of max_attempts is moved there too, but its order stays
+held: its outcome is unknown, so the writes queued after it wait until it is
+retried with retry_failed().
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .exceptions import APIException
+from .idempotency import HEADER, was_rejected
+from .models import CancelOrderDTO, RefundOrderDTO, TerminateRequest
+from .retry import RetryPolicy
+
+# Operations that can be queued, with their method and endpoint.
+OPERATIONS = {
+    "refund_order": ("POST", "/order/refund"),
+    "cancel_order": ("POST", "/order/cancel"),
+    "terminate_order": ("POST", "/order/terminate"),
+}
+
+PENDING = "pending"
+SENDING = "sending"
+FAILED = "failed"  # ran out of attempts; holds back the later writes of its order
+REJECTED = "rejected"  # refused by the API (4xx)
+
+_COLUMNS = (
+    "id, operation, order_key, payload, idempotency_key, state, attempts, "
+    "enqueued_at, next_attempt_at, last_error"
+)
+
+
+class QueuedWrite:
+    __slots__ = (
+        "id",
+        "operation",
+        "order_key",
+        "payload",
+        "idempotency_key",
+        "state",
+        "attempts",
+        "enqueued_at",
+        "next_attempt_at",
+        "last_error",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        operation: str,
+        order_key: str,
+        payload: Dict[str, Any],
+        idempotency_key: str,
+        state: str,
+        attempts: int,
+        enqueued_at: float,
+        next_attempt_at: float,
+        last_error: Optional[str],
+    ):
+        self.id = id
+        self.operation = operation
+        self.order_key = order_key
+        self.payload = payload
+        self.idempotency_key = idempotency_key
+        self.state = state
+        self.attempts = attempts
+        self.enqueued_at = enqueued_at
+        self.next_attempt_at = next_attempt_at
+        self.last_error = last_error
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> "QueuedWrite":
+        row = list(row)
+        row[3] = json.loads(row[3])
+        return cls(*row)
+
+    def __repr__(self) -> str:
+        return f"QueuedWrite({self.id}, {self.operation!r}, {self.order_key!r}, {self.state!r})"
+
+
+class WriteQueue:
+    """Disk-backed outbound queue of refunds, cancellations and terminations.
+
+    Only one flusher should run per queue file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client: Any,
+        concurrency: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_attempts: Optional[int] = None,
+        poll_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        path: SQLite file holding the queue; created if missing.
+        client: the TapsilatAPI the writes are sent with.
+        concurrency: writes in flight at once, each for a different order.
+        retry_policy: its backoff() spaces out the attempts of a write.
+            Defaults to full-jitter backoff from 1s up to 5 minutes.
+        max_attempts: attempts after which a write is moved to the failed
+            list; None keeps retrying for as long as the API is unreachable.
+        poll_interval: longest the flusher sleeps between checks for due writes.
+        """
+        self.path = path
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.retry_policy = (
+            retry_policy
+            if retry_policy is not None
+            else RetryPolicy(backoff_factor=1.0, backoff_max=300.0)
+        )
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight: Set[int] = set()
+        self.delivered = 0
+        self.retried = 0
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, operation TEXT NOT NULL, "
+            "order_key TEXT NOT NULL, payload TEXT NOT NULL, idempotency_key TEXT NOT NULL, "
+            "state TEXT NOT NULL, attempts INTEGER NOT NULL, enqueued_at REAL NOT NULL, "
+            "next_attempt_at REAL NOT NULL, last_error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_order ON outbox (order_key, id)")
+        # Writes that were being sent when the last process stopped have an
+        # unknown outcome; send them again.
+        self._db.execute("UPDATE outbox SET state = ? WHERE state = ?", (PENDING, SENDING))
+
+    def __enter__(self) -> "WriteQueue":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def refund_order(self, refund_data: RefundOrderDTO) -> QueuedWrite:
+        return self.enqueue("refund_order", refund_data.to_dict(), refund_data.reference_id)
+
+    def cancel_order(self, request: CancelOrderDTO) -> QueuedWrite:
+        return self.enqueue("cancel_order", request.to_dict(), request.reference_id)
+
+    def terminate_order(self, request: TerminateRequest) -> QueuedWrite:
+        return self.enqueue("terminate_order", request.to_dict(), request.reference_id)
+
+    def enqueue(self, operation: str, payload: Dict[str, Any], order_key: str) -> QueuedWrite:
+        """Store a write; it is durable once this returns"""
+        if operation not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {operation!r}; expected one of {sorted(OPERATIONS)}"
+            )
+        now = self._clock()
+        key = str(uuid.uuid4())
+        with self._changed:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (operation, order_key, payload, idempotency_key, state, "
+                "attempts, enqueued_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (operation, order_key, json.dumps(payload), key, PENDING, now, now),
+            )
+            self._changed.notify_all()
+        self._wake.set()
+        return QueuedWrite(
+            cursor.lastrowid, operation, order_key, payload, key, PENDING, 0, now, now, None
+        )
+
+    def start(self) -> None:
+        """Start the background flusher"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="tapsilat-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the flusher once the writes in flight are done. Queued writes stay queued."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is left to send; False if timeout passed first.
+
+        Writes held behind a write of their order that ran out of attempts
+        count as settled.
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._db.execute(
+                "SELECT 1 FROM outbox o WHERE o.state NOT IN (?, ?) AND NOT EXISTS ("
+                "SELECT 1 FROM outbox p WHERE p.order_key = o.order_key AND p.id < o.id "
+                "AND p.state = ?) LIMIT 1",
+                (FAILED, REJECTED, FAILED),
+            ).fetchone():
+                left = None if expires is None else expires - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._changed.wait(
+                    self.poll_interval if left is None else min(left, self.poll_interval)
+                )
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """depth: writes waiting or in flight; oldest_age: seconds the oldest has waited"""
+        with self._lock:
+            depth, oldest = self._db.execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM outbox WHERE state NOT IN (?, ?)",
+                (FAILED, REJECTED),
+            ).fetchone()
+            failed = self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state IN (?, ?)", (FAILED, REJECTED)
+            ).fetchone()[0]
+            return {
+                "depth": depth,
+                "oldest_age": None if oldest is None else max(self._clock() - oldest, 0.0),
+                "in_flight": len(self._in_flight),
+                "failed": failed,
+                "delivered": self.delivered,
+                "retried": self.retried,
+            }
+
+    def pending(self) -> List[QueuedWrite]:
+        return self._select("state NOT IN (?, ?)", (FAILED, REJECTED))
+
+    def failed(self) -> List[QueuedWrite]:
+        """Writes the API rejected (state REJECTED) or that ran out of attempts (FAILED)"""
+        return self._select("state IN (?, ?)", (FAILED, REJECTED))
+
+    def retry_failed(self) -> int:
+        """Queue the failed writes again; return how many"""
+        with self._changed:
+            count = self._db.execute(
+                "UPDATE outbox SET state = ?, attempts = 0, next_attempt_at = ? "
+                "WHERE state IN (?, ?)",
+                (PENDING, self._clock(), FAILED, REJECTED),
+            ).rowcount
+            self._changed.notify_all()
+        self._wake.set()
+        return count
+
+    def _select(self, where: str, args: tuple) -> List[QueuedWrite]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE {where} ORDER BY id", args
+            ).fetchall()
+        return [QueuedWrite._from_row(row) for row in rows]
+
+    # The head of an order is its oldest write that was not rejected; only
+    # heads are sent, which keeps each order's writes in sequence. A write that
+    # ran out of attempts stays the head: it may yet have to go first.
+    _DUE = (
+        "FROM outbox o WHERE o.state = ? AND o.next_attempt_at <= ? AND NOT EXISTS ("
+        "SELECT 1 FROM outbox p WHERE p.order_key = o.order_key AND p.id < o.id "
+        "AND p.state != ?)"
+    )
+
+    def _claim_due(self, limit: int) -> List[QueuedWrite]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} {self._DUE} ORDER BY o.id LIMIT ?",
+                (PENDING, self._clock(), REJECTED, limit),
+            ).fetchall()
+            writes = [QueuedWrite._from_row(row) for row in rows]
+            for write in writes:
+                self._db.execute("UPDATE outbox SET state = ? WHERE id = ?", (SENDING, write.id))
+                self._in_flight.add(write.id)
+        return writes
+
+    def _next_wait(self) -> float:
+        with self._lock:
+            earliest = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE state = ?", (PENDING,)
+            ).fetchone()[0]
+        if earliest is None:
+            return self.poll_interval
+        wait = earliest - self._clock()
+        # A write already due is waiting for a free slot or for an earlier
+        # write of its order; finishing either wakes the flusher.
+        return self.poll_interval if wait <= 0 else min(wait, self.poll_interval)
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="tapsilat-outbox-send"
+        ) as executor:
+            while not self._stopping.is_set():
+                self._wake.clear()
+                for write in self._claim_due(self.concurrency - len(self._in_flight)):
+                    executor.submit(self._deliver, write)
+                self._wake.wait(self._next_wait())
+
+    def _deliver(self, write: QueuedWrite) -> None:
+        method, endpoint = OPERATIONS[write.operation]
+        error: Optional[APIException] = None
+        try:
+            # Straight to _request: the queue is the write's journal, and its
+            # key must not be replaced by the client's own idempotency keys.
+            self.client._request(
+                method,
+                endpoint,
+                None,
+                write.payload,
+                False,
+                extra_headers={HEADER: write.idempotency_key},
+            )
+        except APIException as e:
+            error = e
+        except Exception as e:  # keep the write rather than lose it in the pool
+            error = APIException(0, -1, f"{type(e).__name__}: {e}")
+
+        with self._changed:
+            if error is None:
+                self._db.execute("DELETE FROM outbox WHERE id = ?", (write.id,))
+                self.delivered += 1
+            else:
+                attempts = write.attempts + 1
+                if was_rejected(error):
+                    state = REJECTED
+                elif self.max_attempts is not None and attempts >= self.max_attempts:
+                    state = FAILED
+                else:
+                    state = PENDING
+                    self.retried += 1
+                self._db.execute(
+                    "UPDATE outbox SET state = ?, attempts = ?, next_attempt_at = ?, "
+                    "last_error = ? WHERE id = ?",
+                    (
+                        state,
+                        attempts,
+                        self._clock() + self.retry_policy.backoff(attempts),
+                        f"{error.status_code} {error.error}",
+                        write.id,
+                    ),
+                )
+            self._in_flight.discard(write.id)
+            self._changed.notify_all()
+        self._wake.set()
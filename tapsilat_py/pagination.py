@@ -0,0 +1,210 @@
+"""Lazy iteration over the paginated list endpoints.
+
+List responses carry their records under "rows", "row", "data" or "items" and
+the page count as "total_page"/"total_pages" or a "total" record count; pages
+are read until the last one, or until a page comes back short when the
+response does not say how many there are.
+"""
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .responses import ROW_KEYS, Page
+
+
+def page_items(page: Any) -> List[Any]:
+    if isinstance(page, list):
+        return page
+    if isinstance(page, Page):
+        return page.rows
+    if not isinstance(page, dict):
+        return []
+    for key in ROW_KEYS:
+        items = page.get(key)
+        if isinstance(items, list):
+            return items
+    return []
+
+
+def total_pages(page: Any, per_page: int) -> Optional[int]:
+    if not isinstance(page, dict):
+        return None
+    pages = page.get("total_page") or page.get("total_pages")
+    if pages is not None:
+        return int(pages)
+    total = page.get("total")
+    if total is not None and per_page > 0:
+        return math.ceil(int(total) / per_page)
+    return None
+
+
+def is_last_page(page: Any, number: int, per_page: int) -> bool:
+    items = page_items(page)
+    if not items:
+        return True
+    pages = total_pages(page, per_page)
+    if pages is not None:
+        return number >= pages
+    return len(items) < per_page
+
+
+def _window(prefetch: int, concurrency: int, last: Optional[int]) -> int:
+    """Number of pages to keep in flight ahead of the one being consumed"""
+    # Fan out only once the page count is known; otherwise requests past the
+    # end would be wasted.
+    if concurrency > 1 and last is not None:
+        return max(prefetch, concurrency)
+    return prefetch
+
+
+def iter_pages(
+    fetch_page: Callable[[int], Any],
+    per_page: int,
+    start_page: int = 1,
+    prefetch: int = 0,
+    concurrency: int = 1,
+) -> Iterator[Any]:
+    """Yield raw pages from start_page on, fetching each only when needed.
+
+    With prefetch > 0, up to that many following pages are requested on a
+    background thread while the caller works through the current one.
+
+    With concurrency > 1, once the first page tells how many pages there are,
+    up to that many pages are fetched at once on a pool of threads. Pages are
+    still yielded in order, and an error from any page cancels the rest.
+    """
+    page = fetch_page(start_page)
+    if is_last_page(page, start_page, per_page):
+        yield page
+        return
+    last = total_pages(page, per_page)
+    window = _window(prefetch, concurrency, last)
+
+    if window <= 0:
+        yield page
+        number = start_page + 1
+        while True:
+            page = fetch_page(number)
+            yield page
+            if is_last_page(page, number, per_page):
+                return
+            number += 1
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max(concurrency, 1), window), thread_name_prefix="tapsilat-prefetch"
+    )
+    pending: Deque[Tuple[int, Future]] = deque()
+    next_number = start_page + 1
+
+    def top_up() -> None:
+        nonlocal next_number
+        while len(pending) < window and (last is None or next_number <= last):
+            # Run in a copy of the caller's context so a deadline set around the
+            # iteration also bounds the prefetched pages.
+            future = executor.submit(copy_context().run, fetch_page, next_number)
+            pending.append((next_number, future))
+            next_number += 1
+
+    try:
+        top_up()
+        yield page
+        while pending:
+            number, future = pending.popleft()
+            page = future.result()
+            if is_last_page(page, number, per_page):
+                yield page
+                return
+            top_up()
+            yield page
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_records(
+    fetch_page: Callable[[int], Any],
+    per_page: int,
+    start_page: int = 1,
+    prefetch: int = 0,
+    concurrency: int = 1,
+) -> Iterator[Any]:
+    """Yield the records of every page one at a time"""
+    for page in iter_pages(fetch_page, per_page, start_page, prefetch, concurrency):
+        yield from page_items(page)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    per_page: int,
+    start_page: int = 1,
+    prefetch: int = 0,
+    concurrency: int = 1,
+) -> AsyncIterator[Any]:
+    """Async version of iter_pages; prefetched pages are fetched as tasks"""
+    page = await fetch_page(start_page)
+    if is_last_page(page, start_page, per_page):
+        yield page
+        return
+    last = total_pages(page, per_page)
+    window = _window(prefetch, concurrency, last)
+
+    if window <= 0:
+        yield page
+        number = start_page + 1
+        while True:
+            page = await fetch_page(number)
+            yield page
+            if is_last_page(page, number, per_page):
+                return
+            number += 1
+
+    pending: Deque[Tuple[int, "asyncio.Task[Any]"]] = deque()
+    next_number = start_page + 1
+
+    def top_up() -> None:
+        nonlocal next_number
+        while len(pending) < window and (last is None or next_number <= last):
+            pending.append((next_number, asyncio.ensure_future(fetch_page(next_number))))
+            next_number += 1
+
+    try:
+        top_up()
+        yield page
+        while pending:
+            number, task = pending.popleft()
+            page = await task
+            if is_last_page(page, number, per_page):
+                yield page
+                return
+            top_up()
+            yield page
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+async def aiter_records(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    per_page: int,
+    start_page: int = 1,
+    prefetch: int = 0,
+    concurrency: int = 1,
+) -> AsyncIterator[Any]:
+    """Yield the records of every page one at a time"""
+    async for page in aiter_pages(fetch_page, per_page, start_page, prefetch, concurrency):
+        for item in page_items(page):
+            yield item
@@ -0,0 +1,208 @@
+"""Client-side token-bucket rate limiting per endpoint group.
+
+Each group (see _http.endpoint_group) has its own bucket. A request takes a
+token, waiting for one to accrue if the bucket is empty, so bursts are spread
+out instead of running into the API's 429s.
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from ._http import endpoint_group
+from .exceptions import DeadlineExceeded
+from .timeouts import Deadline, current_deadline
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+Limit = Union[float, Tuple[float, float]]
+
+
+class MemoryBackend:
+    """Bucket state for the threads of one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def reserve(
+        self,
+        group: str,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float],
+        max_wait: Optional[float] = None,
+    ) -> float:
+        with self._lock:
+            now = clock()
+            tokens, updated = self._buckets.get(group, (capacity, now))
+            tokens, wait = _take(tokens, now - updated, rate, capacity)
+            if not _too_long(wait, max_wait):
+                self._buckets[group] = (tokens, now)
+            return wait
+
+
+class FileLockBackend:
+    """Bucket state in a file guarded by flock, shared by every process on the host.
+
+    All processes must use the same path and the same limits. Requires fcntl,
+    so it is POSIX only.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileLockBackend requires fcntl, which this platform lacks")
+        self.path = path
+        # flock is per open file description, so threads of this process also
+        # need the in-process lock.
+        self._lock = threading.Lock()
+
+    def reserve(
+        self,
+        group: str,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float],
+        max_wait: Optional[float] = None,
+    ) -> float:
+        with self._lock, open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Read the clock only once the lock is held, so a process that
+                # waited for it cannot move the bucket's timestamp backwards.
+                now = clock()
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                tokens, updated = state.get(group, (capacity, now))
+                tokens, wait = _take(tokens, now - updated, rate, capacity)
+                if not _too_long(wait, max_wait):
+                    state[group] = (tokens, now)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    # Flushed to the page cache, which every process reads; the
+                    # state is not worth an fsync, losing it only refills buckets.
+                    f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+
+def _take(tokens: float, elapsed: float, rate: float, capacity: float) -> Tuple[float, float]:
+    """Refill for elapsed seconds and take one token; return (tokens, seconds to wait).
+
+    The token is reserved even when the bucket is empty, leaving it in debt,
+    so concurrent callers queue up in order instead of racing for the refill.
+    """
+    tokens = min(capacity, tokens + max(elapsed, 0.0) * rate) - 1
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return tokens, wait
+
+
+def _too_long(wait: float, max_wait: Optional[float]) -> bool:
+    """Whether a reservation that must wait seconds is refused, leaving the bucket as it was"""
+    return max_wait is not None and wait > 0 and wait >= max_wait
+
+
+class RateLimiter:
+    """Token buckets per endpoint group.
+
+        limiter = RateLimiter({"order_write": 5, "order_read": (20, 40)})
+        client = TapsilatAPI(api_key, rate_limiter=limiter)
+
+    Groups are order_read, order_write, system, organization and default.
+    Groups without a limit are not throttled.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Limit],
+        backend: Optional[Union[MemoryBackend, FileLockBackend]] = None,
+        group: Callable[[str, str], str] = endpoint_group,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        limits: requests per second for each group, or (rate, burst) where
+            burst is the bucket size; it defaults to one second's worth, at
+            least 1.
+        backend: where bucket state lives. MemoryBackend (the default) is
+            shared by the threads of one process; FileLockBackend(path) by
+            every process using that path.
+        group: maps (method, endpoint) to a group name.
+        clock: wall-clock seconds; shared backends need a clock every
+            process agrees on.
+        """
+        self.limits: Dict[str, Tuple[float, float]] = {}
+        for name, limit in limits.items():
+            rate, burst = limit if isinstance(limit, tuple) else (limit, max(limit, 1.0))
+            if rate <= 0 or burst < 1:
+                raise ValueError(f"Invalid limit for {name!r}: rate must be > 0 and burst >= 1")
+            self.limits[name] = (float(rate), float(burst))
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.group = group
+        self._clock = clock
+        self._stats_lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            return {
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "wait_seconds": self.wait_seconds,
+            }
+
+    def reserve(self, method: str, endpoint: str, max_wait: Optional[float] = None) -> float:
+        """Take a token for the request and return how long to wait before sending it.
+
+        With max_wait, no token is taken when the wait would be at least that long.
+        """
+        group = self.group(method, endpoint)
+        limit = self.limits.get(group)
+        if limit is None:
+            return 0.0
+        wait = self.backend.reserve(group, limit[0], limit[1], self._clock, max_wait)
+        if _too_long(wait, max_wait):
+            return wait
+        with self._stats_lock:
+            self.acquired += 1
+            if wait > 0:
+                self.waited += 1
+                self.wait_seconds += wait
+        return wait
+
+    def acquire(self, method: str, endpoint: str) -> None:
+        """Wait for a token; raises DeadlineExceeded rather than wait past the deadline"""
+        wait = self._reserve_within(current_deadline(), method, endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, method: str, endpoint: str) -> None:
+        current = current_deadline()
+        if isinstance(self.backend, FileLockBackend):
+            # flock blocks for as long as another process holds the file.
+            wait = await asyncio.get_running_loop().run_in_executor(
+                None, self._reserve_within, current, method, endpoint
+            )
+        else:
+            wait = self._reserve_within(current, method, endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve_within(self, current: Optional[Deadline], method: str, endpoint: str) -> float:
+        # The deadline is checked before the token is taken, so a caller that
+        # gives up does not use up a token that a later request could have had.
+        left = None if current is None else current.remaining()
+        wait = self.reserve(method, endpoint, left)
+        if _too_long(wait, left):
+            raise DeadlineExceeded(current.seconds)
+        return wait
@@ -0,0 +1,389 @@
+"""Typed views of API responses.
+
+Response models are dict subclasses, so code that indexes the JSON keeps
+working, and add typed attributes on top:
+
+    order = client.get_order(reference_id)
+    order.status                       # order["status"]
+    order.basket_items[0].item_payments[0].amount
+
+Scalar attributes read the dict directly. Nested sections become models only
+when first accessed, and the result is cached on the instance, so reading
+order.status from an order with 500 basket items never builds those items.
+The cache is not refreshed if the dict itself is changed afterwards.
+"""
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, overload
+
+T = TypeVar("T")
+M = TypeVar("M", bound="ResponseModel")
+
+# Keys list endpoints put their records under, in order of preference.
+ROW_KEYS = ("rows", "row", "data", "items")
+
+
+class ResponseModel(dict):
+    """Base of the response models: the JSON object, plus typed attributes"""
+
+    __slots__ = ("_decoded",)
+
+    def _decode(self, key: str, model: Type[M], many: bool) -> Any:
+        try:
+            decoded: Dict[str, Any] = self._decoded
+        except AttributeError:
+            decoded = self._decoded = {}
+        try:
+            return decoded[key]
+        except KeyError:
+            pass
+        raw = self.get(key)
+        if many:
+            value = decode_list(raw, model) if isinstance(raw, list) else []
+        else:
+            value = model(raw) if isinstance(raw, dict) else None
+        decoded[key] = value
+        return value
+
+
+class Field(Generic[T]):
+    """A value read straight from the response, None when absent.
+
+    Declared as `status = Field[int]()`; the key defaults to the attribute name.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.key is None:
+            self.key = name
+
+    @overload
+    def __get__(self, obj: None, owner: type) -> "Field[T]": ...
+
+    @overload
+    def __get__(self, obj: ResponseModel, owner: type) -> Optional[T]: ...
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.get(self.key)
+
+
+class Nested(Generic[M]):
+    """A sub-object decoded into model on first access"""
+
+    __slots__ = ("model", "key")
+
+    def __init__(self, model: Type[M], key: Optional[str] = None):
+        self.model = model
+        self.key = key
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.key is None:
+            self.key = name
+
+    @overload
+    def __get__(self, obj: None, owner: type) -> "Nested[M]": ...
+
+    @overload
+    def __get__(self, obj: ResponseModel, owner: type) -> Optional[M]: ...
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj._decode(self.key, self.model, False)
+
+
+class NestedList(Nested[M]):
+    """A list of sub-objects decoded into model on first access; [] when absent"""
+
+    __slots__ = ()
+
+    @overload
+    def __get__(self, obj: None, owner: type) -> "NestedList[M]": ...
+
+    @overload
+    def __get__(self, obj: ResponseModel, owner: type) -> List[M]: ...
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj._decode(self.key, self.model, True)
+
+
+def decode(data: Any, model: Type[M]) -> Any:
+    """data as a model when it is a JSON object, otherwise unchanged"""
+    return model(data) if isinstance(data, dict) else data
+
+
+def decode_list(data: Any, model: Type[M]) -> Any:
+    """Each JSON object of a list as a model; anything else unchanged"""
+    if not isinstance(data, list):
+        return data
+    return [model(item) if isinstance(item, dict) else item for item in data]
+
+
+class Page(ResponseModel, Generic[M]):
+    """One page of a list endpoint; rows holds its records as row_model"""
+
+    __slots__ = ()
+    row_model: Type[ResponseModel] = ResponseModel
+
+    page = Field[int]()
+    per_page = Field[int]()
+    total = Field[int]()
+    total_page = Field[int]()
+
+    @property
+    def rows(self) -> List[M]:
+        for key in ROW_KEYS:
+            if isinstance(self.get(key), list):
+                return self._decode(key, self.row_model, True)
+        return []
+
+
+class AddressResponse(ResponseModel):
+    __slots__ = ()
+
+    address = Field[str]()
+    city = Field[str]()
+    contact_name = Field[str]()
+    contact_phone = Field[str]()
+    country = Field[str]()
+    district = Field[str]()
+    zip_code = Field[str]()
+    vat_number = Field[str]()
+    tax_office = Field[str]()
+
+
+class BuyerResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    name = Field[str]()
+    surname = Field[str]()
+    email = Field[str]()
+    gsm_number = Field[str]()
+    identity_number = Field[str]()
+    city = Field[str]()
+    country = Field[str]()
+
+
+class PayerResponse(ResponseModel):
+    __slots__ = ()
+
+    reference_id = Field[str]()
+    type = Field[str]()
+    name = Field[str]()
+    surname = Field[str]()
+    title = Field[str]()
+    email = Field[str]()
+    phone = Field[str]()
+
+
+class ItemPaymentResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    amount = Field[float]()
+    status = Field[int]()
+    type = Field[str]()
+    card_brand = Field[str]()
+    masked_bin = Field[str]()
+    paid_date = Field[str]()
+    refundable_amount = Field[float]()
+    refunded = Field[bool]()
+    refunded_amount = Field[float]()
+    refunded_date = Field[str]()
+
+
+class BasketItemResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    name = Field[str]()
+    item_type = Field[str]()
+    category1 = Field[str]()
+    category2 = Field[str]()
+    price = Field[float]()
+    quantity = Field[int]()
+    status = Field[int]()
+    paid_amount = Field[float]()
+    refundable_amount = Field[float]()
+    refunded_amount = Field[float]()
+    sub_merchant_key = Field[str]()
+    payer = Nested(PayerResponse)
+    item_payments = NestedList(ItemPaymentResponse)
+
+
+class PaymentTermResponse(ResponseModel):
+    __slots__ = ()
+
+    term_reference_id = Field[str]()
+    term_sequence = Field[int]()
+    amount = Field[float]()
+    status = Field[str]()
+    required = Field[bool]()
+    due_date = Field[str]()
+    paid_date = Field[str]()
+
+
+class OrderResponse(ResponseModel):
+    __slots__ = ()
+
+    reference_id = Field[str]()
+    order_id = Field[str]()
+    checkout_url = Field[str]()
+    conversation_id = Field[str]()
+    external_reference_id = Field[str]()
+    status = Field[Any]()
+    status_enum = Field[str]()
+    amount = Field[float]()
+    total = Field[float]()
+    paid_amount = Field[float]()
+    refunded_amount = Field[float]()
+    currency = Field[str]()
+    locale = Field[str]()
+    created_at = Field[str]()
+    buyer = Nested(BuyerResponse)
+    billing_address = Nested(AddressResponse)
+    shipping_address = Nested(AddressResponse)
+    basket_items = NestedList(BasketItemResponse)
+    payment_terms = NestedList(PaymentTermResponse)
+
+
+class OrderPage(Page[OrderResponse]):
+    __slots__ = ()
+    row_model = OrderResponse
+
+
+class TransactionResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    reference_id = Field[str]()
+    order_reference_id = Field[str]()
+    amount = Field[float]()
+    currency = Field[str]()
+    status = Field[Any]()
+    type = Field[str]()
+    payment_type = Field[str]()
+    card_brand = Field[str]()
+    masked_bin = Field[str]()
+    installment = Field[int]()
+    created_at = Field[str]()
+
+
+class PaymentDetailsResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    reference_id = Field[str]()
+    conversation_id = Field[str]()
+    amount = Field[float]()
+    paid_amount = Field[float]()
+    refunded_amount = Field[float]()
+    currency = Field[str]()
+    status = Field[Any]()
+    installment = Field[int]()
+    card_brand = Field[str]()
+    masked_bin = Field[str]()
+    paid_date = Field[str]()
+    item_payments = NestedList(ItemPaymentResponse)
+
+
+class SubscriptionUserResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    first_name = Field[str]()
+    last_name = Field[str]()
+    email = Field[str]()
+    phone = Field[str]()
+    identity_number = Field[str]()
+    city = Field[str]()
+    country = Field[str]()
+
+
+class SubscriptionOrderResponse(ResponseModel):
+    __slots__ = ()
+
+    reference_id = Field[str]()
+    amount = Field[str]()
+    currency = Field[str]()
+    status = Field[str]()
+    payment_date = Field[str]()
+    payment_url = Field[str]()
+
+
+class SubscriptionResponse(ResponseModel):
+    __slots__ = ()
+
+    reference_id = Field[str]()
+    order_reference_id = Field[str]()
+    external_reference_id = Field[str]()
+    title = Field[str]()
+    status = Field[Any]()
+    amount = Field[float]()
+    currency = Field[str]()
+    period = Field[int]()
+    cycle = Field[int]()
+    payment_date = Field[int]()
+    billing = Nested(AddressResponse)
+    user = Nested(SubscriptionUserResponse)
+    orders = NestedList(SubscriptionOrderResponse)
+
+
+class SubscriptionPage(Page[SubscriptionResponse]):
+    __slots__ = ()
+    row_model = SubscriptionResponse
+
+
+class SubmerchantResponse(ResponseModel):
+    __slots__ = ()
+
+    id = Field[str]()
+    name = Field[str]()
+    email = Field[str]()
+    gsm_number = Field[str]()
+    address = Field[str]()
+    iban = Field[str]()
+    tax_office = Field[str]()
+    tax_number = Field[str]()
+    identity_number = Field[str]()
+    legal_company_title = Field[str]()
+    contact_name = Field[str]()
+    contact_surname = Field[str]()
+    currency_id = Field[str]()
+    sub_merchant_key = Field[str]()
+    sub_merchant_type = Field[str]()
+    sub_merchant_external_id = Field[str]()
+    organization_id = Field[str]()
+    status = Field[Any]()
+
+
+class SubmerchantPage(Page[SubmerchantResponse]):
+    __slots__ = ()
+    row_model = SubmerchantResponse
+
+
+class WebhookEvent(ResponseModel):
+    """A webhook notification; name is its event type"""
+
+    __slots__ = ()
+
+    event = Field[str]()
+    type = Field[str]()
+    reference_id = Field[str]()
+    order_reference_id = Field[str]()
+    conversation_id = Field[str]()
+    status = Field[Any]()
+    created_at = Field[str]()
+    data = Field[Any]()
+    order = Nested(OrderResponse, "data")
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.get("event") or self.get("type")
@@ -0,0 +1,149 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Collection, Optional, Tuple, Type
+
+import requests
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+ALL_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"})
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+DEFAULT_RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    asyncio.IncompleteReadError,
+)
+
+
+@dataclass
+class RetryEvent:
+    """A failed attempt that is about to be retried"""
+
+    method: str
+    endpoint: str
+    attempt: int  # 1-based number of the attempt that failed
+    delay: float  # seconds waited before the next attempt
+    elapsed: float  # seconds since the first attempt started
+    status_code: Optional[int] = None
+    exception: Optional[BaseException] = None
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        max_elapsed: Optional[float] = 60.0,
+        statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        on_retry: Optional[Callable[[RetryEvent], None]] = None,
+    ):
+        """
+        max_retries: retries after the first attempt; 0 disables retrying.
+        backoff_factor, backoff_max: the wait before retry n is drawn uniformly
+            from [0, min(backoff_max, backoff_factor * 2 ** (n - 1))] (full jitter).
+        max_elapsed: total seconds a call may spend including waits; a retry
+            that would end past this budget is not attempted. None disables it.
+        statuses: response status codes that are retried.
+        exceptions: transport exceptions that are retried.
+        methods: HTTP methods that may be retried. Only idempotent methods by
+            default; pass ALL_METHODS to opt writes in.
+        respect_retry_after: wait for the server's Retry-After header instead
+            of the computed backoff when present.
+        on_retry: called with a RetryEvent before each wait.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.max_elapsed = max_elapsed
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.respect_retry_after = respect_retry_after
+        self.on_retry = on_retry
+
+    def is_retryable(
+        self,
+        method: str,
+        status_code: Optional[int] = None,
+        exception: Optional[BaseException] = None,
+    ) -> bool:
+        if method.upper() not in self.methods:
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return status_code in self.statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retrying the given failed attempt"""
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        elapsed: float,
+        status_code: Optional[int] = None,
+        exception: Optional[BaseException] = None,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up"""
+        delay = self._compute_delay(
+            method, attempt, elapsed, status_code, exception, retry_after
+        )
+        if delay is not None and self.on_retry is not None:
+            self.on_retry(
+                RetryEvent(method, endpoint, attempt, delay, elapsed, status_code, exception)
+            )
+        return delay
+
+    def _compute_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        status_code: Optional[int],
+        exception: Optional[BaseException],
+        retry_after: Optional[str],
+    ) -> Optional[float]:
+        if attempt > self.max_retries:
+            return None
+        if not self.is_retryable(method, status_code, exception):
+            return None
+
+        delay = None
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,338 @@
+"""Parsing list pages record by record as the response body arrives.
+
+RowParser takes the body in chunks and returns each record of the page's
+"rows" (or "row", "data", "items") array as soon as its closing brace is in,
+so neither the raw page nor the decoded page is ever held in full. Each
+record is decoded by the standard library's C decoder; the envelope around
+the array is scanned by hand and kept, without the records, as the page's
+metadata.
+
+RowStream feeds a RowParser from either client's streaming download path,
+and iter_rows/aiter_rows turn that into an iterator with a bounded backlog:
+when the consumer falls behind, reading from the socket pauses.
+"""
+import asyncio
+import codecs
+import json
+import queue
+import re
+import threading
+from contextvars import copy_context
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, List, Optional
+
+from .downloads import DEFAULT_CHUNK_SIZE
+from .responses import ROW_KEYS
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Outside strings only these characters change the envelope's structure.
+_STRUCTURE = re.compile(r'["{}\[\],]')
+_STRING_END = re.compile(r'["\\]')
+_DELIMITERS = frozenset(" \t\n\r,]")
+
+_ENVELOPE, _ROWS, _DONE = range(3)
+
+
+class RowParser:
+    """Incremental parser for a JSON list page: records out, one at a time"""
+
+    def __init__(self, keys=ROW_KEYS):
+        self._keys = frozenset(keys)
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self._decode = json.JSONDecoder().raw_decode
+        self._buf = ""
+        self._pos = 0
+        self._final = False
+        self._state = _ENVELOPE
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._found = False
+        self._expect_row = False
+        self._empty = True
+        self._meta: List[str] = []
+        self._meta_from = 0
+        self.rows = 0
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Take the next chunk of the body; return the records it completed"""
+        self._buf += self._utf8.decode(data, self._final)
+        rows: List[Any] = []
+        while True:
+            if self._state == _ROWS:
+                progressed = self._scan_rows(rows)
+            elif self._state == _ENVELOPE:
+                progressed = self._scan_envelope()
+            else:
+                break
+            if not progressed:
+                break
+        self._compact()
+        return rows
+
+    def close(self) -> Any:
+        """Finish the body; return the page without its records, e.g. rows: []"""
+        self._final = True
+        self.feed(b"")
+        if not self._found and not "".join(self._meta).strip() and not self._buf.strip():
+            return {}  # no body, as after a 204
+        if self._state != _DONE or self._buf[self._pos:].strip():
+            raise ValueError("Response body is not a complete JSON list page")
+        meta = "".join(self._meta)
+        return json.loads(meta) if meta else []
+
+    def _scan_rows(self, rows: List[Any]) -> bool:
+        # Returns False when more data is needed.
+        buf = self._buf
+        pos = _WHITESPACE.match(buf, self._pos).end()
+        self._pos = pos
+        if pos >= len(buf):
+            return False
+        char = buf[pos]
+        if self._expect_row:
+            if char == "]" and self._empty:
+                return self._end_rows(pos)
+            try:
+                row, end = self._decode(buf, pos)
+            except ValueError:
+                return False
+            # A number cut off in the buffer ("2." of "2.5") could still be
+            # growing, so a record only counts once a delimiter follows it.
+            if end >= len(buf) or buf[end] not in _DELIMITERS:
+                if self._final:
+                    raise ValueError(f"Unexpected {buf[end:end + 1]!r} after a record")
+                return False
+            rows.append(row)
+            self.rows += 1
+            self._pos = end
+            self._expect_row = False
+            self._empty = False
+            return True
+        if char == ",":
+            self._pos = pos + 1
+            self._expect_row = True
+            return True
+        if char == "]":
+            return self._end_rows(pos)
+        raise ValueError(f"Unexpected {char!r} in the records array")
+
+    def _end_rows(self, pos: int) -> bool:
+        self._pos = pos + 1
+        self._meta_from = pos
+        self._key = None
+        if self._depth == 0:
+            # The page is a bare array.
+            self._meta = []
+            self._state = _DONE
+        else:
+            self._state = _ENVELOPE
+        return True
+
+    def _scan_envelope(self) -> bool:
+        buf = self._buf
+        if self._in_string:
+            match = _STRING_END.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            end = match.start()
+            if buf[end] == "\\":
+                if end + 1 >= len(buf):
+                    self._pos = end
+                    return False
+                self._pos = end + 2
+                return True
+            self._in_string = False
+            self._pos = end + 1
+            if self._depth == 1:
+                self._key = buf[self._string_start + 1:end]
+            return True
+
+        match = _STRUCTURE.search(buf, self._pos)
+        if match is None:
+            self._pos = len(buf)
+            return False
+        at = match.start()
+        char = buf[at]
+        self._pos = at + 1
+        if char == '"':
+            self._in_string = True
+            self._string_start = at
+        elif char == "[" and not self._found and (
+            self._depth == 0 or (self._depth == 1 and self._key in self._keys)
+        ):
+            self._meta.append(buf[self._meta_from:at + 1])
+            self._found = True
+            self._state = _ROWS
+            self._expect_row = True
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._meta.append(buf[self._meta_from:at + 1])
+                self._meta_from = at + 1
+                self._state = _DONE
+        elif char == "," and self._depth == 1:
+            self._key = None
+        return True
+
+    def _compact(self) -> None:
+        # Drop what has been consumed, keeping the buffer to about one record.
+        if self._state == _ENVELOPE:
+            keep = self._string_start if self._in_string else self._pos
+            self._meta.append(self._buf[self._meta_from:keep])
+        elif self._state == _ROWS:
+            keep = self._pos
+        else:
+            return
+        self._buf = self._buf[keep:]
+        self._pos -= keep
+        self._string_start -= keep
+        self._meta_from = 0
+
+
+class RowStream:
+    """Download sink that parses a list page and hands on its records.
+
+    deliver is called after each chunk with the records it completed, if
+    any. It may return an awaitable, which the async client awaits before
+    reading more.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[List[Any]], Optional[Awaitable[None]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        keys=ROW_KEYS,
+    ):
+        self.deliver = deliver
+        self.chunk_size = chunk_size
+        self.parser = RowParser(keys)
+        self.started = False
+        self.written = 0
+        self.page: Any = None
+
+    def open(self, filename: str, total: Optional[int] = None) -> None:
+        self.started = True
+
+    def write(self, chunk: bytes) -> Optional[Awaitable[None]]:
+        self.written += len(chunk)
+        rows = self.parser.feed(chunk)
+        return self.deliver(rows)
+
+    def finish(self) -> Any:
+        self.page = self.parser.close()
+        return self.page
+
+    def abort(self) -> None:
+        pass
+
+
+class _Stopped(Exception):
+    """Raised in the reading thread once the consumer has gone away"""
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_END = object()
+
+
+def iter_rows(
+    send: Callable[[RowStream], Any],
+    backlog: int = 32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[Any, None, None]:
+    """Records of the page send() streams into a RowStream, read on a worker thread.
+
+    At most backlog records wait between the thread and the consumer.
+    Stopping the iteration early closes the connection.
+    """
+    pending: "queue.Queue[Any]" = queue.Queue(max(1, backlog))
+    stopped = threading.Event()
+
+    def put(item: Any) -> None:
+        while True:
+            if stopped.is_set():
+                raise _Stopped()
+            try:
+                pending.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+
+    def deliver(rows: List[Any]) -> None:
+        for row in rows:
+            put(row)
+
+    def read() -> None:
+        try:
+            send(RowStream(deliver, chunk_size))
+        except _Stopped:
+            return
+        except BaseException as e:
+            try:
+                put(_Failure(e))
+            except _Stopped:
+                pass
+            return
+        try:
+            put(_END)
+        except _Stopped:
+            pass
+
+    # Run in a copy of the caller's context, so a deadline set around the
+    # iteration also bounds the request.
+    thread = threading.Thread(
+        target=copy_context().run, args=(read,), name="tapsilat-stream", daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+
+async def aiter_rows(
+    send: Callable[[RowStream], Awaitable[Any]],
+    backlog: int = 32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[Any, None]:
+    """Async version of iter_rows; the request runs as a task"""
+    pending: "asyncio.Queue[Any]" = asyncio.Queue(max(1, backlog))
+
+    async def deliver(rows: List[Any]) -> None:
+        for row in rows:
+            await pending.put(row)
+
+    async def read() -> None:
+        try:
+            await send(RowStream(deliver, chunk_size))
+        except Exception as e:
+            await pending.put(_Failure(e))
+        else:
+            await pending.put(_END)
+
+    task = asyncio.ensure_future(read())
+    try:
+        while True:
+            item = await pending.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
+
@@ -0,0 +1,162 @@
+"""Connect/read timeouts, per-endpoint overrides and per-call deadlines.
+
+A timeout is either one number of seconds used for both connecting and
+reading, or a (connect, read) tuple; None means no limit.
+
+A deadline bounds everything done inside a with block, retries and calls
+made by other client methods included:
+
+    with deadline(2.0):
+        client.get_checkout_url(reference_id)
+
+Each attempt's socket timeouts are capped at the time left, no retry is
+started that could not begin in time, and once it has passed calls fail with
+DeadlineExceeded without being sent. The deadline lives in a context
+variable, so it follows asyncio tasks and the client's own worker threads;
+pass the Deadline object to deadline() to carry it into threads of your own.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from ._http import endpoint_template
+from .exceptions import APIException, DeadlineExceeded
+
+TimeoutValue = Union[None, float, Tuple[Optional[float], Optional[float]]]
+TimeoutPair = Tuple[Optional[float], Optional[float]]
+
+_deadline: "ContextVar[Optional[Deadline]]" = ContextVar("tapsilat_deadline", default=None)
+
+
+def split_timeout(value: TimeoutValue) -> TimeoutPair:
+    """(connect, read) for a timeout given as seconds or as a tuple"""
+    connect, read = value if isinstance(value, tuple) else (value, value)
+    for part in (connect, read):
+        if part is not None and part <= 0:
+            raise ValueError(f"Timeouts must be positive seconds or None, got {value!r}")
+    return connect, read
+
+
+class Timeouts:
+    """The default timeout and per-endpoint overrides.
+
+    Override keys are glob patterns matched against the endpoint template,
+    e.g. "/order/*/export/*" or "/system/*"; the first match wins.
+    """
+
+    def __init__(self, default: TimeoutValue, overrides: Optional[Dict[str, TimeoutValue]] = None):
+        self.default = split_timeout(default)
+        self.overrides = tuple(
+            ("/" + pattern.lstrip("/"), split_timeout(value))
+            for pattern, value in (overrides or {}).items()
+        )
+        self._resolved: Dict[str, TimeoutPair] = {}
+
+    def for_endpoint(self, endpoint: str) -> TimeoutPair:
+        template = endpoint_template(endpoint)
+        timeout = self._resolved.get(template)
+        if timeout is None:
+            timeout = self.default
+            for pattern, value in self.overrides:
+                if fnmatchcase(template, pattern):
+                    timeout = value
+                    break
+            self._resolved[template] = timeout
+        return timeout
+
+
+class Deadline:
+    """A point in time by which API calls must be done"""
+
+    __slots__ = ("seconds", "expires")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires - time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.seconds!r}, remaining={self.remaining():.3f})"
+
+
+@contextmanager
+def deadline(limit: Union[float, Deadline]) -> Iterator[Deadline]:
+    """Bound the API calls made in the block by limit, seconds from now or a Deadline.
+
+    Nested deadlines can only shorten the one in force, never extend it.
+    """
+    if not isinstance(limit, Deadline):
+        limit = Deadline(limit)
+    current = _deadline.get()
+    if current is not None and current.expires <= limit.expires:
+        limit = current
+    token = _deadline.set(limit)
+    try:
+        yield limit
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    current = _deadline.get()
+    return None if current is None else current.remaining()
+
+
+async def acquire_within(semaphore: asyncio.Semaphore) -> None:
+    """Acquire semaphore, raising DeadlineExceeded if the deadline passes first"""
+    current = _deadline.get()
+    if current is None:
+        await semaphore.acquire()
+        return
+    try:
+        await asyncio.wait_for(semaphore.acquire(), max(current.remaining(), 0))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(current.seconds) from None
+
+
+def bound(timeout: TimeoutPair) -> TimeoutPair:
+    """Cap a (connect, read) timeout at the time left before the deadline.
+
+    Raises DeadlineExceeded when the deadline has already passed.
+    """
+    current = _deadline.get()
+    if current is None:
+        return timeout
+    left = current.remaining()
+    if left <= 0:
+        raise DeadlineExceeded(current.seconds)
+    connect, read = timeout
+    return (
+        left if connect is None else min(connect, left),
+        left if read is None else min(read, left),
+    )
+
+
+def stop_retrying(
+    delay: Optional[float], error: APIException, timed_out: bool = False
+) -> Optional[APIException]:
+    """The exception to raise instead of retrying after delay seconds, or None to retry.
+
+    delay is the retry policy's answer, None meaning no retry. The result is
+    DeadlineExceeded carrying error when the deadline is what ends the call:
+    the retry would start too late, or the attempt timed out against it.
+    """
+    current = _deadline.get()
+    if current is None:
+        return error if delay is None else None
+    left = current.remaining()
+    if delay is not None:
+        return None if delay < left else DeadlineExceeded(current.seconds, error)
+    if timed_out and left <= 0:
+        return DeadlineExceeded(current.seconds, error)
+    return error
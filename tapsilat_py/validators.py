@@ -1,32 +1,128 @@
-from typing import List
+from typing import Any, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 from .exceptions import APIException
 
+T = TypeVar('T')
+
+_INSTALLMENTS_FORMAT = 'Enabled installments must be comma-separated integers (e.g., 1,2,3 or 2,4,6)'
+
+# The valid installment values as usually written; anything else goes through int().
+_INSTALLMENT_VALUES = {str(n): n for n in range(1, 13)}
+
+
+def _check_installments(installments_str: Any) -> Tuple[Optional[List[int]], Optional[str]]:
+    # (installments, None) or (None, error message)
+    if not installments_str or not isinstance(installments_str, str):
+        return [1], None
+    installments = []
+    out_of_range = None
+    for part in installments_str.split(','):
+        installment = _INSTALLMENT_VALUES.get(part)
+        if installment is None:
+            try:
+                installment = int(part)
+            except ValueError:
+                return None, _INSTALLMENTS_FORMAT
+            if out_of_range is None and (installment < 1 or installment > 12):
+                out_of_range = installment
+        installments.append(installment)
+    # A malformed value is reported ahead of an out-of-range one.
+    if out_of_range is not None:
+        return None, (
+            f"Installment value '{out_of_range}' is invalid. "
+            "All installment values must be between 1 and 12 (inclusive)."
+        )
+    return installments, None
+
+
+def _check_gsm_number(phone: Any) -> Tuple[Any, Optional[str]]:
+    # (cleaned phone, None) or (None, error message)
+    if not phone:
+        return phone, None
+    if not isinstance(phone, str):
+        return None, f"Invalid phone number format: {phone}"
+
+    # Chained replace() beats str.translate() and re.sub() for strings this short.
+    clean_phone = phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+
+    if not clean_phone.replace('+', '').isdigit():
+        return None, f"Invalid phone number format: {phone}"
+
+    length = len(clean_phone)
+    if clean_phone[0] == '+':
+        if length < 8:
+            return None, f"International phone number too short: {phone}"
+    elif clean_phone[0] != '0':
+        if length < 6:
+            return None, f"Local phone number too short: {phone}"
+    elif clean_phone.startswith('00'):
+        if length < 9:
+            return None, f"International phone number (00 format) too short: {phone}"
+    elif length < 7:
+        return None, f"National phone number too short: {phone}"
+
+    return clean_phone, None
+
+
+class BulkValidation(Generic[T]):
+    """Result of validating many values: per row, the cleaned value or an error.
+
+    values[i] is None where errors[i] holds the message the scalar validator
+    would have raised.
+    """
+
+    __slots__ = ('values', 'errors')
+
+    def __init__(self, values: List[Optional[T]], errors: List[Optional[str]]):
+        self.values = values
+        self.errors = errors
+
+    @property
+    def valid(self) -> List[bool]:
+        """Per-row mask, True where the value passed"""
+        return [error is None for error in self.errors]
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors) - self.errors.count(None)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Tuple[Optional[T], Optional[str]]]:
+        return zip(self.values, self.errors)
+
+    def __repr__(self) -> str:
+        return f'BulkValidation(rows={len(self.values)}, errors={self.error_count})'
+
+
+def _bulk(check: Any, items: Iterable[Any]) -> BulkValidation:
+    values: List[Any] = []
+    errors: List[Optional[str]] = []
+    add_value, add_error = values.append, errors.append
+    for item in items:
+        value, error = check(item)
+        add_value(value)
+        add_error(error)
+    return BulkValidation(values, errors)
+
 
 def validate_installments(installments_str: str) -> List[int]:
     """
     Validate and parse installments string. Returns list of valid installment string
     """
-    if not installments_str:
-        return [1]
-    try:
-        installments = [int(x.strip()) for x in installments_str.split(',')]
-        for installment in installments:
-            if installment < 1 or installment > 12:
-                raise APIException(
-                    status_code=400,
-                    code=0,
-                    error=f"Installment value '{installment}' is invalid. All installment values must be between 1 and 12 (inclusive)."
-                )
-        return installments if installments else [1]
-    except ValueError:
-        raise APIException(
-            status_code=400,
-            code=0,
-            error="Enabled installments must be comma-separated integers (e.g., 1,2,3 or 2,4,6)"
-        )
-    except AttributeError:
-        return [1]
+    installments, error = _check_installments(installments_str)
+    if error is not None:
+        raise APIException(status_code=400, code=0, error=error)
+    return installments
+
+
+def bulk_validate_installments(installments: Iterable[str]) -> 'BulkValidation[List[int]]':
+    """
+    Validate many installments strings without raising.
+    Accepts any iterable, e.g. a list, a generator or a numpy/pandas column.
+    """
+    return _bulk(_check_installments, installments)
 
 
 def validate_gsm_number(phone: str) -> str:
@@ -34,45 +130,15 @@ def validate_gsm_number(phone: str) -> str:
     Validate GSM number format internationally.
     Returns the cleaned phone sequence if valid.
     """
-    if not phone:
-        return phone
-
-    clean_phone = phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-
-    if not clean_phone.replace('+', '').isdigit():
-        raise APIException(
-            status_code=400,
-            code=0,
-            error=f"Invalid phone number format: {phone}"
-        )
+    clean_phone, error = _check_gsm_number(phone)
+    if error is not None:
+        raise APIException(status_code=400, code=0, error=error)
+    return clean_phone
 
-    if clean_phone.startswith('+'):
-        if len(clean_phone) < 8:
-            raise APIException(
-                status_code=400,
-                code=0,
-                error=f"International phone number too short: {phone}"
-            )
-    elif clean_phone.startswith('00'):
-        if len(clean_phone) < 9:
-            raise APIException(
-                status_code=400,
-                code=0,
-                error=f"International phone number (00 format) too short: {phone}"
-            )
-    elif clean_phone.startswith('0'):
-        if len(clean_phone) < 7:
-            raise APIException(
-                status_code=400,
-                code=0,
-                error=f"National phone number too short: {phone}"
-            )
-    else:
-        if len(clean_phone) < 6:
-            raise APIException(
-                status_code=400,
-                code=0,
-                error=f"Local phone number too short: {phone}"
-            )
 
-    return clean_phone
+def bulk_validate_gsm_numbers(phones: Iterable[str]) -> 'BulkValidation[str]':
+    """
+    Validate many GSM numbers without raising.
+    Accepts any iterable, e.g. a list, a generator or a numpy/pandas column.
+    """
+    return _bulk(_check_gsm_number, phones)
@@ -0,0 +1,314 @@
+"""Receiving webhooks: a small asyncio HTTP server that verifies and dispatches them.
+
+    server = WebhookServer(WebhookVerifier(secret), port=8080)
+
+    @server.on("order.completed")
+    async def completed(event):
+        await mark_paid(event.reference_id)
+
+    await server.serve_forever()
+
+Each POST to path is answered as soon as it has been checked: 401 for a bad
+signature, 400 for a body that is not a JSON object, and 202 once the event
+is queued for the handlers. Handlers run afterwards on a fixed number of
+workers, so a slow handler never delays an acknowledgement. When backlog
+events are already waiting, new ones are answered 503 with Retry-After, and
+Tapsilat delivers them again later instead of the queue growing without
+bound.
+
+Handlers are registered per event name, or for every event with "*".
+Coroutine functions run on the event loop; plain functions run in the
+loop's default executor. An exception from a handler goes to on_error, by
+default the loop's exception handler, which logs it. The event was already
+acknowledged by then, so it is not delivered again.
+"""
+import asyncio
+from contextvars import copy_context
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .json_codec import get_codec
+from .responses import WebhookEvent
+from .webhooks import WebhookVerifier
+
+Handler = Callable[[WebhookEvent], Any]
+
+ALL_EVENTS = "*"
+_MAX_HEADERS = 100
+
+
+class _Reject(Exception):
+    """A request answered with status and then the connection closed"""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+class WebhookServer:
+    def __init__(
+        self,
+        verifier: WebhookVerifier,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        path: str = "/webhooks",
+        signature_header: str = "X-Signature",
+        workers: int = 4,
+        backlog: int = 1000,
+        max_body_size: int = 1024 * 1024,
+        read_timeout: float = 10.0,
+        json_codec: Any = "stdlib",
+        on_error: Optional[Callable[[WebhookEvent, BaseException], Any]] = None,
+    ):
+        """
+        verifier: checks the signature of each request
+        signature_header: request header carrying the "sha256=<hex>" signature
+        workers: events handled at once
+        backlog: events waiting for a worker before requests are answered 503
+        max_body_size: larger requests are answered 413
+        read_timeout: seconds a client gets to send a whole request
+        on_error: called with the event and the exception when a handler fails
+        """
+        self.verifier = verifier
+        self.host = host
+        self.path = path
+        self.signature_header = signature_header.lower()
+        self.workers = max(1, workers)
+        self.backlog = max(1, backlog)
+        self.max_body_size = max_body_size
+        self.read_timeout = read_timeout
+        self.json_codec = get_codec(json_codec)
+        self.on_error = on_error
+        self._port = port
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue: Optional["asyncio.Queue[Tuple[WebhookEvent, List[Handler]]]"] = None
+        self._workers: List["asyncio.Future[None]"] = []
+        self._connections: set = set()
+        self.received = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.shed = 0
+        self.handled = 0
+        self.failed = 0
+
+    def on(self, event: str, handler: Optional[Handler] = None) -> Any:
+        """Register handler for event ("*" for all); without handler, return a decorator"""
+        if handler is None:
+            def register(handler: Handler) -> Handler:
+                self.on(event, handler)
+                return handler
+
+            return register
+        self._handlers.setdefault(event, []).append(handler)
+        return handler
+
+    @property
+    def port(self) -> int:
+        """The port listened on; useful after starting with port=0"""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    async def __aenter__(self) -> "WebhookServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start listening and start the workers"""
+        if self._server is not None:
+            return
+        self._queue = asyncio.Queue(self.backlog)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._serve, self.host, self._port)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await self.stop()
+
+    async def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stop listening, then wait for the workers to handle the queued events.
+
+        Returns False if timeout passed first; the remaining events are dropped.
+        """
+        server = self._server
+        if server is None:
+            return True
+        self._server = None
+        server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await server.wait_closed()
+        drained = True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            drained = False
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        return drained
+
+    def stats(self) -> Dict[str, int]:
+        """queued: events waiting for a worker; shed: requests answered 503"""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "received": self.received,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "handled": self.handled,
+            "failed": self.failed,
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader, self.max_body_size), self.read_timeout
+                    )
+                except _Reject as e:
+                    writer.write(_response(e.status, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                status = self._accept(method, target, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    def _accept(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> int:
+        if target.split("?", 1)[0] != self.path:
+            return 404
+        if method != "POST":
+            return 405
+        self.received += 1
+        if not self.verifier.verify(body, headers.get(self.signature_header, "")):
+            self.rejected += 1
+            return 401
+        try:
+            data = self.json_codec.loads(body)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            self.rejected += 1
+            return 400
+        event = WebhookEvent(data)
+        handlers = self._handlers.get(event.name or "", []) + self._handlers.get(ALL_EVENTS, [])
+        if handlers:
+            try:
+                self._queue.put_nowait((event, handlers))
+            except asyncio.QueueFull:
+                self.shed += 1
+                return 503
+        self.accepted += 1
+        return 202
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            event, handlers = await self._queue.get()
+            try:
+                for handler in handlers:
+                    try:
+                        if asyncio.iscoroutinefunction(handler):
+                            await handler(event)
+                        else:
+                            await loop.run_in_executor(None, copy_context().run, handler, event)
+                    except Exception as e:
+                        self.failed += 1
+                        self._report(event, e)
+                    else:
+                        self.handled += 1
+            finally:
+                self._queue.task_done()
+
+    def _report(self, event: WebhookEvent, error: Exception) -> None:
+        if self.on_error is not None:
+            try:
+                self.on_error(event, error)
+                return
+            except Exception as e:
+                error = e
+        asyncio.get_running_loop().call_exception_handler(
+            {"message": f"Webhook handler failed for {event.name!r} event", "exception": error}
+        )
+
+
+async def _read_request(
+    reader: asyncio.StreamReader, max_body_size: int
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    # None when the client closed the connection between requests.
+    try:
+        line = await reader.readline()
+    except ValueError:  # longer than the stream's limit
+        raise _Reject(431) from None
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise _Reject(400) from None
+
+    headers: Dict[str, str] = {}
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise _Reject(431) from None
+        if line in (b"\r\n", b"\n"):
+            break
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        if len(headers) >= _MAX_HEADERS:
+            raise _Reject(431)
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise _Reject(400)
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise _Reject(411)
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise _Reject(400) from None
+    if length < 0:
+        raise _Reject(400)
+    if length > max_body_size:
+        raise _Reject(413)
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _response(status: int, keep_alive: bool) -> bytes:
+    head = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Length: 0",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    if status == 503:
+        head.append("Retry-After: 1")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
@@ -0,0 +1,111 @@
+"""Verifying webhook signatures at high volume.
+
+Tapsilat signs each webhook body with HMAC-SHA256 under the webhook secret
+and sends "sha256=<hex digest>". TapsilatAPI.verify_webhook checks one
+request at a time; a WebhookVerifier keys the HMAC once per secret and
+then only hashes each body:
+
+    verifier = WebhookVerifier(current_secret, previous_secret)
+    if not verifier.verify(request_body, signature_header):
+        ...
+
+Bodies can be bytes, bytearray or memoryview and are hashed in place, so
+the raw request body can be passed as read. During a secret rotation pass
+both secrets; signatures under either are accepted until the old one is
+removed.
+"""
+import hashlib
+import hmac
+import threading
+from functools import lru_cache
+from typing import Tuple, Union
+
+Payload = Union[bytes, bytearray, memoryview, str]
+
+_PREFIX = b"sha256="
+_BLOCK_SIZE = hashlib.sha256().block_size
+_INNER_PAD = bytes(x ^ 0x36 for x in range(256))
+_OUTER_PAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def _as_bytes(value: Union[str, bytes]) -> bytes:
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+class _KeyedHMAC:
+    """HMAC-SHA256 with the key already absorbed into its inner and outer hashes"""
+
+    __slots__ = ("secret", "_inner", "_outer")
+
+    def __init__(self, secret: bytes):
+        self.secret = secret
+        key = secret if len(secret) <= _BLOCK_SIZE else hashlib.sha256(secret).digest()
+        key = key.ljust(_BLOCK_SIZE, b"\0")
+        self._inner = hashlib.sha256(key.translate(_INNER_PAD))
+        self._outer = hashlib.sha256(key.translate(_OUTER_PAD))
+
+    def hexdigest(self, payload: Union[bytes, bytearray, memoryview]) -> bytes:
+        inner = self._inner.copy()
+        inner.update(payload)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return outer.hexdigest().encode("ascii")
+
+
+class WebhookVerifier:
+    """Checks webhook signatures against one or more active secrets.
+
+    secrets: the current secret first, then any still accepted during a
+    rotation. sign() uses the first.
+    """
+
+    def __init__(self, *secrets: Union[str, bytes]):
+        if not secrets:
+            raise ValueError("WebhookVerifier needs at least one secret")
+        self._lock = threading.Lock()
+        self._keys: Tuple[_KeyedHMAC, ...] = tuple(_KeyedHMAC(_as_bytes(s)) for s in secrets)
+
+    def verify(self, payload: Payload, signature: Union[str, bytes]) -> bool:
+        """Whether signature ("sha256=<hex>") is valid for payload under any secret"""
+        if isinstance(signature, str):
+            try:
+                signature = signature.encode("ascii")
+            except UnicodeEncodeError:
+                return False
+        if not signature.startswith(_PREFIX):
+            return False
+        given = signature[len(_PREFIX):]
+        if isinstance(payload, str):
+            payload = payload.encode()
+        for key in self._keys:
+            # Constant time per secret; only which secret matched can leak.
+            if hmac.compare_digest(key.hexdigest(payload), given):
+                return True
+        return False
+
+    def sign(self, payload: Payload) -> str:
+        """The signature header value for payload under the current secret"""
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return (_PREFIX + self._keys[0].hexdigest(payload)).decode("ascii")
+
+    def add_secret(self, secret: Union[str, bytes], current: bool = True) -> None:
+        """Start accepting secret; as the current one (used by sign) unless current=False"""
+        key = _KeyedHMAC(_as_bytes(secret))
+        with self._lock:
+            self._keys = (key,) + self._keys if current else self._keys + (key,)
+
+    def remove_secret(self, secret: Union[str, bytes]) -> None:
+        """Stop accepting secret, e.g. once a rotation is complete"""
+        secret = _as_bytes(secret)
+        with self._lock:
+            keys = tuple(key for key in self._keys if key.secret != secret)
+            if not keys:
+                raise ValueError("Cannot remove the last webhook secret")
+            self._keys = keys
+
+
+@lru_cache(maxsize=16)
+def _verifier_for(secret: Union[str, bytes]) -> WebhookVerifier:
+    """The verifier TapsilatAPI.verify_webhook uses for secret, kept between calls"""
+    return WebhookVerifier(secret)
@@ -0,0 +1,110 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class StubAPIServer:
+    """Local HTTP/1.1 stand-in for the Tapsilat API.
+
+    Routes map (method, path) to a response: a dict is sent as JSON, bytes as-is,
+    and a callable receives the recorded request and returns
+    (status, headers, body).
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def route(self, method, path, response=None, status=200, headers=None):
+        self.routes[(method, "/api/v1" + path)] = (response, status, headers or {})
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes; without this Nagle's
+                # algorithm stalls every keep-alive response on the client's delayed ACK.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, format, *args):
+                pass
+
+            def handle(self):
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass  # the client gave up first, e.g. on a timeout
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = {
+                    "method": self.command,
+                    "path": parts.path,
+                    "query": parse_qs(parts.query),
+                    "headers": dict(self.headers),
+                    "body": self.rfile.read(length) if length else b"",
+                }
+                with server._lock:
+                    server.requests.append(request)
+                    server.connections.add(self.client_address)
+
+                route = server.routes.get((self.command, parts.path))
+                if route is None:
+                    status, headers, body = 404, {}, b'{"code": 404, "error": "not found"}'
+                else:
+                    response, status, headers = route
+                    if callable(response):
+                        status, headers, body = response(request)
+                    elif isinstance(response, bytes):
+                        body = response
+                    else:
+                        body = json.dumps(response if response is not None else {}).encode()
+
+                self.send_response(status)
+                headers = dict(headers)
+                headers.setdefault("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+        return Handler
+
+
+@pytest.fixture
+def stub_server():
+    server = StubAPIServer().start()
+    yield server
+    server.stop()
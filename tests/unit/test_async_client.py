@@ -0,0 +1,289 @@
+import asyncio
+import gzip
+import inspect
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tapsilat_py._async_http import ProtocolError, _iter_body
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.models import (
+    BuyerDTO,
+    FileResponse,
+    OrderCreateDTO,
+    OrderResponse,
+    RefundOrderDTO,
+)
+from tapsilat_py.retry import RetryPolicy
+
+
+def _public_methods(cls):
+    return {
+        name: member
+        for name, member in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_")
+    }
+
+
+def test_async_client_mirrors_every_sync_method():
+    sync_methods = _public_methods(TapsilatAPI)
+    async_methods = _public_methods(AsyncTapsilatAPI)
+
+    for name, sync_method in sync_methods.items():
+        assert name in async_methods, f"AsyncTapsilatAPI is missing {name}"
+        async_method = async_methods[name]
+        assert (
+            inspect.signature(async_method).parameters
+            == inspect.signature(sync_method).parameters
+        ), name
+        if name.startswith("iter_"):
+            assert inspect.isasyncgenfunction(async_method), name
+        elif name != "verify_webhook":
+            assert inspect.iscoroutinefunction(async_method), name
+
+
+def test_get_order_wraps_response():
+    client = AsyncTapsilatAPI()
+    client._make_request = AsyncMock(return_value={"reference_id": "ref-1", "checkout_url": "url"})
+
+    result = asyncio.run(client.get_order("ref-1"))
+
+    client._make_request.assert_awaited_once_with("GET", "/order/ref-1")
+    assert isinstance(result, OrderResponse)
+    assert result.reference_id == "ref-1"
+
+
+def test_get_checkout_url_awaits_get_order():
+    client = AsyncTapsilatAPI()
+    client._make_request = AsyncMock(return_value={"checkout_url": "https://checkout"})
+
+    assert asyncio.run(client.get_checkout_url("ref-1")) == "https://checkout"
+
+
+def test_create_order_validates_and_posts(stub_server):
+    stub_server.route("POST", "/order/create", {"reference_id": "ref-1", "order_id": "o-1"})
+    order = OrderCreateDTO(
+        amount=100,
+        currency="TRY",
+        locale="tr",
+        buyer=BuyerDTO(name="John", surname="Doe", gsm_number="+90 555 123-45-67"),
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI("test_key", base_url=stub_server.base_url) as client:
+            return await client.create_order(order)
+
+    response = asyncio.run(run())
+
+    assert response.order_id == "o-1"
+    sent = stub_server.requests[0]
+    assert sent["headers"]["Authorization"] == "Bearer test_key"
+    assert json.loads(sent["body"])["buyer"]["gsm_number"] == "+905551234567"
+
+
+def test_error_response_is_mapped_to_api_exception(stub_server):
+    stub_server.route(
+        "GET", "/order/missing/status", {"code": 101, "error": "order not found"}, status=404
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI("test_key", base_url=stub_server.base_url) as client:
+            await client.get_order_status("missing")
+
+    with pytest.raises(APIException) as e:
+        asyncio.run(run())
+
+    assert e.value.status_code == 404
+    assert e.value.code == 101
+    assert e.value.error == "order not found"
+
+
+def test_connection_error_is_mapped_to_api_exception():
+    async def run():
+        client = AsyncTapsilatAPI(
+            base_url="http://127.0.0.1:9/api/v1", retry_policy=RetryPolicy(max_retries=0)
+        )
+        await client.get_order_status("ref-1")
+
+    with pytest.raises(APIException) as e:
+        asyncio.run(run())
+
+    assert e.value.status_code == 0
+    assert e.value.code == -1
+
+
+def test_query_params_skip_empty_values(stub_server):
+    stub_server.route("GET", "/order/list", {"rows": []})
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.get_order_list(page=2, per_page=5, buyer_id="b-1")
+
+    asyncio.run(run())
+
+    assert stub_server.requests[0]["query"] == {
+        "page": ["2"],
+        "per_page": ["5"],
+        "buyer_id": ["b-1"],
+    }
+
+
+def test_gzip_response_is_decoded(stub_server):
+    body = gzip.compress(json.dumps({"status": "paid"}).encode())
+    stub_server.route(
+        "GET",
+        "/order/ref-1/status",
+        lambda request: (200, {"Content-Encoding": "gzip"}, body),
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.get_order_status("ref-1")
+
+    assert asyncio.run(run()) == {"status": "paid"}
+
+
+def test_raw_response_returns_file_response(stub_server):
+    stub_server.route(
+        "GET",
+        "/order/ref-1/export/pdf",
+        lambda request: (
+            200,
+            {"Content-Disposition": 'attachment; filename="ref-1.pdf"'},
+            b"%PDF-1.4",
+        ),
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.get_order_pdf("ref-1")
+
+    result = asyncio.run(run())
+
+    assert isinstance(result, FileResponse)
+    assert result.filename == "ref-1.pdf"
+    assert result.content == b"%PDF-1.4"
+
+
+def test_concurrent_requests_share_pooled_connections(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", {"status": "paid"})
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url, pool_maxsize=8) as client:
+            return await asyncio.gather(
+                *(client.get_order_status("ref-1") for _ in range(200))
+            )
+
+    results = asyncio.run(run())
+
+    assert results == [{"status": "paid"}] * 200
+    assert len(stub_server.connections) <= 8
+
+
+def test_max_concurrency_caps_requests_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def request(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        raise ConnectionError("offline")
+
+    async def run():
+        client = AsyncTapsilatAPI(max_concurrency=5, retry_policy=RetryPolicy(max_retries=0))
+        client._pool.request = request
+        return await asyncio.gather(
+            *(client.get_order_status("ref-1") for _ in range(50)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, APIException) for r in results)
+    assert peak == 5
+
+
+def test_chunked_body_is_reassembled():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'7\r\n{"rows"\r\n5;ext=1\r\n: []}\r\n0\r\nX-Trailer: 1\r\n\r\n')
+        reader.feed_eof()
+        headers = {"transfer-encoding": "chunked"}
+        return b"".join([chunk async for chunk in _iter_body(reader, "GET", 200, headers)])
+
+    assert asyncio.run(run()) == b'{"rows": []}'
+
+
+@pytest.mark.parametrize("length", ["ten", "-1"])
+def test_malformed_content_length_is_a_protocol_error(length):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"{}")
+        reader.feed_eof()
+        headers = {"content-length": length}
+        return [chunk async for chunk in _iter_body(reader, "GET", 200, headers)]
+
+    with pytest.raises(ProtocolError):
+        asyncio.run(run())
+
+
+def test_corrupt_gzip_body_raises_api_exception(stub_server):
+    stub_server.route(
+        "GET",
+        "/order/ref-1/status",
+        lambda request: (200, {"Content-Encoding": "gzip"}, b"not gzip"),
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url=stub_server.base_url, retry_policy=RetryPolicy(max_retries=0)
+        ) as client:
+            return await client.get_order_status("ref-1")
+
+    with pytest.raises(APIException):
+        asyncio.run(run())
+
+
+def _dropping_server(requests):
+    """Answers the first request on each connection, then reads the next one and hangs up"""
+
+    async def handle(reader, writer):
+        for answered in (True, False):
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode("latin-1").split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            requests.append(head.split(b" ", 1)[0].decode())
+            if answered:
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        writer.close()
+
+    return asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_request_the_server_may_have_processed_is_not_sent_again():
+    requests = []
+
+    async def run():
+        server = await _dropping_server(requests)
+        port = server.sockets[0].getsockname()[1]
+        async with AsyncTapsilatAPI(base_url=f"http://127.0.0.1:{port}/api/v1") as client:
+            await client.get_order_status("ref-1")
+            with pytest.raises(APIException):
+                await client.refund_order(RefundOrderDTO(amount=5.0, reference_id="ref-1"))
+            # A GET on a dropped keep-alive connection is sent again on a new one.
+            await client.get_order_status("ref-1")
+            assert await client.get_order_status("ref-1") == {}
+        server.close()
+
+    asyncio.run(run())
+    assert requests.count("POST") == 1
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.models import BuyerDTO, OrderCreateDTO
+
+
+def _order(i, gsm_number="+905551234567"):
+    buyer = BuyerDTO(name="John", surname="Doe", email="john@example.com", gsm_number=gsm_number)
+    return OrderCreateDTO(
+        amount=100 + i, currency="TRY", locale="tr", buyer=buyer, conversation_id=f"conv-{i}"
+    )
+
+
+@pytest.fixture
+def create_route(stub_server):
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def create(request):
+        payload = json.loads(request["body"])
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.01)
+        with lock:
+            in_flight["now"] -= 1
+        if payload["amount"] == 103:
+            return 400, {}, b'{"code": 101, "error": "amount rejected"}'
+        body = {"reference_id": f"ref-{payload['conversation_id']}", "order_id": payload["amount"]}
+        return 200, {}, json.dumps(body).encode()
+
+    stub_server.route("POST", "/order/create", create)
+    stub_server.in_flight = in_flight
+    return stub_server
+
+
+def test_bulk_create_returns_results_in_input_order(create_route):
+    orders = [_order(i) for i in range(12)]
+    orders[5] = _order(5, gsm_number="not-a-number")
+    client = TapsilatAPI(base_url=create_route.base_url)
+
+    results = client.create_orders_bulk(orders, concurrency=4)
+
+    assert [r.index for r in results] == list(range(12))
+    assert [i for i, r in enumerate(results) if not r.ok] == [3, 5]
+    assert results[0].response.reference_id == "ref-conv-0"
+    assert (results[3].error.status_code, results[3].error.error) == (400, "amount rejected")
+    assert results[5].error.error.startswith("Invalid phone number format")
+    # The invalid order is rejected before it is sent.
+    assert len(create_route.requests) == 11
+    assert 1 < create_route.in_flight["max"] <= 4
+    assert len(create_route.connections) <= 4
+    assert results[3].to_dict() == {
+        "index": 3,
+        "error": {"status_code": 400, "code": 101, "error": "amount rejected"},
+    }
+
+
+def test_bulk_create_with_no_orders():
+    assert TapsilatAPI().create_orders_bulk([]) == []
+
+
+def test_async_bulk_create(create_route):
+    async def run():
+        async with AsyncTapsilatAPI(base_url=create_route.base_url) as client:
+            return await client.create_orders_bulk((_order(i) for i in range(6)), concurrency=3)
+
+    results = asyncio.run(run())
+
+    assert [r.response.order_id if r.ok else None for r in results] == [100, 101, 102, None, 104, 105]
+    assert create_route.in_flight["max"] <= 3
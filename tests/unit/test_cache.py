@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.cache import TTLCache
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_value_is_served_from_cache_until_ttl_expires(clock):
+    cache = TTLCache(ttl=60, clock=clock)
+    loader = MagicMock(side_effect=[{"v": 1}, {"v": 2}])
+
+    assert cache.get_or_load("k", loader) == {"v": 1}
+    clock.now += 59
+    assert cache.get_or_load("k", loader) == {"v": 1}
+    clock.now += 2
+    assert cache.get_or_load("k", loader) == {"v": 2}
+
+    assert loader.call_count == 2
+    assert cache.stats() == {
+        "hits": 1,
+        "stale_hits": 0,
+        "misses": 2,
+        "loads": 2,
+        "load_errors": 0,
+        "size": 1,
+    }
+
+
+def test_stale_value_is_served_while_refreshing_in_background(clock):
+    cache = TTLCache(ttl=60, stale_ttl=30, clock=clock)
+    refreshed = threading.Event()
+
+    def reload():
+        refreshed.set()
+        return {"v": 2}
+
+    cache.get_or_load("k", lambda: {"v": 1})
+    clock.now += 70
+
+    assert cache.get_or_load("k", reload) == {"v": 1}
+    assert refreshed.wait(1)
+    for _ in range(100):
+        if cache.loads == 2:
+            break
+        time.sleep(0.01)
+    assert cache.get_or_load("k", reload) == {"v": 2}
+    assert cache.stale_hits == 1
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(1)
+        return {"v": 1}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader)))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"v": 1}] * 10
+    assert cache.misses == 10
+
+
+def test_load_errors_reach_every_waiter_and_are_not_cached():
+    cache = TTLCache()
+    error = APIException(503, -1, "unavailable")
+
+    with pytest.raises(APIException):
+        cache.get_or_load("k", MagicMock(side_effect=error))
+    assert cache.get_or_load("k", lambda: {"v": 1}) == {"v": 1}
+    assert cache.load_errors == 1
+
+
+def test_invalidate(clock):
+    cache = TTLCache(clock=clock)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+
+    cache.invalidate("a")
+    assert cache.get_or_load("a", lambda: 10) == 10
+    assert cache.get_or_load("b", lambda: 20) == 2
+
+    cache.invalidate()
+    assert cache.get_or_load("b", lambda: 20) == 20
+
+
+def test_async_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"v": 1}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load_async("k", loader) for _ in range(20)))
+
+    assert asyncio.run(run()) == [{"v": 1}] * 20
+    assert len(calls) == 1
+
+
+def test_client_without_cache_always_requests():
+    api = TapsilatAPI()
+    api._make_request = MagicMock(return_value={"data": []})
+
+    api.get_system_order_statuses()
+    api.get_system_order_statuses()
+
+    assert api._make_request.call_count == 2
+
+
+def test_client_caches_system_endpoints():
+    cache = TTLCache(ttl=300)
+    api = TapsilatAPI(system_cache=cache)
+    api._make_request = MagicMock(side_effect=lambda method, endpoint: {"endpoint": endpoint})
+
+    for _ in range(3):
+        assert api.get_system_order_statuses() == {"endpoint": "/system/order-statuses"}
+        assert api.get_system_error_codes() == {"endpoint": "/system/error-codes"}
+
+    assert api._make_request.call_count == 2
+    assert cache.hits == 4
+    assert cache.misses == 2
+
+
+def test_async_client_caches_system_endpoints():
+    cache = TTLCache(ttl=300)
+    api = AsyncTapsilatAPI(system_cache=cache)
+    api._make_request = AsyncMock(return_value={"data": []})
+
+    async def run():
+        await asyncio.gather(*(api.get_system_product_types() for _ in range(5)))
+        await api.get_system_product_types()
+
+    asyncio.run(run())
+
+    api._make_request.assert_awaited_once_with("GET", "/system/product-types")
+    assert cache.hits == 1
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException, CircuitOpenError, DeadlineExceeded
+from tapsilat_py.ratelimit import RateLimiter
+from tapsilat_py.retry import RetryPolicy
+from tapsilat_py.timeouts import deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _call(breaker, failed, method="GET", endpoint="/order/ref-1", elapsed=0.0):
+    breaker.record(breaker.acquire(method, endpoint), failed, elapsed)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def transitions():
+    return []
+
+
+@pytest.fixture
+def breaker(clock, transitions):
+    return CircuitBreaker(
+        failure_rate=0.5,
+        minimum_calls=4,
+        window=4,
+        reset_timeout=10,
+        listeners=[lambda *t: transitions.append(t)],
+        clock=clock,
+    )
+
+
+def test_opens_on_failure_rate_and_fails_fast(breaker, transitions):
+    for failed in (False, True, False):
+        _call(breaker, failed)
+    assert breaker.state("order_read") == CLOSED  # below minimum_calls
+
+    _call(breaker, True)
+
+    assert transitions == [("order_read", CLOSED, OPEN)]
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.acquire("GET", "/order/ref-2/status")
+    assert isinstance(e.value, APIException)
+    assert e.value.group == "order_read"
+    assert e.value.retry_after == 10
+    # Other groups are unaffected.
+    _call(breaker, False, "POST", "/order/refund")
+
+
+def test_half_open_probe_closes_or_reopens(breaker, clock, transitions):
+    for _ in range(4):
+        _call(breaker, True)
+    clock.now += 10
+
+    probe = breaker.acquire("GET", "/order/ref-1")
+    assert breaker.state("order_read") == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire("GET", "/order/ref-1")  # one probe at a time
+    breaker.record(probe, True)
+    assert breaker.state("order_read") == OPEN
+
+    clock.now += 10
+    _call(breaker, False)
+
+    assert [t[2] for t in transitions] == [OPEN, HALF_OPEN, OPEN, HALF_OPEN, CLOSED]
+    assert breaker.snapshot()["order_read"] == {"state": CLOSED, "calls": 0, "failure_rate": 0.0}
+
+
+def test_slow_calls_count_as_failures_and_stale_outcomes_are_ignored(clock):
+    breaker = CircuitBreaker(
+        minimum_calls=2, window=2, slow_call_seconds=2, reset_timeout=10, clock=clock
+    )
+    straggler = breaker.acquire("GET", "/system/error-codes")
+    _call(breaker, False, "GET", "/system/error-codes", elapsed=2.5)
+    _call(breaker, False, "GET", "/system/error-codes", elapsed=3.0)
+    assert breaker.state("system") == OPEN
+
+    # A call admitted before the circuit opened does not affect it.
+    breaker.record(straggler, False)
+    assert breaker.state("system") == OPEN
+
+    clock.now += 10
+    probe = breaker.acquire("GET", "/system/error-codes")
+    breaker.release(probe)
+    breaker.release(probe)
+    _call(breaker, False, "GET", "/system/error-codes")
+    assert breaker.state("system") == CLOSED
+
+
+def test_client_fails_fast_while_open(stub_server, breaker):
+    stub_server.route("GET", "/order/ref-1/status", {"error": "down"}, status=503)
+    client = TapsilatAPI(
+        base_url=stub_server.base_url,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=breaker,
+    )
+
+    for _ in range(4):
+        with pytest.raises(APIException) as e:
+            client.get_order_status("ref-1")
+        assert e.value.status_code == 503
+    with pytest.raises(CircuitOpenError):
+        client.get_order_status("ref-1")
+
+    assert len(stub_server.requests) == 4
+
+
+def test_open_circuit_is_checked_before_the_rate_limiter(stub_server, breaker, clock):
+    stub_server.route("GET", "/order/ref-1/status", {"error": "down"}, status=503)
+    client = TapsilatAPI(
+        base_url=stub_server.base_url,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=breaker,
+        rate_limiter=RateLimiter({"order_read": (0.001, 4)}, clock=clock),
+    )
+    for _ in range(4):
+        with pytest.raises(APIException):
+            client.get_order_status("ref-1")
+
+    # The bucket is empty: waiting for a token would outlast the deadline.
+    with deadline(1):
+        with pytest.raises(CircuitOpenError):
+            client.get_order_status("ref-1")
+
+    clock.now += 10
+    with deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            client.get_order_status("ref-1")
+    # The half-open probe given out before the limiter raised was handed back.
+    breaker.release(breaker.acquire("GET", "/order/ref-1"))
+
+
+def test_client_counts_connection_errors(mocker, breaker):
+    mocker.patch("tapsilat_py.client.time.sleep")
+    client = TapsilatAPI(
+        base_url="http://127.0.0.1:9",
+        retry_policy=RetryPolicy(max_retries=5),
+        circuit_breaker=breaker,
+    )
+
+    # Retries are attempts too: the fourth failed attempt opens the circuit and
+    # the retry after it is refused without being sent.
+    with pytest.raises(CircuitOpenError):
+        client.get_order_status("ref-1")
+    assert breaker.snapshot()["order_read"]["state"] == OPEN
+
+
+def test_async_client_records_outcomes(stub_server, breaker, clock):
+    stub_server.route("GET", "/order/ref-1/status", {"error": "down"}, status=500)
+    stub_server.route("GET", "/order/ref-2/status", {"status": "paid"})
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url=stub_server.base_url,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=breaker,
+        ) as client:
+            for _ in range(4):
+                with pytest.raises(APIException):
+                    await client.get_order_status("ref-1")
+            with pytest.raises(CircuitOpenError):
+                await client.get_order_status("ref-2")
+            clock.now += 10
+            return await client.get_order_status("ref-2")
+
+    assert asyncio.run(run()) == {"status": "paid"}
+    assert breaker.state("order_read") == CLOSED
@@ -1,9 +1,4 @@
 import unittest
-from unittest.mock import MagicMock
-import sys
-
-# Mock requests module before importing client
-sys.modules["requests"] = MagicMock()
 
 from tapsilat_py.client import TapsilatAPI
 
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.coalescing import RequestCoalescer, request_key
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.models import CancelOrderDTO, GetUserLimitRequest
+from tapsilat_py.retry import RetryPolicy
+
+
+def _slow(status=200, body=b'{"status": "paid"}', delay=0.1):
+    def handler(request):
+        time.sleep(delay)
+        return status, {}, body
+
+    return handler
+
+
+def _in_threads(count, fn):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_request_key_ignores_param_order():
+    assert request_key("/order/list", {"page": 1, "per_page": 10}, False) == request_key(
+        "/order/list", {"per_page": 10, "page": 1}, False
+    )
+    assert request_key("/order/list", {"page": 1}, False) != request_key("/order/list", {"page": 2}, False)
+
+
+def test_concurrent_identical_gets_share_one_call(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", _slow())
+    coalescer = RequestCoalescer()
+    client = TapsilatAPI(base_url=stub_server.base_url, coalescer=coalescer)
+
+    results = _in_threads(8, lambda: client.get_order_status("ref-1"))
+
+    assert results == [{"status": "paid"}] * 8
+    assert len(stub_server.requests) == 1
+    assert coalescer.stats() == {"requests": 1, "deduplicated": 7}
+
+    client.get_order_status("ref-1")
+    assert len(stub_server.requests) == 2
+
+
+def test_shared_call_failure_reaches_every_caller(stub_server):
+    stub_server.route("GET", "/order/ref-1", _slow(404, b'{"code": 1, "error": "missing"}'))
+    client = TapsilatAPI(base_url=stub_server.base_url, coalescer=RequestCoalescer())
+
+    results = _in_threads(5, lambda: client.get_order("ref-1"))
+
+    assert all(isinstance(r, APIException) and r.error == "missing" for r in results)
+    assert len(stub_server.requests) == 1
+
+
+def test_writes_and_different_reads_are_not_coalesced(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", _slow(delay=0.05))
+    stub_server.route("GET", "/order/ref-2/status", _slow(delay=0.05))
+    stub_server.route("POST", "/order/cancel", _slow(body=b"{}", delay=0.05))
+    coalescer = RequestCoalescer()
+    client = TapsilatAPI(base_url=stub_server.base_url, coalescer=coalescer)
+    calls = [
+        lambda: client.get_order_status("ref-1"),
+        lambda: client.get_order_status("ref-2"),
+        lambda: client.cancel_order(CancelOrderDTO(reference_id="ref-1")),
+        lambda: client.cancel_order(CancelOrderDTO(reference_id="ref-1")),
+    ]
+    counter = iter(range(4))
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            i = next(counter)
+        return calls[i]()
+
+    _in_threads(4, call)
+
+    assert len(stub_server.requests) == 4
+    assert coalescer.deduplicated == 0
+
+
+def test_gets_with_different_bodies_are_not_coalesced(stub_server):
+    def echo(request):
+        time.sleep(0.1)
+        return 200, {}, request["body"]
+
+    stub_server.route("GET", "/organization/limit/user", echo)
+    coalescer = RequestCoalescer()
+    client = TapsilatAPI(base_url=stub_server.base_url, coalescer=coalescer)
+    users = iter(["alice", "bob"])
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            user_id = next(users)
+        return user_id, client.get_organization_limit_user(GetUserLimitRequest(user_id=user_id))
+
+    results = _in_threads(2, call)
+
+    assert all(result["user_id"] == user_id for user_id, result in results)
+    assert len(stub_server.requests) == 2 and coalescer.deduplicated == 0
+    assert request_key("/x", None, False, {"a": 1, "b": 2}) == request_key(
+        "/x", None, False, {"b": 2, "a": 1}
+    )
+
+
+def test_async_identical_gets_share_one_call(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", _slow(delay=0.05))
+    coalescer = RequestCoalescer()
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url, coalescer=coalescer) as client:
+            return await asyncio.gather(*(client.get_order_status("ref-1") for _ in range(10)))
+
+    assert asyncio.run(run()) == [{"status": "paid"}] * 10
+    assert len(stub_server.requests) == 1
+    assert coalescer.deduplicated == 9
+
+
+def test_async_cancelled_caller_does_not_fail_the_others(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", _slow(delay=0.1))
+
+    async def run():
+        client = AsyncTapsilatAPI(
+            base_url=stub_server.base_url,
+            coalescer=RequestCoalescer(),
+            retry_policy=RetryPolicy(max_retries=0),
+        )
+        first = asyncio.ensure_future(client.get_order_status("ref-1"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(client.get_order_status("ref-1"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        await client.close()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    assert asyncio.run(run()) == {"status": "paid"}
+    assert len(stub_server.requests) == 1
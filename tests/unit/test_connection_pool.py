@@ -0,0 +1,80 @@
+import pytest
+
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+
+
+@pytest.fixture
+def status_route(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", {"status": "paid"})
+    return stub_server
+
+
+def test_repeated_calls_reuse_one_connection(status_route):
+    client = TapsilatAPI("test_key", base_url=status_route.base_url)
+
+    for _ in range(5):
+        assert client.get_order_status("ref-1") == {"status": "paid"}
+
+    assert len(status_route.requests) == 5
+    assert len(status_route.connections) == 1
+    client.close()
+
+
+def test_context_manager_closes_pool(status_route):
+    with TapsilatAPI("test_key", base_url=status_route.base_url) as client:
+        client.get_order_status("ref-1")
+        assert client._session is not None
+
+    assert client._session is None
+
+
+def test_client_reconnects_after_close(status_route):
+    client = TapsilatAPI("test_key", base_url=status_route.base_url)
+    client.get_order_status("ref-1")
+    client.close()
+
+    assert client.get_order_status("ref-1") == {"status": "paid"}
+    assert len(status_route.connections) == 2
+    client.close()
+
+
+def test_idle_connections_are_dropped_after_keep_alive_timeout(status_route, mocker):
+    client = TapsilatAPI(
+        "test_key", base_url=status_route.base_url, keep_alive_timeout=30
+    )
+    monotonic = mocker.patch("tapsilat_py.client.time.monotonic", return_value=100.0)
+    client.get_order_status("ref-1")
+    monotonic.return_value = 110.0
+    client.get_order_status("ref-1")
+    assert len(status_route.connections) == 1
+
+    monotonic.return_value = 200.0
+    client.get_order_status("ref-1")
+    assert len(status_route.connections) == 2
+    client.close()
+
+
+def test_pool_settings_are_applied_to_adapter():
+    client = TapsilatAPI("test_key", pool_connections=3, pool_maxsize=7, pool_block=True)
+    adapter = client._get_session().get_adapter("https://panel.tapsilat.dev")
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    client.close()
+
+
+def test_error_responses_are_mapped_through_pooled_session(stub_server):
+    stub_server.route(
+        "GET", "/order/missing/status", {"code": 101, "error": "order not found"}, status=404
+    )
+    client = TapsilatAPI("test_key", base_url=stub_server.base_url)
+
+    with pytest.raises(APIException) as e:
+        client.get_order_status("missing")
+
+    assert e.value.status_code == 404
+    assert e.value.code == 101
+    assert e.value.error == "order not found"
+    client.close()
@@ -0,0 +1,226 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+
+import pytest
+import requests
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.downloads import resolve_path
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.models import DownloadResult
+
+EXPORT = b"%PDF-1.4 " + bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def export_route(stub_server):
+    stub_server.route(
+        "GET",
+        "/order/ref-1/export/pdf",
+        lambda request: (200, {"Content-Disposition": 'attachment; filename="ref-1.pdf"'}, EXPORT),
+    )
+    return stub_server
+
+
+def test_download_streams_to_directory_with_server_filename(export_route, tmp_path):
+    progress = []
+    client = TapsilatAPI(base_url=export_route.base_url)
+
+    result = client.download_order_pdf(
+        "ref-1",
+        tmp_path,
+        chunk_size=8192,
+        progress=lambda written, total: progress.append((written, total)),
+        checksum="sha256",
+    )
+
+    path = tmp_path / "ref-1.pdf"
+    assert result == DownloadResult(
+        filename="ref-1.pdf",
+        size=len(EXPORT),
+        path=str(path),
+        checksum=hashlib.sha256(EXPORT).hexdigest(),
+    )
+    assert path.read_bytes() == EXPORT
+    assert len(progress) == -(-len(EXPORT) // 8192)
+    assert progress[-1] == (len(EXPORT), len(EXPORT))
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_download_to_file_object(export_route):
+    buffer = io.BytesIO()
+    client = TapsilatAPI(base_url=export_route.base_url)
+
+    result = client.download_order_pdf("ref-1", buffer)
+
+    assert buffer.getvalue() == EXPORT
+    assert result.path is None
+    assert result.checksum is None
+
+
+def test_error_response_leaves_no_file(stub_server, tmp_path):
+    stub_server.route("GET", "/order/ref-1/export/excel", {"code": 404, "error": "no order"}, status=404)
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    with pytest.raises(APIException) as e:
+        client.download_order_excel("ref-1", tmp_path / "out.xlsx")
+
+    assert e.value.error == "no order"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_interrupted_download_removes_partial_file(mocker, tmp_path):
+    response = mocker.MagicMock(status_code=200, headers={"Content-Length": "10"})
+
+    def chunks(size):
+        yield b"12345"
+        raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    response.iter_content.side_effect = chunks
+    send = mocker.patch("tapsilat_py.client.requests.Session.request", return_value=response)
+    client = TapsilatAPI()
+
+    with pytest.raises(APIException):
+        client.download_order_pdf("ref-1", tmp_path / "out.pdf")
+
+    assert send.call_count == 1
+    assert send.call_args.kwargs["stream"] is True
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_server_filename_cannot_escape_directory(tmp_path):
+    assert resolve_path(tmp_path, "../../etc/passwd") == str(tmp_path / "passwd")
+    assert resolve_path(tmp_path / "x.pdf", "ignored.pdf") == str(tmp_path / "x.pdf")
+
+
+def test_async_download_streams_gzip_body(stub_server, tmp_path):
+    stub_server.route(
+        "GET",
+        "/order/ref-1/export/excel",
+        lambda request: (
+            200,
+            {"Content-Disposition": 'attachment; filename="ref-1.xlsx"', "Content-Encoding": "gzip"},
+            gzip.compress(EXPORT),
+        ),
+    )
+    progress = []
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.download_order_excel(
+                "ref-1",
+                tmp_path,
+                chunk_size=4096,
+                progress=lambda written, total: progress.append(total),
+                checksum="md5",
+            )
+
+    result = asyncio.run(run())
+
+    assert (tmp_path / "ref-1.xlsx").read_bytes() == EXPORT
+    assert result.size == len(EXPORT)
+    assert result.checksum == hashlib.md5(EXPORT).hexdigest()
+    assert set(progress) == {None}
+
+
+def _export_routes(server, order_ids, missing=()):
+    for order_id in order_ids:
+        for export_format, extension in (("pdf", "pdf"), ("excel", "xlsx")):
+            if order_id in missing:
+                server.route(
+                    "GET",
+                    f"/order/{order_id}/export/{export_format}",
+                    {"code": 404, "error": "order not found"},
+                    status=404,
+                )
+                continue
+            filename = f"{order_id}.{extension}"
+            server.route(
+                "GET",
+                f"/order/{order_id}/export/{export_format}",
+                lambda request, filename=filename: (
+                    200,
+                    {"Content-Disposition": f'attachment; filename="{filename}"'},
+                    filename.encode() * 100,
+                ),
+            )
+
+
+def test_bulk_export_download_returns_manifest(stub_server, tmp_path):
+    order_ids = [f"ord-{i}" for i in range(6)]
+    _export_routes(stub_server, order_ids, missing={"ord-3"})
+    client = TapsilatAPI(base_url=stub_server.base_url)
+    target = tmp_path / "exports"
+
+    manifest = client.download_order_exports(order_ids, str(target), concurrency=3, checksum="sha1")
+
+    assert [(e.order_id, e.format) for e in manifest] == [
+        (order_id, export_format) for order_id in order_ids for export_format in ("pdf", "excel")
+    ]
+    failed = [e for e in manifest if not e.ok]
+    assert [(e.order_id, e.status_code, e.error) for e in failed] == [
+        ("ord-3", 404, "order not found"),
+        ("ord-3", 404, "order not found"),
+    ]
+    for entry in manifest:
+        if entry.ok:
+            assert open(entry.path, "rb").read() == os.path.basename(entry.path).encode() * 100
+            assert entry.checksum is not None
+    assert len(list(target.iterdir())) == 10
+    assert len(stub_server.connections) <= 3
+
+
+def test_bulk_export_gives_every_file_its_own_name(stub_server, tmp_path):
+    def route(order_id, export_format, headers):
+        body = f"{order_id}/{export_format}".encode()
+        stub_server.route(
+            "GET", f"/order/{order_id}/export/{export_format}", lambda request: (200, headers, body)
+        )
+
+    shared = {"Content-Disposition": 'attachment; filename="export.pdf"'}
+    for order_id in ("ord-1", "ord-2", "ord-3"):
+        route(order_id, "pdf", {})
+        route(order_id, "excel", shared)
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    manifest = client.download_order_exports(["ord-1", "ord-2", "ord-3", "ord-1"], str(tmp_path))
+
+    assert all(entry.ok for entry in manifest)
+    names = {os.path.basename(entry.path) for entry in manifest}
+    assert names == {
+        "ord-1.pdf", "ord-1 (2).pdf", "ord-1-export.pdf", "ord-1-export (2).pdf",
+        "ord-2.pdf", "ord-2-export.pdf", "ord-3.pdf", "ord-3-export.pdf",
+    }
+    assert len(list(tmp_path.iterdir())) == 8
+    for entry in manifest:
+        assert open(entry.path, "rb").read() == f"{entry.order_id}/{entry.format}".encode()
+
+
+def test_bulk_export_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        TapsilatAPI().download_order_exports(["ord-1"], str(tmp_path), formats=["csv"])
+
+
+def test_async_bulk_export_download(stub_server, tmp_path):
+    order_ids = ["ord-1", "ord-2", "ord-3"]
+    _export_routes(stub_server, order_ids, missing={"ord-2"})
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.download_order_exports(
+                order_ids, str(tmp_path), formats=["pdf"], concurrency=2
+            )
+
+    manifest = asyncio.run(run())
+
+    assert [(e.order_id, e.ok) for e in manifest] == [("ord-1", True), ("ord-2", False), ("ord-3", True)]
+    assert manifest[0].to_dict() == {
+        "order_id": "ord-1",
+        "format": "pdf",
+        "path": str(tmp_path / "ord-1.pdf"),
+        "size": len(b"ord-1.pdf") * 100,
+    }
@@ -0,0 +1,189 @@
+import asyncio
+import json
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.idempotency import (
+    DONE,
+    IdempotencyKeys,
+    JournalEntry,
+    MemoryJournal,
+    SQLiteJournal,
+    idempotency_key,
+)
+from tapsilat_py.models import RefundOrderDTO
+from tapsilat_py.retry import ALL_METHODS, RetryPolicy
+
+REFUND = RefundOrderDTO(amount=50.0, reference_id="ref-1")
+
+
+def _keys(server):
+    return [r["headers"].get("Idempotency-Key") for r in server.requests]
+
+
+@pytest.fixture
+def flaky_refund(stub_server):
+    """/order/refund fails with the queued statuses, then succeeds"""
+    statuses = []
+
+    def refund(request):
+        if statuses:
+            return statuses.pop(0), {}, b'{"error": "refund failed"}'
+        return 200, {}, json.dumps({"is_success": True, "n": len(stub_server.requests)}).encode()
+
+    stub_server.route("POST", "/order/refund", refund)
+    stub_server.statuses = statuses
+    return stub_server
+
+
+def test_unknown_outcome_reuses_key_and_success_is_not_resent(flaky_refund):
+    flaky_refund.statuses.extend([504])
+    client = TapsilatAPI(
+        base_url=flaky_refund.base_url,
+        retry_policy=RetryPolicy(max_retries=0),
+        idempotency=IdempotencyKeys(match_payload=True),
+    )
+
+    with pytest.raises(APIException):
+        client.refund_order(REFUND)
+    first = client.refund_order(REFUND)
+    again = client.refund_order(REFUND)
+
+    keys = _keys(flaky_refund)
+    assert len(keys) == 2 and keys[0] == keys[1] and keys[0]
+    assert first == again == {"is_success": True, "n": 2}
+
+
+def test_identical_writes_without_a_key_are_all_sent(flaky_refund):
+    flaky_refund.statuses.extend([504])
+    client = TapsilatAPI(
+        base_url=flaky_refund.base_url,
+        retry_policy=RetryPolicy(max_retries=0),
+        idempotency=IdempotencyKeys(),
+    )
+
+    with pytest.raises(APIException):
+        client.refund_order(REFUND)
+    first = client.refund_order(REFUND)  # the outcome was unknown: same key
+    second = client.refund_order(REFUND)  # a second equal partial refund
+
+    keys = _keys(flaky_refund)
+    assert len(keys) == 3 and keys[0] == keys[1] != keys[2]
+    assert (first["n"], second["n"]) == (2, 3)
+
+
+def test_unknown_outcome_is_only_matched_within_retry_window(flaky_refund):
+    flaky_refund.statuses.extend([504])
+    client = TapsilatAPI(
+        base_url=flaky_refund.base_url,
+        retry_policy=RetryPolicy(max_retries=0),
+        idempotency=IdempotencyKeys(retry_window=0),
+    )
+
+    with pytest.raises(APIException):
+        client.refund_order(REFUND)
+    client.refund_order(REFUND)
+
+    assert len(set(_keys(flaky_refund))) == 2
+
+
+def test_key_is_kept_across_retries_and_dropped_on_rejection(flaky_refund):
+    flaky_refund.statuses.extend([503, 422])
+    client = TapsilatAPI(
+        base_url=flaky_refund.base_url,
+        retry_policy=RetryPolicy(max_retries=1, backoff_factor=0, methods=ALL_METHODS),
+        idempotency=IdempotencyKeys(),
+    )
+
+    with pytest.raises(APIException) as e:
+        client.refund_order(REFUND)
+    assert e.value.status_code == 422
+    client.refund_order(REFUND)
+
+    keys = _keys(flaky_refund)
+    assert keys[0] == keys[1] != keys[2]
+
+
+def test_explicit_keys_separate_identical_writes(flaky_refund):
+    client = TapsilatAPI(base_url=flaky_refund.base_url, idempotency=IdempotencyKeys())
+
+    with idempotency_key("ticket-1"):
+        client.refund_order(REFUND)
+    with idempotency_key("ticket-2"):
+        client.refund_order(REFUND)
+    with idempotency_key("ticket-1"):
+        client.refund_order(REFUND)
+
+    assert _keys(flaky_refund) == ["ticket-1", "ticket-2"]
+
+
+def test_only_write_endpoints_get_keys(stub_server):
+    stub_server.route("GET", "/order/ref-1/status", {"status": "paid"})
+    client = TapsilatAPI(base_url=stub_server.base_url, idempotency=IdempotencyKeys())
+
+    client.get_order_status("ref-1")
+
+    assert _keys(stub_server) == [None]
+
+
+def test_expired_entries_get_new_keys(flaky_refund):
+    client = TapsilatAPI(base_url=flaky_refund.base_url, idempotency=IdempotencyKeys(ttl=0))
+
+    with idempotency_key("ticket-1"):
+        client.refund_order(REFUND)
+    with idempotency_key("ticket-1"):
+        client.refund_order(REFUND)
+
+    # Forgotten, so sent again rather than answered from the journal.
+    assert _keys(flaky_refund) == ["ticket-1", "ticket-1"]
+
+
+def test_sqlite_journal_survives_restart(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = SQLiteJournal(path)
+    pending = journal.claim(JournalEntry("w1", "key-1"))
+    journal.put(JournalEntry("w2", "key-2", DONE, {"order_id": 7}))
+    journal.close()
+
+    reopened = SQLiteJournal(path)
+    assert reopened.claim(JournalEntry("w1", "other")).key == pending.key == "key-1"
+    done = reopened.claim(JournalEntry("w2", "other"))
+    assert (done.state, done.result) == (DONE, {"order_id": 7})
+    assert reopened.purge(before=done.created + 1) == 2
+
+
+def test_memory_journal_evicts_least_recently_used():
+    journal = MemoryJournal(maxsize=2)
+    for name in ("a", "b"):
+        journal.claim(JournalEntry(name, name))
+    journal.claim(JournalEntry("a", "ignored"))
+    journal.claim(JournalEntry("c", "c"))
+
+    assert journal.claim(JournalEntry("a", "new")).key == "a"
+    assert journal.claim(JournalEntry("b", "new")).key == "new"
+
+
+def test_async_client_reuses_key_after_crash(flaky_refund, tmp_path):
+    flaky_refund.statuses.extend([502])
+    path = str(tmp_path / "journal.db")
+
+    async def refund():
+        async with AsyncTapsilatAPI(
+            base_url=flaky_refund.base_url,
+            retry_policy=RetryPolicy(max_retries=0),
+            idempotency=IdempotencyKeys(SQLiteJournal(path)),
+        ) as client:
+            return await client.refund_order(REFUND)
+
+    with pytest.raises(APIException):
+        asyncio.run(refund())
+    # A new process with a fresh client and journal instance.
+    assert asyncio.run(refund())["is_success"] is True
+    # Once it succeeded, an identical refund without a key is a new one.
+    assert asyncio.run(refund())["n"] == 3
+
+    keys = _keys(flaky_refund)
+    assert len(keys) == 3 and keys[0] == keys[1] != keys[2]
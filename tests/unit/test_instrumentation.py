@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from tapsilat_py import MetricsCollector
+from tapsilat_py._http import endpoint_template
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.instrumentation import Hooks, LatencyHistogram
+from tapsilat_py.models import RefundOrderDTO
+from tapsilat_py.retry import RetryPolicy
+
+
+@pytest.mark.parametrize(
+    "endpoint, template",
+    [
+        ("/order/ref-1", "/order/{reference_id}"),
+        ("/order/list", "/order/list"),
+        ("/order/ref-1/status", "/order/{reference_id}/status"),
+        ("/order/conversation/c-1", "/order/conversation/{conversation_id}"),
+        ("/order/term/refund", "/order/term/refund"),
+        ("/orders/42/vpos-query", "/orders/{id}/vpos-query"),
+        ("/submerchants/7/suborganization", "/submerchants/{id}/suborganization"),
+        ("/system/error-codes", "/system/error-codes"),
+    ],
+)
+def test_endpoint_template(endpoint, template):
+    assert endpoint_template(endpoint) == template
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    histogram = LatencyHistogram((10, 100, 1000))
+    for ms in [1] * 90 + [50] * 9 + [700]:
+        histogram.record(ms)
+
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.95) == 100
+    assert histogram.percentile(0.999) == 700
+    assert histogram.snapshot()["buckets"] == {"10": 90, "100": 9, "1000": 1, "+Inf": 0}
+
+
+def test_hooks_require_a_known_method():
+    with pytest.raises(TypeError):
+        Hooks([object()])
+    assert not Hooks()
+
+
+def test_hooks_see_every_attempt_and_can_add_headers(stub_server, mocker):
+    mocker.patch("tapsilat_py.client.time.sleep")
+    replies = [(503, {}, b'{"error": "busy"}'), (200, {}, b'{"status": "paid"}')]
+    stub_server.route("GET", "/order/ref-1/status", lambda request: replies.pop(0))
+    seen = []
+    tracer = SimpleNamespace(
+        before_request=lambda event: event.headers.update({"X-Trace-Id": "t-1"}),
+        after_response=lambda event: seen.append((event.template, event.attempt, event.status_code)),
+    )
+    client = TapsilatAPI(base_url=stub_server.base_url, hooks=[tracer])
+
+    client.get_order_status("ref-1")
+
+    assert seen == [
+        ("/order/{reference_id}/status", 1, 503),
+        ("/order/{reference_id}/status", 2, 200),
+    ]
+    assert all(r["headers"]["X-Trace-Id"] == "t-1" for r in stub_server.requests)
+
+
+def test_metrics_collector_snapshot(stub_server, mocker):
+    mocker.patch("tapsilat_py.client.time.sleep")
+    replies = [(503, {}, b'{"error": "busy"}')]
+    stub_server.route(
+        "GET",
+        "/order/ref-1/status",
+        lambda request: replies.pop() if replies else (200, {}, b'{"status": "paid"}'),
+    )
+    stub_server.route("GET", "/order/ref-2/status", {"status": "pending"})
+    stub_server.route("POST", "/order/refund", {"code": 7, "error": "too much"}, status=400)
+    metrics = MetricsCollector()
+    client = TapsilatAPI(base_url=stub_server.base_url)
+    client.hooks.add(metrics)
+
+    client.get_order_status("ref-1")
+    client.get_order_status("ref-2")
+    with pytest.raises(APIException):
+        client.refund_order(RefundOrderDTO(amount=10, reference_id="ref-1"))
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == ["GET /order/{reference_id}/status", "POST /order/refund"]
+    status = snapshot["GET /order/{reference_id}/status"]
+    assert status["requests"] == 3
+    assert status["retries"] == 1
+    assert status["status_codes"] == {503: 1, 200: 2}
+    assert status["latency_ms"]["count"] == 3
+    assert status["response_bytes"] == len(b'{"error": "busy"}') + len(b'{"status": "paid"}') + len(
+        b'{"status": "pending"}'
+    )
+    refund = snapshot["POST /order/refund"]
+    assert refund["status_codes"] == {400: 1}
+    assert refund["request_bytes"] > 0
+
+    client.hooks.remove(metrics)
+    client.get_order_status("ref-2")
+    assert metrics.snapshot()["GET /order/{reference_id}/status"]["requests"] == 3
+
+
+def test_metrics_count_connection_errors():
+    metrics = MetricsCollector()
+
+    async def run():
+        client = AsyncTapsilatAPI(
+            base_url="http://127.0.0.1:9", hooks=[metrics], retry_policy=RetryPolicy(max_retries=0)
+        )
+        with pytest.raises(APIException):
+            await client.get_order("ref-1")
+        await client.close()
+
+    asyncio.run(run())
+
+    stats = metrics.snapshot()["GET /order/{reference_id}"]
+    assert stats["requests"] == 1
+    assert list(stats["errors"].values()) == [1]
+    assert stats["latency_ms"]["count"] == 1
+
+
+def test_failed_writes_count_their_request_bytes():
+    metrics = MetricsCollector()
+    refund = RefundOrderDTO(amount=5.0, reference_id="ref-1")
+    client = TapsilatAPI(
+        base_url="http://127.0.0.1:9", hooks=[metrics], retry_policy=RetryPolicy(max_retries=0)
+    )
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url="http://127.0.0.1:9", hooks=[metrics], retry_policy=RetryPolicy(max_retries=0)
+        ) as client:
+            with pytest.raises(APIException):
+                await client.refund_order(refund)
+
+    with pytest.raises(APIException):
+        client.refund_order(refund)
+    sync_bytes = metrics.snapshot()["POST /order/refund"]["request_bytes"]
+    asyncio.run(run())
+
+    assert sync_bytes > 0
+    assert metrics.snapshot()["POST /order/refund"]["request_bytes"] == 2 * sync_bytes
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import math
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.json_codec import OrjsonCodec, StdlibCodec, get_codec
+from tapsilat_py.models import RefundOrderDTO
+from tapsilat_py.retry import ALL_METHODS, RetryPolicy
+
+PAYLOAD = {"amount": 10.5, "name": "Çiğdem", "items": [{"id": 1, "ok": True, "note": None}]}
+
+
+class CountingCodec(StdlibCodec):
+    def __init__(self):
+        super().__init__()
+        self.dumped = 0
+        self.loaded = 0
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+def test_get_codec():
+    assert isinstance(get_codec(), StdlibCodec)
+    assert isinstance(get_codec(None), StdlibCodec)
+    codec = CountingCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("simplejson")
+
+
+def test_stdlib_codec_writes_compact_json_and_refuses_nan():
+    codec = StdlibCodec()
+    body = codec.dumps(PAYLOAD)
+    assert body == json.dumps(PAYLOAD, separators=(",", ":")).encode()
+    assert codec.loads(body) == PAYLOAD
+    with pytest.raises(ValueError):
+        codec.dumps({"amount": math.nan})
+
+
+def test_orjson_codec_matches_stdlib():
+    pytest.importorskip("orjson")
+    codec = get_codec("auto")
+    assert isinstance(codec, OrjsonCodec)
+    body = codec.dumps({**PAYLOAD, 7: "int key"})
+    assert StdlibCodec().loads(body) == {**PAYLOAD, "7": "int key"}
+    assert codec.loads(StdlibCodec().dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_payload_is_encoded_once_across_retries(stub_server):
+    replies = [(503, {}, b'{"error": "busy"}'), (200, {}, b'{"is_success": true}')]
+    stub_server.route("POST", "/order/refund", lambda request: replies.pop(0))
+    codec = CountingCodec()
+    client = TapsilatAPI(
+        base_url=stub_server.base_url,
+        retry_policy=RetryPolicy(max_retries=1, backoff_factor=0, methods=ALL_METHODS),
+        json_codec=codec,
+    )
+
+    assert client.refund_order(RefundOrderDTO(amount=5.0, reference_id="ref-1")) == {
+        "is_success": True
+    }
+
+    first, second = stub_server.requests
+    assert first["body"] == second["body"] == b'{"amount":5.0,"reference_id":"ref-1"}'
+    assert first["headers"]["Content-Type"] == "application/json"
+    assert (codec.dumped, codec.loaded) == (1, 1)
+
+
+def test_async_client_uses_the_codec(stub_server):
+    stub_server.route("POST", "/order/refund", {"is_success": True})
+    codec = CountingCodec()
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url, json_codec=codec) as client:
+            return await client.refund_order(RefundOrderDTO(amount=5.0, reference_id="ref-1"))
+
+    assert asyncio.run(run()) == {"is_success": True}
+    assert stub_server.requests[0]["body"] == b'{"amount":5.0,"reference_id":"ref-1"}'
+    assert (codec.dumped, codec.loaded) == (1, 1)
+
+
+def test_body_that_is_not_json_raises_api_exception(stub_server):
+    html = b"<html>Bad gateway</html>"
+    stub_server.route("GET", "/order/ref-1/status", html, headers={"Content-Type": "text/html"})
+
+    with pytest.raises(APIException) as sync_error:
+        TapsilatAPI(base_url=stub_server.base_url).get_order_status("ref-1")
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            await client.get_order_status("ref-1")
+
+    with pytest.raises(APIException) as async_error:
+        asyncio.run(run())
+    for error in (sync_error.value, async_error.value):
+        assert (error.status_code, error.code) == (0, -1)
@@ -1,4 +1,11 @@
+import copy
+import pickle
+from dataclasses import fields, is_dataclass, replace
+
+import pytest
+
 from tapsilat_py.models import (
+    _asdict_factory,
     BasketItemDTO,
     BasketItemPayerDTO,
     BillingAddressDTO,
@@ -11,7 +18,11 @@ from tapsilat_py.models import (
     OrderPFSubMerchantDTO,
     PaymentTermDTO,
     OrderConsent,
-    MetadataDTO
+    MetadataDTO,
+    RefundOrderDTO,
+    SubmerchantCreateDTO,
+    SubmerchantUpdateDTO,
+    SubscriptionGetRequest,
 )
 
 def test_buyer_dto_all_fields():
@@ -198,3 +209,120 @@ def test_order_create_dto_all_fields():
     assert data["amount"] == 100.0
     assert data["currency"] == "TRY"
     assert data["order_cards"][0]["card_sequence"] == 1
+
+
+def _reflective_asdict(data):
+    """The field-by-field conversion to_dict() used before serializers were generated"""
+    if not is_dataclass(data):
+        return data
+
+    def convert_value(obj):
+        if isinstance(obj, list):
+            return [convert_value(v) for v in obj]
+        if is_dataclass(obj):
+            return _reflective_asdict(obj)
+        return obj
+
+    result = {}
+    for field in fields(data):
+        value = getattr(data, field.name)
+        if value is not None:
+            result[field.name] = convert_value(value)
+    return result
+
+
+def _nested_order():
+    items = [
+        BasketItemDTO(
+            id=f"item-{i}",
+            name="Widget",
+            price=12.5,
+            quantity=2,
+            item_payments=[OrderItemPayment(amount=12.5, refunded=False)] * 2,
+            payer=BasketItemPayerDTO(name="Ada", type="PERSONAL"),
+        )
+        for i in range(3)
+    ]
+    return OrderCreateDTO(
+        amount=75.0,
+        currency="TRY",
+        locale="tr",
+        buyer=BuyerDTO(name="John", surname="Doe", email="john@example.com"),
+        basket_items=items,
+        billing_address=BillingAddressDTO(city="Istanbul"),
+        enabled_installments=[1, 3, 6],
+        metadata=[MetadataDTO(key="source", value="web")],
+        payment_terms=[PaymentTermDTO(amount=75.0, term_sequence=1)],
+        three_d_force=True,
+    )
+
+
+def test_generated_to_dict_matches_reflective_conversion():
+    order = _nested_order()
+    assert order.to_dict() == _reflective_asdict(order)
+    assert order.to_dict()["basket_items"][0]["item_payments"][1] == {
+        "amount": 12.5,
+        "refunded": False,
+    }
+
+    for dto in (
+        RefundOrderDTO(amount=1.0, reference_id="ref-1"),
+        SubscriptionGetRequest(reference_id="sub-1"),
+        SubmerchantUpdateDTO(name="Shop", system_time=0),
+    ):
+        assert dto.to_dict() == _reflective_asdict(dto)
+
+
+def test_generated_to_dict_handles_unexpected_value_types():
+    # Values that do not match the annotation are converted the generic way.
+    item = BasketItemDTO(
+        payer=[BasketItemPayerDTO(name="Ada")],
+        item_payments=(OrderItemPayment(amount=1.0),),
+        data={"k": "v"},
+    )
+    order = OrderCreateDTO(
+        amount=1.0,
+        currency="TRY",
+        locale="tr",
+        buyer=SubmerchantUpdateDTO(name="not a buyer"),
+        basket_items=[item],
+    )
+    assert order.to_dict() == _reflective_asdict(order)
+
+
+def test_to_dict_returns_fresh_lists():
+    installments = [1, 3]
+    order = OrderCreateDTO(
+        amount=1.0,
+        currency="TRY",
+        locale="tr",
+        buyer=BuyerDTO(name="John", surname="Doe"),
+        enabled_installments=installments,
+    )
+    data = order.to_dict()
+    assert data["enabled_installments"] == installments
+    assert data["enabled_installments"] is not installments
+    assert _asdict_factory("plain") == "plain"
+
+
+def test_dtos_are_slotted():
+    item = BasketItemDTO(name="Widget", price=10.0)
+    assert not hasattr(item, "__dict__")
+    with pytest.raises(AttributeError):
+        item.nickname = "w"
+
+    assert item == BasketItemDTO(name="Widget", price=10.0)
+    assert item != BasketItemDTO(name="Widget", price=11.0)
+    assert item.quantity is None
+    assert pickle.loads(pickle.dumps(item)) == item
+    assert copy.deepcopy(item) == item
+    assert replace(item, price=12.0).price == 12.0
+
+
+def test_slotted_subclass_keeps_base_fields():
+    update = SubmerchantUpdateDTO(name="Shop", email="shop@example.com")
+    assert isinstance(update, SubmerchantCreateDTO)
+    assert SubmerchantUpdateDTO.__slots__ == ()
+    assert not hasattr(update, "__dict__")
+    assert update.to_dict() == {"name": "Shop", "email": "shop@example.com"}
+    assert repr(update).startswith("SubmerchantUpdateDTO(locale=None")
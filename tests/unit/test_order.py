@@ -948,7 +948,7 @@ from tapsilat_py.models import (
 def client():
     return TapsilatAPI(api_key="test_key")
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_delete_order_term(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -965,7 +965,7 @@ def test_delete_order_term(mock_request, client):
     assert "/order/term" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_update_order_term(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -989,7 +989,7 @@ def test_update_order_term(mock_request, client):
     assert mock_request.call_args[0][0] == "PATCH"
     assert "/order/term" in mock_request.call_args[0][1]
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_order_term(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -35,7 +35,7 @@ from tapsilat_py.models import (
 def client():
     return TapsilatAPI(api_key="test_key")
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_create_organization_business(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -55,7 +55,7 @@ def test_create_organization_business(mock_request, client):
     assert "/organization/business/create" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_currencies(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -69,7 +69,7 @@ def test_get_organization_currencies(mock_request, client):
     assert "/organization/currencies" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_limit_user(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -84,7 +84,7 @@ def test_get_organization_limit_user(mock_request, client):
     assert "/organization/limit/user" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_set_organization_limit_user(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -99,7 +99,7 @@ def test_set_organization_limit_user(mock_request, client):
     assert "/organization/limit/user" in mock_request.call_args[0][1]
     assert mock_request.call_args[0][0] == "POST"
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_limits(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -112,7 +112,7 @@ def test_get_organization_limits(mock_request, client):
     mock_request.assert_called_once()
     assert "/organization/limits" in mock_request.call_args[0][1]
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_list_organization_vpos(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -127,7 +127,7 @@ def test_list_organization_vpos(mock_request, client):
     assert "/organization/list-vpos" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_meta(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -140,7 +140,7 @@ def test_get_organization_meta(mock_request, client):
     mock_request.assert_called_once()
     assert "/organization/metas/meta_name" in mock_request.call_args[0][1]
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_scopes(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -153,7 +153,7 @@ def test_get_organization_scopes(mock_request, client):
     mock_request.assert_called_once()
     assert "/organization/scopes" in mock_request.call_args[0][1]
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_get_organization_suborganizations(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -167,7 +167,7 @@ def test_get_organization_suborganizations(mock_request, client):
     assert "/organization/suborganizations" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_create_organization_user(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -186,7 +186,7 @@ def test_create_organization_user(mock_request, client):
     assert "/organization/user/create" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_verify_organization_user(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -201,7 +201,7 @@ def test_verify_organization_user(mock_request, client):
     assert "/organization/user/verify" in mock_request.call_args[0][1]
 
 
-@patch('tapsilat_py.client.requests.request')
+@patch('tapsilat_py.client.requests.Session.request')
 def test_verify_organization_user_mobile(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.models import CancelOrderDTO, RefundOrderDTO
+from tapsilat_py.outbox import FAILED, PENDING, REJECTED, WriteQueue
+from tapsilat_py.retry import RetryPolicy
+
+
+def _client(server):
+    return TapsilatAPI(base_url=server.base_url, retry_policy=RetryPolicy(max_retries=0))
+
+
+def _queue(tmp_path, server, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0))
+    kwargs.setdefault("poll_interval", 0.02)
+    return WriteQueue(str(tmp_path / "outbox.db"), _client(server), **kwargs)
+
+
+def _sent(server):
+    return [
+        (r["path"].rsplit("/", 1)[-1], json.loads(r["body"])["reference_id"])
+        for r in server.requests
+    ]
+
+
+def test_queued_writes_survive_a_restart_and_keep_their_key(tmp_path, stub_server):
+    stub_server.route("POST", "/order/refund", {"is_success": True})
+    queue = _queue(tmp_path, stub_server)
+    queued = queue.refund_order(RefundOrderDTO(amount=50.0, reference_id="ref-1"))
+    # The process dies while the write is being sent.
+    db = sqlite3.connect(str(tmp_path / "outbox.db"))
+    db.execute("UPDATE outbox SET state = 'sending'")
+    db.commit()
+    db.close()
+    queue.close()
+
+    reopened = _queue(tmp_path, stub_server)
+    assert [w.state for w in reopened.pending()] == [PENDING]
+    with reopened:
+        assert reopened.wait_idle(5)
+        assert reopened.stats()["depth"] == 0
+        assert reopened.stats()["delivered"] == 1
+
+    [request] = stub_server.requests
+    assert request["headers"]["Idempotency-Key"] == queued.idempotency_key
+
+
+def test_writes_for_one_order_go_in_sequence_others_in_parallel(tmp_path, stub_server):
+    lock = threading.Lock()
+    active = []
+    peak = []
+    finished = {}
+
+    def slow(request):
+        body = json.loads(request["body"])
+        with lock:
+            active.append(body["reference_id"])
+            peak.append(len(active))
+        time.sleep(0.1)
+        with lock:
+            active.remove(body["reference_id"])
+            finished.setdefault(body["reference_id"], []).append(time.monotonic())
+        return 200, {}, b"{}"
+
+    stub_server.route("POST", "/order/refund", slow)
+    stub_server.route("POST", "/order/cancel", slow)
+    queue = _queue(tmp_path, stub_server, concurrency=4)
+    queue.refund_order(RefundOrderDTO(amount=10.0, reference_id="ref-1"))
+    queue.cancel_order(CancelOrderDTO(reference_id="ref-1"))
+    for n in range(2, 5):
+        queue.refund_order(RefundOrderDTO(amount=10.0, reference_id=f"ref-{n}"))
+
+    with queue:
+        assert queue.wait_idle(5)
+
+    sent = _sent(stub_server)
+    assert sent.index(("refund", "ref-1")) < sent.index(("cancel", "ref-1"))
+    assert len(sent) == 5
+    assert 2 <= max(peak) <= 4
+    # ref-1 never had two writes in flight at once.
+    refund_done, cancel_done = finished["ref-1"]
+    assert cancel_done - refund_done >= 0.09
+
+
+def test_transient_failures_are_retried_with_backoff(tmp_path, stub_server):
+    statuses = [503, 503]
+
+    def refund(request):
+        if statuses:
+            return statuses.pop(0), {}, b'{"error": "unavailable"}'
+        return 200, {}, b"{}"
+
+    stub_server.route("POST", "/order/refund", refund)
+    policy = RetryPolicy(backoff_factor=0.05, backoff_max=0.05)
+    queue = _queue(tmp_path, stub_server, retry_policy=policy)
+    queue.refund_order(RefundOrderDTO(amount=50.0, reference_id="ref-1"))
+
+    with queue:
+        assert queue.wait_idle(5)
+        stats = queue.stats()
+
+    assert stats["retried"] == 2 and stats["delivered"] == 1 and stats["depth"] == 0
+    keys = {r["headers"]["Idempotency-Key"] for r in stub_server.requests}
+    assert len(stub_server.requests) == 3 and len(keys) == 1
+
+
+def test_rejected_writes_are_moved_aside_until_retried(tmp_path, stub_server):
+    statuses = [422]
+
+    def cancel(request):
+        if statuses:
+            return statuses.pop(0), {}, b'{"code": 101, "error": "order already paid"}'
+        return 200, {}, b"{}"
+
+    stub_server.route("POST", "/order/cancel", cancel)
+    stub_server.route("POST", "/order/refund", {})
+    queue = _queue(tmp_path, stub_server)
+    queue.cancel_order(CancelOrderDTO(reference_id="ref-1"))
+    queue.refund_order(RefundOrderDTO(amount=5.0, reference_id="ref-1"))
+
+    with queue:
+        assert queue.wait_idle(5)
+        [failed] = queue.failed()
+        assert failed.state == REJECTED and failed.attempts == 1
+        assert failed.last_error.startswith("422")
+        # A rejected write does not hold up the rest of its order.
+        assert queue.stats()["depth"] == 0 and queue.stats()["failed"] == 1
+
+        assert queue.retry_failed() == 1
+        assert queue.wait_idle(5)
+        assert queue.failed() == []
+
+    assert _sent(stub_server) == [("cancel", "ref-1"), ("refund", "ref-1"), ("cancel", "ref-1")]
+
+
+def test_write_out_of_attempts_holds_back_its_order(tmp_path, stub_server):
+    stub_server.route("POST", "/order/refund", {"error": "unavailable"}, status=503)
+    stub_server.route("POST", "/order/cancel", {})
+    queue = _queue(tmp_path, stub_server, max_attempts=2)
+    queue.refund_order(RefundOrderDTO(amount=5.0, reference_id="ref-1"))
+    queue.cancel_order(CancelOrderDTO(reference_id="ref-1"))
+    queue.cancel_order(CancelOrderDTO(reference_id="ref-2"))
+
+    with queue:
+        assert queue.wait_idle(5)
+        [failed] = queue.failed()
+        assert failed.state == FAILED and failed.operation == "refund_order"
+        # The refund may still have to happen first, so the cancel waits for it.
+        assert [(w.operation, w.order_key) for w in queue.pending()] == [
+            ("cancel_order", "ref-1")
+        ]
+        assert sorted(_sent(stub_server)) == [
+            ("cancel", "ref-2"), ("refund", "ref-1"), ("refund", "ref-1")
+        ]
+
+        stub_server.route("POST", "/order/refund", {})
+        assert queue.retry_failed() == 1
+        assert queue.wait_idle(5)
+        assert queue.stats()["depth"] == 0
+
+    assert _sent(stub_server)[3:] == [("refund", "ref-1"), ("cancel", "ref-1")]
+
+
+def test_stats_and_max_attempts(tmp_path):
+    now = [1000.0]
+    # Nothing listens on the port, so every attempt fails to connect.
+    client = TapsilatAPI(
+        base_url="http://127.0.0.1:9/api/v1", retry_policy=RetryPolicy(max_retries=0)
+    )
+    queue = WriteQueue(
+        str(tmp_path / "outbox.db"),
+        client,
+        retry_policy=RetryPolicy(backoff_factor=0),
+        max_attempts=2,
+        poll_interval=0.02,
+        clock=lambda: now[0],
+    )
+    queue.refund_order(RefundOrderDTO(amount=1.0, reference_id="ref-1"))
+    now[0] += 30
+    assert queue.stats()["depth"] == 1
+    assert queue.stats()["oldest_age"] == 30
+
+    with queue:
+        assert queue.wait_idle(5)
+        assert queue.stats()["failed"] == 1
+        assert queue.failed()[0].attempts == 2
+
+
+def test_unknown_operation_is_refused(tmp_path, stub_server):
+    queue = _queue(tmp_path, stub_server)
+    with pytest.raises(ValueError):
+        queue.enqueue("create_order", {}, "ref-1")
+    queue.close()
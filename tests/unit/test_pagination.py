@@ -0,0 +1,255 @@
+import asyncio
+import itertools
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.pagination import is_last_page, iter_pages, page_items, total_pages
+
+
+def _order_pages(total, per_page):
+    """_make_request stand-in serving /order/list pages of `total` orders"""
+    lock = threading.Lock()
+    fetched = []
+
+    def make_request(method, endpoint, params=None):
+        page = params["page"]
+        with lock:
+            fetched.append(page)
+        first = (page - 1) * per_page
+        rows = [{"id": i} for i in range(first, min(first + per_page, total))]
+        return {
+            "page": page,
+            "per_page": per_page,
+            "rows": rows,
+            "total": total,
+            "total_page": -(-total // per_page),
+        }
+
+    return make_request, fetched
+
+
+def test_page_items_detects_record_key():
+    assert page_items({"rows": [1]}) == [1]
+    assert page_items({"row": [2]}) == [2]
+    assert page_items({"data": [3], "total": 1}) == [3]
+    assert page_items({"rows": None}) == []
+    assert page_items([4]) == [4]
+
+
+def test_total_pages_from_count_or_total():
+    assert total_pages({"total_page": 3}, 10) == 3
+    assert total_pages({"total_pages": 4}, 10) == 4
+    assert total_pages({"total": 21}, 10) == 3
+    assert total_pages({"rows": []}, 10) is None
+
+
+def test_short_page_ends_iteration_without_totals():
+    assert not is_last_page({"data": [1, 2]}, 1, 2)
+    assert is_last_page({"data": [1]}, 2, 2)
+    assert is_last_page({"data": []}, 3, 2)
+
+
+def test_iter_orders_fetches_pages_on_demand():
+    api = TapsilatAPI()
+    api._make_request, fetched = _order_pages(total=25, per_page=10)
+
+    orders = api.iter_orders(start_date="2024-01-01", status=1, per_page=10)
+    assert fetched == []
+
+    first = list(itertools.islice(orders, 3))
+    assert [o["id"] for o in first] == [0, 1, 2]
+    assert fetched == [1]
+
+    rest = list(orders)
+    assert [o["id"] for o in first + rest] == list(range(25))
+    assert fetched == [1, 2, 3]
+
+
+def test_iter_orders_passes_filters():
+    api = TapsilatAPI()
+    api._make_request = MagicMock(return_value={"rows": [], "total": 0})
+
+    list(api.iter_orders(start_date="2024-01-01", buyer_id="b-1", status=2, per_page=5))
+
+    api._make_request.assert_called_once_with(
+        "GET",
+        "/order/list",
+        params={
+            "page": 1,
+            "per_page": 5,
+            "start_date": "2024-01-01",
+            "buyer_id": "b-1",
+            "status": 2,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "method, endpoint",
+    [
+        ("iter_order_submerchants", "/order/submerchants"),
+        ("iter_organization_suborganizations", "/organization/suborganizations"),
+        ("iter_submerchants", "/submerchants"),
+        ("iter_subscriptions", "/subscription/list"),
+    ],
+)
+def test_list_iterators_walk_all_pages(method, endpoint):
+    api = TapsilatAPI()
+    api._make_request = MagicMock(
+        side_effect=[{"data": [1, 2]}, {"data": [3, 4]}, {"data": [5]}]
+    )
+
+    assert list(getattr(api, method)(per_page=2)) == [1, 2, 3, 4, 5]
+    assert [c.kwargs["params"]["page"] for c in api._make_request.call_args_list] == [1, 2, 3]
+    assert api._make_request.call_args.args == ("GET", endpoint)
+
+
+def test_prefetch_requests_next_page_in_background():
+    api = TapsilatAPI()
+    make_request, fetched = _order_pages(total=50, per_page=10)
+    second_page_requested = threading.Event()
+
+    def tracking(method, endpoint, params=None):
+        if params["page"] == 2:
+            second_page_requested.set()
+        return make_request(method, endpoint, params)
+
+    api._make_request = tracking
+    orders = api.iter_orders(per_page=10, prefetch=1)
+
+    next(orders)
+    assert second_page_requested.wait(1)
+    assert sorted(fetched) == [1, 2]
+    assert [o["id"] for o in orders] == list(range(1, 50))
+    assert sorted(fetched) == [1, 2, 3, 4, 5]
+
+
+def test_prefetch_is_bounded_and_stops_when_closed():
+    fetched = []
+
+    def fetch_page(number):
+        fetched.append(number)
+        return {"rows": [number], "total_page": 100}
+
+    pages = iter_pages(fetch_page, per_page=1, prefetch=2)
+    assert next(pages)["rows"] == [1]
+    assert next(pages)["rows"] == [2]
+    pages.close()
+
+    assert max(fetched) <= 4
+
+
+def test_errors_propagate_from_prefetched_pages():
+    def fetch_page(number):
+        if number == 2:
+            raise APIException(500, -1, "boom")
+        return {"rows": [number], "total_page": 3}
+
+    pages = iter_pages(fetch_page, per_page=1, prefetch=1)
+    next(pages)
+    with pytest.raises(APIException):
+        next(pages)
+
+
+def test_async_iter_orders():
+    api = AsyncTapsilatAPI()
+    make_request, fetched = _order_pages(total=12, per_page=5)
+
+    async def async_make_request(method, endpoint, params=None):
+        return make_request(method, endpoint, params)
+
+    api._make_request = async_make_request
+
+    async def run():
+        return [o["id"] async for o in api.iter_orders(per_page=5, prefetch=1)]
+
+    assert asyncio.run(run()) == list(range(12))
+    assert sorted(fetched) == [1, 2, 3]
+
+
+def test_concurrent_export_fetches_pages_in_parallel_and_keeps_order():
+    api = TapsilatAPI()
+    make_request, fetched = _order_pages(total=95, per_page=10)
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+    all_started = threading.Barrier(4, timeout=1)
+
+    def slow(method, endpoint, params=None):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            if params["page"] in (2, 3, 4, 5):
+                all_started.wait()
+            return make_request(method, endpoint, params)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    api._make_request = slow
+
+    orders = list(api.iter_orders(per_page=10, concurrency=4))
+
+    assert [o["id"] for o in orders] == list(range(95))
+    assert sorted(fetched) == list(range(1, 11))
+    assert in_flight[1] == 4
+
+
+def test_concurrency_waits_for_page_count():
+    fetched = []
+
+    def fetch_page(number):
+        fetched.append(number)
+        return {"data": [number] * 2 if number < 3 else [number]}
+
+    pages = iter_pages(fetch_page, per_page=2, concurrency=8)
+    assert [page["data"][0] for page in pages] == [1, 2, 3]
+    assert fetched == [1, 2, 3]
+
+
+def test_concurrent_export_stops_on_first_error():
+    started = []
+    release = threading.Event()
+
+    def fetch_page(number):
+        started.append(number)
+        if number == 3:
+            raise APIException(400, 12, "bad filter")
+        if number > 3:
+            release.wait(1)
+        return {"rows": [number], "total_page": 100}
+
+    pages = iter_pages(fetch_page, per_page=1, concurrency=3)
+    assert [next(pages)["rows"], next(pages)["rows"]] == [[1], [2]]
+    with pytest.raises(APIException):
+        next(pages)
+    release.set()
+
+    assert max(started) <= 6
+
+
+def test_async_concurrent_export():
+    api = AsyncTapsilatAPI()
+    make_request, fetched = _order_pages(total=42, per_page=5)
+    in_flight = [0, 0]
+
+    async def async_make_request(method, endpoint, params=None):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.001 * (10 - params["page"]))
+        in_flight[0] -= 1
+        return make_request(method, endpoint, params)
+
+    api._make_request = async_make_request
+
+    async def run():
+        return [o["id"] async for o in api.iter_orders(per_page=5, concurrency=3)]
+
+    assert asyncio.run(run()) == list(range(42))
+    assert sorted(fetched) == list(range(1, 10))
+    assert in_flight[1] == 3
@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from tapsilat_py._http import endpoint_group
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.models import RefundOrderDTO
+from tapsilat_py.ratelimit import FileLockBackend, MemoryBackend, RateLimiter, fcntl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "method, endpoint, group",
+    [
+        ("GET", "/order/ref-1/status", "order_read"),
+        ("GET", "/orders/1/vpos-query", "order_read"),
+        ("POST", "/order/refund", "order_write"),
+        ("GET", "/system/error-codes", "system"),
+        ("POST", "/organization/user/create", "organization"),
+        ("GET", "/subscription/list", "default"),
+    ],
+)
+def test_endpoint_group(method, endpoint, group):
+    assert endpoint_group(method, endpoint) == group
+
+
+@pytest.mark.parametrize("backend", ["memory", "file"])
+def test_bucket_allows_burst_then_spaces_requests(backend, tmp_path):
+    if backend == "file" and fcntl is None:
+        pytest.skip("fcntl not available")
+    clock = FakeClock()
+    limiter = RateLimiter(
+        {"order_write": (2, 3)},
+        backend=MemoryBackend() if backend == "memory" else FileLockBackend(str(tmp_path / "b")),
+        clock=clock,
+    )
+
+    waits = [limiter.reserve("POST", "/order/refund") for _ in range(5)]
+    assert waits == [0, 0, 0, 0.5, 1.0]
+
+    clock.now += 3  # pays back the debt and refills to the burst size
+    assert [limiter.reserve("POST", "/order/refund") for _ in range(4)] == [0, 0, 0, 0.5]
+    assert limiter.stats() == {"acquired": 9, "waited": 3, "wait_seconds": 2.0}
+
+
+def test_groups_have_separate_buckets_and_unlimited_groups_pass():
+    clock = FakeClock()
+    limiter = RateLimiter({"order_read": 1, "order_write": 1}, clock=clock)
+
+    assert limiter.reserve("GET", "/order/ref-1") == 0
+    assert limiter.reserve("POST", "/order/cancel") == 0
+    assert limiter.reserve("GET", "/order/ref-1") == 1.0
+    assert limiter.reserve("GET", "/system/error-codes") == 0
+    assert limiter.stats()["acquired"] == 3
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        RateLimiter({"system": 0})
+    with pytest.raises(ValueError):
+        RateLimiter({"system": (5, 0.5)})
+
+
+def _reserve_many(path, count, queue):
+    reserved_at = []
+
+    def clock():
+        reserved_at.append(time.time())
+        return reserved_at[-1]
+
+    limiter = RateLimiter({"system": (10, 1)}, backend=FileLockBackend(path), clock=clock)
+    slots = [limiter.reserve("GET", "/system/error-codes") + reserved_at[-1] for _ in range(count)]
+    queue.put(slots)
+
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl not available")
+def test_file_backend_shares_one_budget_across_processes(tmp_path):
+    path = str(tmp_path / "bucket")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_reserve_many, args=(path, 5, queue)) for _ in range(3)]
+    for w in workers:
+        w.start()
+    slots = sorted(slot for _ in workers for slot in queue.get(timeout=10))
+    for w in workers:
+        w.join()
+
+    # 15 requests from three processes at 10/s with a burst of 1: every
+    # request is given its own slot at least 0.1s after the previous one.
+    assert len(slots) == 15
+    gaps = [b - a for a, b in zip(slots, slots[1:])]
+    assert min(gaps) >= 0.1 - 0.01
+
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl not available")
+def test_file_backend_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "bucket")
+    limiter = RateLimiter({"system": 10}, backend=FileLockBackend(path))
+
+    async def run():
+        with open(path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            # Let go eventually even if the loop is stuck behind the lock.
+            unlock = threading.Timer(0.5, fcntl.flock, (f, fcntl.LOCK_UN))
+            unlock.start()
+            task = asyncio.ensure_future(limiter.acquire_async("GET", "/system/error-codes"))
+            await asyncio.sleep(0.05)
+            waiting = not task.done()
+            unlock.cancel()
+            fcntl.flock(f, fcntl.LOCK_UN)
+        await task
+        return waiting
+
+    assert asyncio.run(run())
+    assert limiter.stats()["acquired"] == 1
+
+
+def test_client_waits_for_tokens(stub_server, mocker):
+    sleep = mocker.patch("tapsilat_py.ratelimit.time.sleep")
+    stub_server.route("GET", "/order/ref-1/status", {"status": "paid"})
+    stub_server.route("POST", "/order/refund", {})
+    clock = FakeClock()
+    limiter = RateLimiter({"order_read": (4, 1), "order_write": (1, 1)}, clock=clock)
+    client = TapsilatAPI(base_url=stub_server.base_url, rate_limiter=limiter)
+
+    client.get_order_status("ref-1")
+    client.get_order_status("ref-1")
+    client.refund_order(RefundOrderDTO(amount=1, reference_id="ref-1"))
+
+    sleep.assert_called_once_with(0.25)
+    assert len(stub_server.requests) == 3
+
+
+def test_async_client_waits_for_tokens(mocker):
+    sleep = mocker.patch("tapsilat_py.ratelimit.asyncio.sleep", new=mocker.AsyncMock())
+    limiter = RateLimiter({"system": (2, 1)}, clock=FakeClock())
+    client = AsyncTapsilatAPI(rate_limiter=limiter)
+    client._send = mocker.AsyncMock(
+        return_value=MagicMock(status_code=200, headers={}, content=b"{}")
+    )
+
+    async def run():
+        for _ in range(3):
+            await client.get_system_error_codes()
+
+    asyncio.run(run())
+
+    assert [c.args[0] for c in sleep.await_args_list] == [0.5, 1.0]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import pickle
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.models import OrderResponse as ModelsOrderResponse
+from tapsilat_py.responses import (
+    BasketItemResponse,
+    ItemPaymentResponse,
+    OrderPage,
+    OrderResponse,
+    SubscriptionResponse,
+    TransactionResponse,
+)
+
+ORDER = {
+    "reference_id": "ref-1",
+    "status": 8,
+    "amount": 500.0,
+    "buyer": {"name": "John", "surname": "Doe"},
+    "basket_items": [
+        {
+            "id": f"item-{i}",
+            "price": 1.0,
+            "payer": {"type": "PERSONAL"},
+            "item_payments": [{"amount": 0.6, "status": 1}, {"amount": 0.4, "status": 1}],
+        }
+        for i in range(500)
+    ],
+}
+
+
+@pytest.fixture
+def built(monkeypatch):
+    """Records every BasketItemResponse and ItemPaymentResponse built"""
+    counts = {"items": 0, "payments": 0}
+
+    def counting(cls, key):
+        init = cls.__init__
+
+        def __init__(self, *args, **kwargs):
+            counts[key] += 1
+            init(self, *args, **kwargs)
+
+        monkeypatch.setattr(cls, "__init__", __init__)
+
+    counting(BasketItemResponse, "items")
+    counting(ItemPaymentResponse, "payments")
+    return counts
+
+
+def test_scalar_fields_do_not_decode_nested_sections(built):
+    order = OrderResponse(ORDER)
+
+    assert (order.status, order.reference_id, order.currency) == (8, "ref-1", None)
+    assert built == {"items": 0, "payments": 0}
+
+    assert order.basket_items[499].id == "item-499"
+    assert built == {"items": 500, "payments": 0}
+    assert order.basket_items[0].item_payments[1].amount == 0.4
+    assert built == {"items": 500, "payments": 2}
+
+
+def test_nested_sections_are_decoded_once():
+    order = OrderResponse(ORDER)
+
+    assert order.basket_items is order.basket_items
+    assert order.buyer is order.buyer and order.buyer.surname == "Doe"
+    assert order.basket_items[0].payer.type == "PERSONAL"
+    assert order.shipping_address is None and order.payment_terms == []
+
+
+def test_models_remain_the_json_they_wrap():
+    order = OrderResponse(ORDER)
+    order.basket_items
+
+    assert order == ORDER and order["basket_items"] == ORDER["basket_items"]
+    assert json.loads(json.dumps(order)) == ORDER
+    copy = pickle.loads(pickle.dumps(order))
+    assert copy == ORDER and copy.basket_items[3].id == "item-3"
+    assert ModelsOrderResponse is OrderResponse
+
+
+def test_client_methods_return_typed_models(mocker):
+    make_request = mocker.patch.object(TapsilatAPI, "_make_request")
+    client = TapsilatAPI()
+
+    make_request.return_value = [{"id": "tx-1", "amount": 10.0}, {"id": "tx-2"}]
+    transactions = client.get_order_transactions("ref-1")
+    assert [type(t) for t in transactions] == [TransactionResponse] * 2
+    assert transactions[0].amount == 10.0
+
+    make_request.return_value = {"rows": [ORDER], "total_page": 1}
+    page = client.get_order_list()
+    assert isinstance(page, OrderPage) and page.total_page == 1
+    assert page.rows[0].basket_items[1].id == "item-1"
+    [order] = client.iter_orders()
+    assert isinstance(order, OrderResponse) and order.reference_id == "ref-1"
+
+    make_request.return_value = {"reference_id": "sub-1", "orders": [{"status": "paid"}]}
+    subscription = client.list_subscriptions()
+    assert subscription.rows == []
+    subscription = client.create_subscription(mocker.Mock())
+    assert isinstance(subscription, SubscriptionResponse)
+    assert subscription.orders[0].status == "paid"
+
+
+def test_async_client_returns_typed_models(mocker):
+    async def make_request(*args, **kwargs):
+        return {"reference_id": "ref-1", "rows": [ORDER]}
+
+    mocker.patch.object(AsyncTapsilatAPI, "_make_request", side_effect=make_request)
+
+    async def run():
+        async with AsyncTapsilatAPI() as client:
+            return await client.get_order("ref-1"), await client.get_order_list()
+
+    order, page = asyncio.run(run())
+    assert isinstance(order, OrderResponse) and order.reference_id == "ref-1"
+    assert page.rows[0].status == 8
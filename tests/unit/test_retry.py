@@ -0,0 +1,157 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.models import RefundOrderDTO
+from tapsilat_py.retry import ALL_METHODS, RetryPolicy, parse_retry_after
+
+
+def _responses(*responses):
+    """Route handler replying with the given (status, headers, body) in turn"""
+    remaining = list(responses)
+
+    def handler(request):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return handler
+
+
+UNAVAILABLE = (503, {}, b'{"code": 1, "error": "unavailable"}')
+OK = (200, {}, b'{"status": "paid"}')
+
+
+@pytest.fixture
+def no_sleep(mocker):
+    return mocker.patch("tapsilat_py.client.time.sleep")
+
+
+class TestRetryPolicy:
+    def test_only_idempotent_methods_retry_by_default(self):
+        policy = RetryPolicy()
+        assert policy.is_retryable("GET", status_code=503)
+        assert not policy.is_retryable("POST", status_code=503)
+        assert not policy.is_retryable("DELETE", exception=requests.exceptions.ConnectionError())
+
+    def test_writes_retry_when_opted_in(self):
+        policy = RetryPolicy(methods=ALL_METHODS)
+        assert policy.is_retryable("POST", status_code=503)
+
+    def test_status_and_exception_rules(self):
+        policy = RetryPolicy(statuses={500}, exceptions=(requests.exceptions.ReadTimeout,))
+        assert policy.is_retryable("GET", status_code=500)
+        assert not policy.is_retryable("GET", status_code=503)
+        assert policy.is_retryable("GET", exception=requests.exceptions.ReadTimeout())
+        assert not policy.is_retryable("GET", exception=requests.exceptions.ConnectionError())
+
+    def test_backoff_is_full_jitter_with_exponential_ceiling(self, mocker):
+        uniform = mocker.patch("tapsilat_py.retry.random.uniform", side_effect=lambda a, b: b)
+        policy = RetryPolicy(backoff_factor=0.5, backoff_max=3.0)
+
+        assert [policy.backoff(n) for n in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+        assert all(call.args[0] == 0 for call in uniform.call_args_list)
+
+    def test_gives_up_after_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.next_delay("GET", "/x", 2, 0, status_code=503) is not None
+        assert policy.next_delay("GET", "/x", 3, 0, status_code=503) is None
+
+    def test_retry_after_overrides_backoff(self):
+        policy = RetryPolicy()
+        assert policy.next_delay("GET", "/x", 1, 0, status_code=429, retry_after="7") == 7.0
+
+    def test_gives_up_when_wait_exceeds_elapsed_budget(self):
+        policy = RetryPolicy(max_elapsed=10)
+        assert policy.next_delay("GET", "/x", 1, 4, status_code=429, retry_after="5") == 5.0
+        assert policy.next_delay("GET", "/x", 1, 6, status_code=429, retry_after="5") is None
+
+    def test_on_retry_receives_attempt_details(self):
+        events = []
+        policy = RetryPolicy(on_retry=events.append)
+
+        delay = policy.next_delay("GET", "/order/1/status", 1, 0.25, status_code=503)
+
+        assert len(events) == 1
+        event = events[0]
+        assert (event.method, event.endpoint, event.attempt) == ("GET", "/order/1/status", 1)
+        assert (event.delay, event.elapsed, event.status_code) == (delay, 0.25, 503)
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("-3") == 0.0
+
+
+def test_get_is_retried_until_success(stub_server, no_sleep):
+    stub_server.route("GET", "/order/ref-1/status", _responses(UNAVAILABLE, UNAVAILABLE, OK))
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    assert client.get_order_status("ref-1") == {"status": "paid"}
+    assert len(stub_server.requests) == 3
+    assert no_sleep.call_count == 2
+
+
+def test_exhausted_retries_raise_last_error(stub_server, no_sleep):
+    stub_server.route("GET", "/order/ref-1/status", _responses(UNAVAILABLE))
+    client = TapsilatAPI(base_url=stub_server.base_url, retry_policy=RetryPolicy(max_retries=1))
+
+    with pytest.raises(APIException) as e:
+        client.get_order_status("ref-1")
+
+    assert e.value.status_code == 503
+    assert e.value.error == "unavailable"
+    assert len(stub_server.requests) == 2
+
+
+def test_post_is_not_retried_by_default(stub_server, no_sleep):
+    stub_server.route("POST", "/order/refund", _responses(UNAVAILABLE, OK))
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    with pytest.raises(APIException):
+        client.refund_order(RefundOrderDTO(amount=10, reference_id="ref-1"))
+
+    assert len(stub_server.requests) == 1
+    no_sleep.assert_not_called()
+
+
+def test_retry_after_header_is_respected(stub_server, no_sleep):
+    throttled = (429, {"Retry-After": "2"}, b'{"code": 2, "error": "slow down"}')
+    stub_server.route("GET", "/order/ref-1/status", _responses(throttled, OK))
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    client.get_order_status("ref-1")
+
+    no_sleep.assert_called_once_with(2.0)
+
+
+def test_connection_errors_are_retried(mocker, no_sleep):
+    response = mocker.MagicMock(status_code=200, content=b'{"status": "paid"}')
+    response.json.return_value = {"status": "paid"}
+    send = mocker.patch(
+        "tapsilat_py.client.requests.Session.request",
+        side_effect=[requests.exceptions.ConnectionError("reset"), response],
+    )
+    client = TapsilatAPI()
+
+    assert client.get_order_status("ref-1") == {"status": "paid"}
+    assert send.call_count == 2
+
+
+def test_async_client_retries(stub_server, mocker):
+    sleep = mocker.patch("tapsilat_py.async_client.asyncio.sleep", new=mocker.AsyncMock())
+    stub_server.route("GET", "/order/ref-1/status", _responses(UNAVAILABLE, OK))
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return await client.get_order_status("ref-1")
+
+    assert asyncio.run(run()) == {"status": "paid"}
+    assert len(stub_server.requests) == 2
+    sleep.assert_awaited_once()
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.exceptions import APIException
+from tapsilat_py.responses import OrderResponse
+from tapsilat_py.streaming import RowParser, aiter_rows, iter_rows
+
+PAGE = {
+    "page": 1,
+    "per_page": 3,
+    "rows": [
+        {"reference_id": "ref-1", "note": 'a "quoted" ] }, [ {', "amount": 2.5},
+        {"reference_id": "ref-2", "buyer": {"name": "Çiğdem"}, "tags": [1, [2]]},
+        {"reference_id": "ref-3", "status": None},
+    ],
+    "total": 3,
+    "meta": {"rows": [0]},
+}
+
+
+def parse(body, step):
+    parser = RowParser()
+    rows = []
+    for i in range(0, len(body), step):
+        rows += parser.feed(body[i:i + step])
+    return rows, parser.close()
+
+
+@pytest.mark.parametrize("step", [1, 2, 7, 4096])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parser_yields_rows_and_keeps_the_envelope(step, indent):
+    body = json.dumps(PAGE, indent=indent, ensure_ascii=False).encode()
+
+    rows, page = parse(body, step)
+
+    assert rows == PAGE["rows"]
+    assert page == {**PAGE, "rows": []}
+
+
+@pytest.mark.parametrize(
+    "body, rows, page",
+    [
+        (b'[1, 2.5, true, null, "x", [3]]', [1, 2.5, True, None, "x", [3]], []),
+        (b'{"items": [], "total": 0}', [], {"items": [], "total": 0}),
+        (b'{"total": 0}', [], {"total": 0}),
+        (
+            b'{"note": "rows", "x": [1], "data": [{"id": 1}]}',
+            [{"id": 1}],
+            {"note": "rows", "x": [1], "data": []},
+        ),
+        (b"", [], {}),
+    ],
+)
+def test_parser_page_shapes(body, rows, page):
+    assert parse(body, 1) == (rows, page)
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"rows": [1, 2', b'{"rows": [{"id": }]}', b'{"rows": [1 2]}', b"[1.]"]
+)
+def test_parser_rejects_truncated_or_invalid_pages(body):
+    with pytest.raises(ValueError):
+        parse(body, 3)
+
+
+def test_rows_are_delivered_before_the_page_ends():
+    first_seen = threading.Event()
+
+    def send(stream):
+        stream.open("", None)
+        stream.write(b'{"rows": [{"id": 1},')
+        assert first_seen.wait(5)
+        stream.write(b' {"id": 2}]}')
+        return stream.finish()
+
+    rows = iter_rows(send)
+    assert next(rows) == {"id": 1}
+    first_seen.set()
+    assert list(rows) == [{"id": 2}]
+
+
+def test_stopping_early_stops_the_reader():
+    stopped = threading.Event()
+
+    def send(stream):
+        stream.open("", None)
+        try:
+            while True:
+                stream.write(b'{"id": 1},' * 10 if stream.written else b'{"rows": [')
+        except BaseException:
+            stopped.set()
+            raise
+
+    rows = iter_rows(send, backlog=2)
+    assert next(rows) == {"id": 1}
+    rows.close()
+    assert stopped.wait(5)
+
+
+def test_sync_client_streams_an_order_page(stub_server):
+    stub_server.route("GET", "/order/list", PAGE)
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    orders = list(client.iter_order_page(page=2, per_page=3, buyer_id="b-1", backlog=1))
+
+    assert [type(order) for order in orders] == [OrderResponse] * 3
+    assert [order.reference_id for order in orders] == ["ref-1", "ref-2", "ref-3"]
+    assert stub_server.requests[0]["query"] == {
+        "page": ["2"], "per_page": ["3"], "buyer_id": ["b-1"]
+    }
+
+
+def test_sync_client_raises_api_errors(stub_server):
+    stub_server.route("GET", "/order/list", {"code": 101, "error": "bad filter"}, status=400)
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    with pytest.raises(APIException) as excinfo:
+        list(client.iter_order_page())
+    assert excinfo.value.code == 101
+
+
+@pytest.mark.parametrize("body", [b"<html>Bad gateway</html>", b'{"rows": [{"a": 1},'])
+def test_bodies_that_are_not_a_list_page_raise_api_exception(stub_server, body):
+    stub_server.route("GET", "/order/list", lambda request: (200, {}, body))
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            return [order async for order in client.iter_order_page()]
+
+    with pytest.raises(APIException):
+        list(client.iter_order_page())
+    with pytest.raises(APIException):
+        asyncio.run(run())
+
+
+def test_async_client_streams_an_order_page(stub_server):
+    stub_server.route("GET", "/order/list", PAGE)
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            orders = [order async for order in client.iter_order_page(per_page=3, backlog=1)]
+            first_seen = asyncio.Event()
+
+            async def send(stream):
+                stream.open("", None)
+                await stream.write(b'[{"id": 1},')
+                await asyncio.wait_for(first_seen.wait(), 5)
+                await stream.write(b'{"id": 2}]')
+                return stream.finish()
+
+            rows = aiter_rows(send)
+            first = await rows.__anext__()
+            first_seen.set()
+            return orders, [first] + [row async for row in rows]
+
+    orders, rows = asyncio.run(run())
+    assert [order.reference_id for order in orders] == ["ref-1", "ref-2", "ref-3"]
+    assert isinstance(orders[0], OrderResponse)
+    assert rows == [{"id": 1}, {"id": 2}]
@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tapsilat_py.async_client import AsyncTapsilatAPI
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.coalescing import RequestCoalescer
+from tapsilat_py.exceptions import APIException, DeadlineExceeded
+from tapsilat_py.pagination import iter_pages
+from tapsilat_py.ratelimit import RateLimiter
+from tapsilat_py.retry import RetryPolicy
+from tapsilat_py.timeouts import Timeouts, deadline, remaining, split_timeout
+
+OVERRIDES = {"/order/*/export/*": 120, "/system/*": (1, 2)}
+
+
+def test_split_timeout():
+    assert split_timeout(10) == (10, 10)
+    assert split_timeout((3, None)) == (3, None)
+    with pytest.raises(ValueError):
+        split_timeout((0, 5))
+
+
+def test_endpoint_overrides_match_templates():
+    timeouts = Timeouts((3, 10), OVERRIDES)
+
+    assert timeouts.for_endpoint("/order/ref-1/export/excel") == (120, 120)
+    assert timeouts.for_endpoint("system/error-codes") == (1, 2)
+    assert timeouts.for_endpoint("/order/ref-1/status") == (3, 10)
+
+
+@pytest.fixture
+def send(mocker):
+    response = mocker.MagicMock(status_code=200, content=b"{}")
+    response.json.return_value = {}
+    return mocker.patch("tapsilat_py.client.requests.Session.request", return_value=response)
+
+
+def test_client_sends_connect_and_read_timeouts(send):
+    client = TapsilatAPI(timeout=(3, 10), endpoint_timeouts=OVERRIDES)
+
+    client.get_order_status("ref-1")
+    client.get_system_error_codes()
+
+    assert [c.kwargs["timeout"] for c in send.call_args_list] == [(3, 10), (1, 2)]
+
+
+def test_deadline_caps_timeouts_and_expires(send):
+    client = TapsilatAPI(timeout=(3, 10))
+
+    with deadline(0.5):
+        client.get_order_status("ref-1")
+        connect, read = send.call_args.kwargs["timeout"]
+        assert 0.4 < connect <= 0.5 and read == connect
+    assert remaining() is None
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded) as e:
+            client.get_order_status("ref-1")
+    assert e.value.error == "Deadline of 0 seconds exceeded"
+    assert e.value.last_error is None
+    assert send.call_count == 1
+
+
+def test_no_retry_past_the_deadline(stub_server, mocker):
+    sleep = mocker.patch("tapsilat_py.client.time.sleep")
+    stub_server.route("GET", "/order/ref-1/status", {}, status=503, headers={"Retry-After": "5"})
+    client = TapsilatAPI(base_url=stub_server.base_url)
+
+    with deadline(1):
+        with pytest.raises(DeadlineExceeded) as e:
+            client.get_order_status("ref-1")
+
+    assert e.value.last_error.status_code == 503
+    assert len(stub_server.requests) == 1
+    sleep.assert_not_called()
+
+
+def test_async_read_timeout(stub_server):
+    def slow(request):
+        time.sleep(0.3)
+        return 200, {}, b"{}"
+
+    stub_server.route("GET", "/order/ref-1/status", slow)
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url=stub_server.base_url,
+            timeout=(1, 5),
+            endpoint_timeouts={"/order/*/status": (1, 0.05)},
+            retry_policy=RetryPolicy(max_retries=0),
+        ) as client:
+            await client.get_order_status("ref-1")
+
+    with pytest.raises(APIException) as e:
+        asyncio.run(run())
+    assert e.value.error == "Request timed out after 0.05 seconds"
+
+
+def test_async_connect_timeout(mocker):
+    async def never_connects(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    mocker.patch("tapsilat_py._async_http.asyncio.open_connection", never_connects)
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url="http://tapsilat.test",
+            timeout=(0.05, 5),
+            retry_policy=RetryPolicy(max_retries=0),
+        ) as client:
+            await client.get_order_status("ref-1")
+
+    started = time.monotonic()
+    with pytest.raises(APIException) as e:
+        asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert e.value.error == "Connecting to tapsilat.test:80 timed out after 0.05 seconds"
+
+
+def test_async_deadline(stub_server):
+    def slow(request):
+        time.sleep(0.3)
+        return 200, {}, b"{}"
+
+    stub_server.route("GET", "/order/ref-1/status", slow)
+
+    async def run():
+        async with AsyncTapsilatAPI(
+            base_url=stub_server.base_url, retry_policy=RetryPolicy(max_retries=0)
+        ) as client:
+            with deadline(0.05):
+                await client.get_order_status("ref-1")
+
+    with pytest.raises(DeadlineExceeded) as e:
+        asyncio.run(run())
+    assert e.value.last_error.error.startswith("Request timed out after 0.0")
+
+
+def test_nested_deadline_cannot_extend_outer():
+    with deadline(0.2) as outer:
+        with deadline(5) as inner:
+            assert inner is outer
+        with deadline(0.1) as shorter:
+            assert shorter is not outer
+            assert remaining() <= 0.1
+        assert remaining() > 0.1
+
+
+def test_deadline_spans_retries(stub_server):
+    stub_server.route("GET", "/order/ref-1", {}, status=503, headers={"Retry-After": "0.05"})
+    client = TapsilatAPI(
+        base_url=stub_server.base_url, retry_policy=RetryPolicy(max_retries=100, max_elapsed=None)
+    )
+
+    started = time.monotonic()
+    with deadline(0.3):
+        with pytest.raises(DeadlineExceeded) as e:
+            client.get_checkout_url("ref-1")
+
+    assert time.monotonic() - started < 0.4
+    assert 2 <= len(stub_server.requests) <= 6
+    assert e.value.last_error.status_code == 503
+
+
+def test_nested_call_times_out_against_caller_deadline(stub_server):
+    def slow(request):
+        time.sleep(0.3)
+        return 200, {}, b'{"checkout_url": "https://pay"}'
+
+    stub_server.route("GET", "/order/ref-1", slow)
+    client = TapsilatAPI(base_url=stub_server.base_url, retry_policy=RetryPolicy(max_retries=0))
+
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded) as e:
+            client.get_checkout_url("ref-1")
+    assert "timed out" in e.value.last_error.error
+
+
+def test_rate_limiter_does_not_wait_past_deadline(mocker):
+    sleep = mocker.patch("tapsilat_py.ratelimit.time.sleep")
+    limiter = RateLimiter({"system": 1})
+
+    limiter.acquire("GET", "/system/error-codes")
+    with deadline(0.5):
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire("GET", "/system/error-codes")
+    sleep.assert_not_called()
+    # The refused call took no token: the next one waits for one, not two.
+    assert limiter.stats()["acquired"] == 1
+    assert 0.9 < limiter.reserve("GET", "/system/error-codes") <= 1.0
+
+
+def test_coalesced_waiter_honours_its_own_deadline():
+    coalescer = RequestCoalescer()
+    release = threading.Event()
+    leader = threading.Thread(target=coalescer.run, args=("key", lambda: release.wait(5)))
+    leader.start()
+    while not coalescer.stats()["requests"]:
+        time.sleep(0.001)
+
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded):
+            coalescer.run("key", lambda: None)
+    release.set()
+    leader.join()
+
+
+def test_prefetched_pages_inherit_the_deadline():
+    seen = []
+
+    def fetch_page(number):
+        seen.append(remaining())
+        return {"page": number, "total_pages": 4, "rows": [number]}
+
+    with deadline(5):
+        pages = list(iter_pages(fetch_page, per_page=1, concurrency=3))
+
+    assert len(pages) == 4
+    assert all(left is not None for left in seen)
+
+
+def test_async_deadline_spans_nested_calls(stub_server):
+    def slow(request):
+        time.sleep(0.3)
+        return 200, {}, b"{}"
+
+    stub_server.route("GET", "/order/ref-1", slow)
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url) as client:
+            with deadline(0.05):
+                await client.get_checkout_url("ref-1")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert len(stub_server.requests) == 1
+
+
+def _slow_status(stub_server, delay=0.5):
+    def slow(request):
+        time.sleep(delay)
+        return 200, {}, b'{"status": "paid"}'
+
+    stub_server.route("GET", "/order/ref-1/status", slow)
+
+
+def test_waiting_for_a_blocked_pool_counts_against_the_deadline(stub_server):
+    _slow_status(stub_server)
+    client = TapsilatAPI(base_url=stub_server.base_url, pool_maxsize=1, pool_block=True)
+    results = []
+    busy = threading.Thread(target=lambda: results.append(client.get_order_status("ref-1")))
+    busy.start()
+    while not stub_server.requests:
+        time.sleep(0.001)
+
+    start = time.monotonic()
+    with deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            client.get_order_status("ref-1")
+    assert time.monotonic() - start < 0.3
+    busy.join()
+    # The call holding the connection is unaffected, and so is the pool.
+    assert results == [{"status": "paid"}]
+    assert client.get_order_status("ref-1") == {"status": "paid"}
+
+
+@pytest.mark.parametrize("options", [{"max_concurrency": 1}, {"pool_maxsize": 1}])
+def test_async_waiting_for_a_slot_counts_against_the_deadline(stub_server, options):
+    _slow_status(stub_server)
+
+    async def run():
+        async with AsyncTapsilatAPI(base_url=stub_server.base_url, **options) as client:
+            busy = asyncio.ensure_future(client.get_order_status("ref-1"))
+            while not stub_server.requests:
+                await asyncio.sleep(0.001)
+            start = time.monotonic()
+            with deadline(0.1):
+                with pytest.raises(DeadlineExceeded):
+                    await client.get_order_status("ref-1")
+            elapsed = time.monotonic() - start
+            assert await busy == {"status": "paid"}
+            return elapsed
+
+    assert asyncio.run(run()) < 0.3
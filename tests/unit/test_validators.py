@@ -1,7 +1,12 @@
 import pytest
 
 from tapsilat_py.exceptions import APIException
-from tapsilat_py.validators import validate_gsm_number, validate_installments
+from tapsilat_py.validators import (
+    bulk_validate_gsm_numbers,
+    bulk_validate_installments,
+    validate_gsm_number,
+    validate_installments,
+)
 
 
 class TestValidateInstallments:
@@ -111,3 +116,43 @@ class TestValidateGsmNumber:
         with pytest.raises(APIException) as exc_info:
             validate_gsm_number("+++---")
         assert exc_info.value.code == 0
+
+
+def _scalar(validate, value):
+    try:
+        return validate(value), None
+    except APIException as e:
+        return None, e.error
+
+
+class TestBulkValidation:
+    PHONES = [
+        "+90 555 123-45-67",
+        "(0555) 123 45 67",
+        "",
+        None,
+        "0090123",
+        "+90abc1234567",
+        "12345",
+        "5551234567",
+    ]
+    INSTALLMENTS = ["1,2,3,6", "", None, "1, 3, 12", "0,2", "1,abc", "15,x"]
+
+    def test_gsm_numbers_match_the_scalar_validator(self):
+        result = bulk_validate_gsm_numbers(iter(self.PHONES))
+        assert list(result) == [_scalar(validate_gsm_number, p) for p in self.PHONES]
+        assert result.valid == [True, True, True, True, False, False, False, True]
+        assert result.error_count == 3 and len(result) == len(self.PHONES)
+
+    def test_installments_match_the_scalar_validator(self):
+        result = bulk_validate_installments(self.INSTALLMENTS)
+        assert list(result) == [_scalar(validate_installments, i) for i in self.INSTALLMENTS]
+        assert result.values[:4] == [[1, 2, 3, 6], [1], [1], [1, 3, 12]]
+        assert "between 1 and 12" in result.errors[4]
+        # A malformed value is reported ahead of an out-of-range one.
+        assert "comma-separated" in result.errors[6]
+
+    def test_non_string_rows_are_errors_not_exceptions(self):
+        result = bulk_validate_gsm_numbers([5551234567, float("nan")])
+        assert result.valid == [False, False]
+        assert result.values == [None, None]
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+
+from tapsilat_py.responses import OrderResponse, WebhookEvent
+from tapsilat_py.webhook_server import WebhookServer
+from tapsilat_py.webhooks import WebhookVerifier
+
+VERIFIER = WebhookVerifier("secret")
+
+
+def event_body(name, **fields):
+    return json.dumps({"event": name, **fields}).encode()
+
+
+class Connection:
+    def __init__(self, server):
+        self.server = server
+
+    async def __aenter__(self):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.writer.close()
+
+    async def post(self, body, signature=None, path="/webhooks", method="POST"):
+        signature = VERIFIER.sign(body) if signature is None else signature
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: test\r\nX-Signature: {signature}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        status_line = await self.reader.readline()
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        return int(status_line.split()[1]), headers
+
+
+def test_events_are_verified_parsed_and_dispatched():
+    seen = []
+    sync_threads = []
+
+    async def run():
+        server = WebhookServer(VERIFIER, port=0)
+
+        @server.on("order.completed")
+        async def completed(event):
+            seen.append(("completed", event))
+
+        server.on("*", lambda event: sync_threads.append(threading.current_thread()))
+
+        async with server:
+            async with Connection(server) as conn:
+                body = event_body("order.completed", reference_id="ref-1", data={"status": 8})
+                first = await conn.post(body)
+                second = await conn.post(event_body("order.refunded"))
+            await server.stop()
+            return first, second, server.stats()
+
+    first, second, stats = asyncio.run(run())
+    assert first[0] == second[0] == 202
+    [(_, event)] = seen
+    assert isinstance(event, WebhookEvent) and event.name == "order.completed"
+    assert event.reference_id == "ref-1"
+    assert isinstance(event.order, OrderResponse) and event.order.status == 8
+    assert len(sync_threads) == 2 and threading.current_thread() not in sync_threads
+    assert stats["accepted"] == 2 and stats["handled"] == 3
+
+
+def test_invalid_requests_are_rejected():
+    async def run():
+        async with WebhookServer(VERIFIER, port=0, max_body_size=1000) as server:
+            server.on("*", lambda event: None)
+            async with Connection(server) as conn:
+                statuses = [
+                    (await conn.post(b'{"event": "x"}', signature="sha256=00"))[0],
+                    (await conn.post(b"[1, 2]"))[0],
+                    (await conn.post(b"not json"))[0],
+                    (await conn.post(b"{}", path="/other"))[0],
+                    (await conn.post(b"{}", method="PUT"))[0],
+                ]
+            async with Connection(server) as conn:
+                statuses.append((await conn.post(b"x" * 1001))[0])
+            return statuses, server.stats()
+
+    statuses, stats = asyncio.run(run())
+    assert statuses == [401, 400, 400, 404, 405, 413]
+    assert stats["rejected"] == 3 and stats["accepted"] == 0
+
+
+def test_slow_handlers_do_not_delay_acknowledgements():
+    async def run():
+        release = asyncio.Event()
+        handled = []
+        server = WebhookServer(VERIFIER, port=0, workers=1, backlog=1)
+
+        @server.on("order.completed")
+        async def slow(event):
+            await release.wait()
+            handled.append(event.reference_id)
+
+        await server.start()
+        async with Connection(server) as conn:
+            replies = []
+            for i in range(3):
+                body = event_body("order.completed", reference_id=f"ref-{i}")
+                replies.append(await asyncio.wait_for(conn.post(body), 1))
+                await asyncio.sleep(0.01)  # let the worker take the first event
+        release.set()
+        drained = await server.stop(timeout=5)
+        return replies, handled, drained, server.stats()
+
+    replies, handled, drained, stats = asyncio.run(run())
+    assert [status for status, _ in replies] == [202, 202, 503]
+    assert replies[2][1]["retry-after"] == "1"
+    assert handled == ["ref-0", "ref-1"] and drained
+    assert stats["shed"] == 1 and stats["queued"] == 0
+
+
+def test_handler_errors_go_to_on_error():
+    errors = []
+
+    async def run():
+        server = WebhookServer(
+            VERIFIER, port=0, workers=1, on_error=lambda event, exc: errors.append((event, exc))
+        )
+
+        @server.on("order.completed")
+        async def broken(event):
+            raise RuntimeError(event.reference_id)
+
+        async with server:
+            async with Connection(server) as conn:
+                for i in range(2):
+                    status, _ = await conn.post(event_body("order.completed", reference_id=i))
+                    assert status == 202
+        return server.stats()
+
+    stats = asyncio.run(run())
+    assert [str(exc) for _, exc in errors] == ["0", "1"]
+    assert stats["failed"] == 2
@@ -0,0 +1,55 @@
+import hashlib
+import hmac
+
+import pytest
+
+from tapsilat_py.client import TapsilatAPI
+from tapsilat_py.webhooks import WebhookVerifier
+
+BODY = b'{"event": "order.completed", "reference_id": "ref-1", "name": "\xc3\x87i\xc4\x9fdem"}'
+
+
+def signature(secret, body=BODY):
+    return "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+@pytest.mark.parametrize("secret", [b"", b"key", b"whsec_" + b"k" * 64, b"\xff" * 200])
+def test_matches_hmac_sha256(secret):
+    verifier = WebhookVerifier(secret)
+
+    assert verifier.sign(BODY) == signature(secret)
+    for payload in (BODY, bytearray(BODY), memoryview(BODY), BODY.decode()):
+        assert verifier.verify(payload, signature(secret))
+        assert verifier.verify(payload, signature(secret).encode())
+
+
+def test_rejects_bad_signatures():
+    verifier = WebhookVerifier("key")
+    valid = signature(b"key")
+
+    assert not verifier.verify(BODY + b" ", valid)
+    assert not verifier.verify(BODY, valid[len("sha256="):])
+    assert not verifier.verify(BODY, valid.upper())
+    assert not verifier.verify(BODY, "sha256=invalid")
+    assert not verifier.verify(BODY, "sha256=ğ")
+    assert not verifier.verify(BODY, "")
+
+
+def test_secret_rotation():
+    verifier = WebhookVerifier("old")
+    verifier.add_secret("new")
+
+    assert verifier.sign(BODY) == signature(b"new")
+    assert verifier.verify(BODY, signature(b"old")) and verifier.verify(BODY, signature(b"new"))
+
+    verifier.remove_secret("old")
+    assert not verifier.verify(BODY, signature(b"old"))
+    with pytest.raises(ValueError):
+        verifier.remove_secret(b"new")
+    with pytest.raises(ValueError):
+        WebhookVerifier()
+
+
+def test_verify_webhook_accepts_bytes():
+    assert TapsilatAPI.verify_webhook(BODY, signature(b"key"), "key")
+    assert not TapsilatAPI.verify_webhook(BODY, signature(b"other"), "key")